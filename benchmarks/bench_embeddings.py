@@ -0,0 +1,107 @@
+"""
+Throughput and memory of the embedding backends (fp32 torch vs ONNX Runtime
+int8) for MiniLM text embeddings and CLIP image features. Each backend runs
+in its own subprocess, so peak RSS is the cost of one server worker with
+that backend loaded.
+
+    PYTHONPATH=src python -m benchmarks.bench_embeddings --texts 512 --images 64
+    PYTHONPATH=src python -m benchmarks.bench_embeddings --backends onnx-int8 --threads 2
+
+Needs the real models (sentence-transformers, and onnx + onnxruntime for the
+int8 backend); the first int8 run also exports and quantizes them.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import resource
+import tempfile
+import subprocess
+from typing import Dict, List
+
+BACKENDS = ["torch", "onnx-int8"]
+
+def _rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+
+def _texts(n: int, seed: int = 11) -> List[str]:
+    from benchmarks.corpora import VOCAB
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(VOCAB, k=rng.randint(40, 160))) for _ in range(n)]
+
+# ── Worker (one backend per process) ─────────────────
+
+def worker(args) -> Dict:
+    # read by onnx_utils at import time
+    os.environ["EMBEDDING_BACKEND"] = args.worker
+    if args.threads:
+        os.environ["ONNX_THREADS"] = str(args.threads)
+        import torch
+        torch.set_num_threads(args.threads)
+
+    from PIL import Image
+    from benchmarks.corpora import make_image_corpus
+    from langgraphagenticai.tools.pdf_tool import get_embeddings
+    from langgraphagenticai.utils.image_utils import get_clip_model
+
+    out: Dict = {"backend": args.worker, "rss_start_mb": _rss_mb()}
+    texts = _texts(args.texts)
+
+    start = time.perf_counter()
+    embedder = get_embeddings()
+    out["text_load_s"] = time.perf_counter() - start
+    out["text_impl"] = type(embedder).__name__
+    embedder.embed_documents(texts[:8])  # warm-up
+    start = time.perf_counter()
+    embedder.embed_documents(texts)
+    out["texts_per_s"] = len(texts) / (time.perf_counter() - start)
+    out["rss_after_text_mb"] = _rss_mb()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        images = [Image.open(p).convert("RGB") for p in make_image_corpus(tmp, args.images)]
+    start = time.perf_counter()
+    clip = get_clip_model()
+    out["clip_load_s"] = time.perf_counter() - start
+    out["clip_impl"] = type(clip).__name__
+    clip.encode(images[0])
+    start = time.perf_counter()
+    for img in images:  # one at a time, as image_tool and create_faiss_index do
+        clip.encode(img)
+    out["images_per_s"] = len(images) / (time.perf_counter() - start)
+    out["rss_peak_mb"] = _rss_mb()
+    return out
+
+# ── Driver ───────────────────────────────────────────
+
+def main(argv=None) -> List[Dict]:
+    ap = argparse.ArgumentParser(description="Embedding backend throughput / memory")
+    ap.add_argument("--backends", default=",".join(BACKENDS))
+    ap.add_argument("--texts", type=int, default=512)
+    ap.add_argument("--images", type=int, default=64)
+    ap.add_argument("--threads", type=int, default=0, help="intra-op threads per worker (0 = library default)")
+    ap.add_argument("--worker", help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(worker(args)))
+        return []
+
+    results = []
+    for backend in args.backends.split(","):
+        print(f"running {backend}...", file=sys.stderr)
+        cmd = [sys.executable, "-m", "benchmarks.bench_embeddings", "--worker", backend,
+               "--texts", str(args.texts), "--images", str(args.images), "--threads", str(args.threads)]
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+        if proc.returncode != 0:
+            results.append({"backend": backend, "error": proc.stderr.strip().splitlines()[-1:]})
+            continue
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    json.dump(results, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Recall / latency benchmark for dense, BM25 and hybrid (RRF) retrieval.
+
+Runs fully offline on a generated corpus. Each document mixes topic
+vocabulary with unique identifiers (error codes, part numbers); queries are
+either exact-identifier lookups or bag-of-words paraphrases of one document.
+
+The default "hash" embedder is a deterministic stand-in that, like real
+sentence embedders, blurs digits inside identifiers ("ERR-4821" and
+"ERR-1937" look alike). Pass `--embedder minilm` to use all-MiniLM-L6-v2
+instead when sentence-transformers is installed.
+
+    PYTHONPATH=src python -m benchmarks.bench_hybrid_retrieval --docs 2000 --queries 200
+"""
+import sys
+import json
+import time
+import random
+import argparse
+from collections import defaultdict
+from typing import Callable, Dict, List, Tuple
+
+from langgraphagenticai.utils.bm25_utils import BM25Index, reciprocal_rank_fusion
+from benchmarks.fakes import hashed_features
+
+TOPICS = {
+    "network": "router packet latency firewall subnet gateway routing bandwidth switch vlan",
+    "storage": "disk volume snapshot replication raid block filesystem backup quota mount",
+    "billing": "invoice payment refund subscription tax currency discount ledger account charge",
+    "auth": "token password login session oauth credential permission role expiry identity",
+    "printer": "toner paper tray jam cartridge duplex spool driver nozzle feeder",
+    "hvac": "compressor thermostat airflow duct coolant filter humidity fan valve sensor",
+}
+FILLER = "the a of and to in for with on when after before during unit system device check".split()
+
+# ── Corpus ───────────────────────────────────────────
+
+def _pseudo_words(rng: random.Random, n: int) -> List[str]:
+    syllables = ["ka", "lo", "mi", "ter", "van", "su", "pri", "dox", "el", "qua", "ron", "bi"]
+    words = set()
+    while len(words) < n:
+        words.add("".join(rng.choice(syllables) for _ in range(3)))
+    return sorted(words)
+
+def make_corpus(n_docs: int, seed: int = 7) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Returns (doc_id -> text, doc_id -> unique code)."""
+    rng = random.Random(seed)
+    topics = list(TOPICS)
+    subjects = _pseudo_words(rng, 800)
+    docs, codes = {}, {}
+    used = set()
+    for i in range(n_docs):
+        topic = topics[i % len(topics)]
+        # a few document-specific subject words make paraphrase queries answerable
+        words = TOPICS[topic].split() + rng.sample(subjects, 4) * 2
+        code = None
+        while code is None or code in used:
+            code = f"{rng.choice(['ERR', 'PN', 'E'])}-{rng.randint(1000, 9999)}"
+        used.add(code)
+        body = [rng.choice(words if rng.random() < 0.6 else FILLER) for _ in range(60)]
+        body.insert(rng.randint(0, len(body)), code)
+        doc_id = f"doc-{i}"
+        docs[doc_id] = " ".join(body)
+        codes[doc_id] = code
+    return docs, codes
+
+def make_queries(docs: Dict[str, str], codes: Dict[str, str], n: int,
+                 seed: int = 11) -> List[Tuple[str, str, str]]:
+    """(kind, query, relevant doc id); half exact-identifier, half paraphrase."""
+    rng = random.Random(seed)
+    ids = list(docs)
+    out = []
+    for q in range(n):
+        doc_id = rng.choice(ids)
+        if q % 2 == 0:
+            out.append(("exact", f"what does {codes[doc_id]} mean", doc_id))
+        else:
+            words = [w for w in docs[doc_id].split() if w not in FILLER and w != codes[doc_id]]
+            out.append(("semantic", " ".join(rng.sample(words, min(8, len(words)))), doc_id))
+    return out
+
+# ── Embedders ────────────────────────────────────────
+
+def hash_embedder(dim: int = 256) -> Callable[[List[str]], List[Dict[int, float]]]:
+    return lambda texts: [hashed_features(t, dim) for t in texts]
+
+def minilm_embedder():
+    from sentence_transformers import SentenceTransformer
+    model = SentenceTransformer("sentence-transformers/all-MiniLM-L6-v2")
+
+    def embed(texts):
+        vecs = model.encode(texts, normalize_embeddings=True)
+        return [dict(enumerate(v.tolist())) for v in vecs]
+    return embed
+
+def sparse_dot(a: Dict[int, float], b: Dict[int, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(v * b.get(k, 0.0) for k, v in a.items())
+
+# ── Retrievers ───────────────────────────────────────
+
+class DenseIndex:
+    def __init__(self, embed, docs: Dict[str, str]):
+        self.embed = embed
+        ids = list(docs)
+        self.items = list(zip(ids, embed([docs[i] for i in ids])))
+
+    def search(self, query: str, k: int) -> List[str]:
+        q = self.embed([query])[0]
+        scored = sorted(((sparse_dot(q, v), doc_id) for doc_id, v in self.items), reverse=True)
+        return [doc_id for _, doc_id in scored[:k]]
+
+def run_mode(mode: str, queries, dense: DenseIndex, bm25: BM25Index, k: int, fetch_k: int) -> Dict:
+    hits = defaultdict(int)
+    totals = defaultdict(int)
+    latencies = []
+    for kind, query, relevant in queries:
+        start = time.perf_counter()
+        if mode == "dense":
+            ranked = dense.search(query, k)
+        elif mode == "bm25":
+            ranked = [d for d, _ in bm25.search(query, k)]
+        else:
+            fused = reciprocal_rank_fusion([
+                dense.search(query, fetch_k),
+                [d for d, _ in bm25.search(query, fetch_k)],
+            ])
+            ranked = [d for d, _ in fused[:k]]
+        latencies.append((time.perf_counter() - start) * 1000)
+        totals[kind] += 1
+        hits[kind] += relevant in ranked
+
+    latencies.sort()
+    return {
+        "recall_at_k": {kind: hits[kind] / totals[kind] for kind in totals},
+        "recall_at_k_overall": sum(hits.values()) / len(queries),
+        "latency_ms_mean": sum(latencies) / len(latencies),
+        "latency_ms_p95": latencies[int(0.95 * (len(latencies) - 1))],
+    }
+
+def main(argv=None) -> Dict:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    ap.add_argument("--docs", type=int, default=2000)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--k", type=int, default=5)
+    ap.add_argument("--fetch-k", type=int, default=20)
+    ap.add_argument("--embedder", choices=["hash", "minilm"], default="hash")
+    args = ap.parse_args(argv)
+
+    docs, codes = make_corpus(args.docs)
+    queries = make_queries(docs, codes, args.queries)
+    embed = hash_embedder() if args.embedder == "hash" else minilm_embedder()
+
+    t0 = time.perf_counter()
+    dense = DenseIndex(embed, docs)
+    dense_build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    bm25 = BM25Index()
+    bm25.add(docs.items())
+    bm25_build = time.perf_counter() - t0
+
+    result = {
+        "benchmark": "hybrid_retrieval",
+        "params": vars(args),
+        "build_s": {"dense": dense_build, "bm25": bm25_build},
+        "modes": {mode: run_mode(mode, queries, dense, bm25, args.k, args.fetch_k)
+                  for mode in ("dense", "bm25", "hybrid")},
+    }
+    json.dump(result, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return result
+
+if __name__ == "__main__":
+    main()
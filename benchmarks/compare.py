@@ -0,0 +1,42 @@
+"""
+Diff two `benchmarks.run` JSON reports metric by metric.
+
+    python -m benchmarks.compare base.json head.json
+"""
+import sys
+import json
+import argparse
+from typing import Dict, Iterator, Tuple
+
+def _leaves(node, prefix: str = "") -> Iterator[Tuple[str, float]]:
+    if isinstance(node, dict):
+        for key, value in node.items():
+            yield from _leaves(value, f"{prefix}.{key}" if prefix else key)
+    elif isinstance(node, (int, float)) and not isinstance(node, bool):
+        yield prefix, float(node)
+
+def compare(base: Dict, head: Dict) -> Dict[str, Dict[str, float]]:
+    old = dict(_leaves(base.get("results", {})))
+    new = dict(_leaves(head.get("results", {})))
+    out = {}
+    for key in sorted(old.keys() & new.keys()):
+        delta = (new[key] - old[key]) / old[key] * 100 if old[key] else 0.0
+        out[key] = {"base": old[key], "head": new[key], "change_pct": delta}
+    return out
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="Compare two benchmark reports")
+    ap.add_argument("base")
+    ap.add_argument("head")
+    args = ap.parse_args(argv)
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.head) as f:
+        head = json.load(f)
+
+    print(f"base {base.get('commit', '?')[:10]}  →  head {head.get('commit', '?')[:10]}")
+    for key, row in compare(base, head).items():
+        print(f"{key:50s} {row['base']:>12.3f} {row['head']:>12.3f} {row['change_pct']:>+8.1f}%")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
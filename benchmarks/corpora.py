@@ -0,0 +1,58 @@
+"""
+Deterministic generated corpora: multi-page PDFs (via PyMuPDF) and small
+synthetic images (via Pillow), written under a caller-supplied directory.
+"""
+import os
+import random
+from typing import List
+
+VOCAB = (
+    "retrieval vector index embedding chunk query answer latency throughput "
+    "namespace document page section figure table model token context "
+    "router packet firewall disk snapshot invoice payment session credential "
+    "compressor thermostat sensor valve printer toner cartridge driver"
+).split()
+
+def _paragraph(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(VOCAB) for _ in range(words)).capitalize() + "."
+
+def make_pdf_corpus(out_dir: str, n_docs: int = 5, pages: int = 20,
+                    words_per_page: int = 300, seed: int = 3) -> List[str]:
+    """Write `n_docs` PDFs of `pages` text pages each; returns their paths."""
+    import fitz
+
+    os.makedirs(out_dir, exist_ok=True)
+    rng = random.Random(seed)
+    paths = []
+    for d in range(n_docs):
+        doc = fitz.open()
+        for _ in range(pages):
+            page = doc.new_page()
+            text = "\n\n".join(_paragraph(rng, 50) for _ in range(max(1, words_per_page // 50)))
+            page.insert_textbox(fitz.Rect(50, 50, 545, 800), text, fontsize=9)
+        path = os.path.join(out_dir, f"doc_{d:03d}.pdf")
+        doc.save(path)
+        doc.close()
+        paths.append(path)
+    return paths
+
+def make_image_corpus(out_dir: str, n_images: int = 200, size: int = 256,
+                      seed: int = 5) -> List[str]:
+    """Write `n_images` JPEGs of random coloured shapes; returns their paths."""
+    from PIL import Image, ImageDraw
+
+    os.makedirs(out_dir, exist_ok=True)
+    rng = random.Random(seed)
+    paths = []
+    for i in range(n_images):
+        img = Image.new("RGB", (size, size), tuple(rng.randint(0, 255) for _ in range(3)))
+        draw = ImageDraw.Draw(img)
+        for _ in range(rng.randint(2, 6)):
+            x0, y0 = rng.randint(0, size - 40), rng.randint(0, size - 40)
+            box = (x0, y0, x0 + rng.randint(20, size // 2), y0 + rng.randint(20, size // 2))
+            fill = tuple(rng.randint(0, 255) for _ in range(3))
+            (draw.ellipse if rng.random() < 0.5 else draw.rectangle)(box, fill=fill)
+        path = os.path.join(out_dir, f"img_{i:04d}.jpg")
+        img.save(path, format="JPEG", quality=85)
+        paths.append(path)
+    return paths
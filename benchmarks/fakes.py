@@ -0,0 +1,186 @@
+"""
+Local stand-ins for every external service the pipelines call: Pinecone,
+the OpenAI chat model, Gemini (text + vision), web search, and the
+MiniLM / CLIP embedders. All are deterministic and run offline; an optional
+`latency_s` simulates network round-trips so concurrency effects show up.
+"""
+import re
+import math
+import time
+import hashlib
+import threading
+from collections import defaultdict
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Optional
+
+from langgraphagenticai.utils.bm25_utils import tokenize
+
+# ── Embeddings ───────────────────────────────────────
+
+def hashed_features(text: str, dim: int, blur_digits: bool = True) -> Dict[int, float]:
+    """
+    Signed feature hashing of word tokens, L2-normalized, as a sparse dict.
+    Digits are blurred by default, mimicking how sentence embedders treat
+    identifiers such as "ERR-4821" and "ERR-1937" as near-identical.
+    """
+    vec: Dict[int, float] = defaultdict(float)
+    for tok in tokenize(text):
+        if blur_digits:
+            tok = re.sub(r"\d", "0", tok)
+        h = int(hashlib.md5(tok.encode()).hexdigest(), 16)
+        vec[h % dim] += 1.0 if (h >> 8) & 1 else -1.0
+    norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+    return {k: v / norm for k, v in vec.items()}
+
+class TinyEmbeddings:
+    """LangChain-compatible embedder (`embed_documents` / `embed_query`)."""
+
+    def __init__(self, dim: int = 64):
+        self.dim = dim
+
+    def _dense(self, text: str) -> List[float]:
+        vec = [0.0] * self.dim
+        for k, v in hashed_features(text, self.dim).items():
+            vec[k] = v
+        return vec
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._dense(t) for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._dense(text)
+
+class FakeClip:
+    """SentenceTransformer-like `encode(image)` from a 16×16 grayscale thumbnail."""
+
+    def encode(self, img):
+        import numpy as np
+        arr = np.asarray(img.convert("L").resize((16, 16)), dtype="float32").ravel()
+        arr -= arr.mean()
+        return arr / (np.linalg.norm(arr) or 1.0)
+
+# ── Pinecone ─────────────────────────────────────────
+
+class FakePineconeIndex:
+    """In-memory subset of the Pinecone `Index` API used by pdf_tool."""
+
+    def __init__(self, latency_s: float = 0.0):
+        self.latency_s = latency_s
+        self._ns: Dict[str, Dict[str, dict]] = defaultdict(dict)
+        self._lock = threading.Lock()
+
+    def _wait(self):
+        if self.latency_s:
+            time.sleep(self.latency_s)
+
+    def upsert(self, vectors: List[dict], namespace: str = ""):
+        self._wait()
+        with self._lock:
+            for v in vectors:
+                self._ns[namespace][v["id"]] = v
+        return SimpleNamespace(upserted_count=len(vectors))
+
+    def query(self, vector: List[float], top_k: int = 10, namespace: str = "",
+              include_values: bool = False, include_metadata: bool = False, **_):
+        self._wait()
+        with self._lock:
+            items = list(self._ns.get(namespace, {}).values())
+        scored = sorted(
+            ((sum(a * b for a, b in zip(vector, v["values"])), v) for v in items),
+            key=lambda sv: sv[0], reverse=True,
+        )[:top_k]
+        return SimpleNamespace(matches=[
+            SimpleNamespace(
+                id=v["id"], score=score,
+                values=v["values"] if include_values else [],
+                metadata=v.get("metadata") if include_metadata else None,
+            )
+            for score, v in scored
+        ])
+
+    def fetch(self, ids: List[str], namespace: str = ""):
+        self._wait()
+        with self._lock:
+            store = self._ns.get(namespace, {})
+            found = {i: SimpleNamespace(id=i, values=store[i]["values"], metadata=store[i].get("metadata"))
+                     for i in ids if i in store}
+        return SimpleNamespace(vectors=found)
+
+    def delete(self, ids: Optional[List[str]] = None, delete_all: bool = False, namespace: str = ""):
+        self._wait()
+        with self._lock:
+            if delete_all:
+                self._ns.pop(namespace, None)
+            else:
+                for i in ids or []:
+                    self._ns.get(namespace, {}).pop(i, None)
+
+    def describe_index_stats(self):
+        with self._lock:
+            return SimpleNamespace(namespaces={
+                ns: SimpleNamespace(vector_count=len(store)) for ns, store in self._ns.items() if store
+            })
+
+# ── LLMs ─────────────────────────────────────────────
+
+def _answer_for(prompt: str) -> str:
+    digest = hashlib.sha1(prompt.encode()).hexdigest()[:8]
+    return f"Stand-in answer {digest} drawing on {len(prompt)} prompt characters."
+
+class FakeChatModel:
+    """Minimal ChatOpenAI stand-in: `invoke` and `stream` over a string prompt."""
+
+    def __init__(self, latency_s: float = 0.0, streaming: bool = False):
+        self.latency_s = latency_s
+        self.streaming = streaming
+
+    def invoke(self, prompt: str):
+        time.sleep(self.latency_s)
+        return SimpleNamespace(content=_answer_for(prompt))
+
+    def stream(self, prompt: str) -> Iterator[SimpleNamespace]:
+        words = _answer_for(prompt).split(" ")
+        for i, w in enumerate(words):
+            time.sleep(self.latency_s / len(words))
+            yield SimpleNamespace(content=w if i == 0 else " " + w)
+
+def chat_model_factory(latency_s: float = 0.0):
+    """Drop-in for the `ChatOpenAI` class passed to `configure_backends`."""
+    return lambda streaming=False: FakeChatModel(latency_s, streaming)
+
+class FakeGemini:
+    """
+    GenerativeModel stand-in for text and vision prompts. Text prompts are
+    echoed after their first blank line (keeping translation batch markers
+    intact); vision prompts get a fixed description.
+    """
+
+    def __init__(self, latency_s: float = 0.0):
+        self.latency_s = latency_s
+
+    def _reply(self, content) -> str:
+        if isinstance(content, list):
+            return "The image shows a small synthetic test pattern."
+        return content.split("\n\n", 1)[-1]
+
+    def generate_content(self, content, stream: bool = False):
+        text = self._reply(content)
+        if not stream:
+            time.sleep(self.latency_s)
+            return SimpleNamespace(text=text)
+        return self._stream(text)
+
+    def _stream(self, text: str):
+        pieces = [text[i:i + 16] for i in range(0, len(text), 16)] or [""]
+        for piece in pieces:
+            time.sleep(self.latency_s / len(pieces))
+            yield SimpleNamespace(text=piece)
+
+# ── Search ───────────────────────────────────────────
+
+def search_backend(latency_s: float = 0.0):
+    """`str -> str` backend for `set_search_backend`."""
+    def search(query: str) -> str:
+        time.sleep(latency_s)
+        return f"Stand-in web results for: {query}"
+    return search
@@ -0,0 +1,222 @@
+"""
+Offline benchmark harness for the ingest, retrieval, image-search and graph
+paths. Every external service is replaced by a stand-in from
+`benchmarks.fakes`, corpora are generated by `benchmarks.corpora`, and the
+results are written as JSON (tagged with the git commit) so runs can be
+diffed with `benchmarks.compare`.
+
+    PYTHONPATH=src python -m benchmarks.run --out bench.json
+    PYTHONPATH=src python -m benchmarks.run --only pdf_parse,query_pdf --llm-latency-ms 200
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+BENCHMARKS = ["pdf_parse", "ingest_pdf", "query_pdf", "faiss_build", "image_similar", "graph"]
+
+# ── Timing helpers ───────────────────────────────────
+
+def _percentile(sorted_vals: List[float], q: float) -> float:
+    return sorted_vals[min(len(sorted_vals) - 1, int(q * len(sorted_vals)))]
+
+def latency_stats(samples_s: List[float]) -> Dict[str, float]:
+    ms = sorted(s * 1000 for s in samples_s)
+    return {
+        "n": len(ms),
+        "mean_ms": sum(ms) / len(ms),
+        "p50_ms": _percentile(ms, 0.50),
+        "p95_ms": _percentile(ms, 0.95),
+        "max_ms": ms[-1],
+    }
+
+def timed(fn: Callable, *args, **kwargs):
+    start = time.perf_counter()
+    out = fn(*args, **kwargs)
+    return out, time.perf_counter() - start
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return "unknown"
+
+# ── Wiring the stand-ins ─────────────────────────────
+
+def install_fakes(args) -> None:
+    from benchmarks import fakes
+    from langgraphagenticai.tools import pdf_tool
+    from langgraphagenticai.tools.translate_tool import Translator, set_translator
+    from langgraphagenticai.tools.search_service import set_search_backend
+    from langgraphagenticai.utils import image_utils
+
+    llm_s = args.llm_latency_ms / 1000
+    pdf_tool.configure_backends(
+        index=fakes.FakePineconeIndex(latency_s=args.vector_latency_ms / 1000),
+        embeddings=fakes.TinyEmbeddings(),
+        llm_factory=fakes.chat_model_factory(llm_s),
+    )
+    set_translator(Translator(model=fakes.FakeGemini(llm_s)))
+    set_search_backend("web", fakes.search_backend(args.search_latency_ms / 1000))
+    image_utils._clip = fakes.FakeClip()
+
+# ── Benchmarks ───────────────────────────────────────
+
+def bench_pdf_parse(ctx) -> Dict:
+    import fitz
+    from langgraphagenticai.utils.pdf_utils import load_and_split_pdf
+
+    pages = chunks = 0
+    total = 0.0
+    for path in ctx["pdfs"]:
+        with fitz.open(path) as doc:
+            pages += doc.page_count
+        docs, elapsed = timed(load_and_split_pdf, path)
+        chunks += len(docs)
+        total += elapsed
+    return {"docs": len(ctx["pdfs"]), "pages": pages, "chunks": chunks, "seconds": total,
+            "pages_per_s": pages / total, "chunks_per_s": chunks / total}
+
+def bench_ingest_pdf(ctx) -> Dict:
+    from langgraphagenticai.tools.pdf_tool import ingest_pdf
+
+    chunks = 0
+    total = 0.0
+    for path in ctx["pdfs"]:
+        res, elapsed = timed(ingest_pdf, path, namespace=ctx["namespace"])
+        chunks += res["ingested_chunks"]
+        total += elapsed
+    ctx["ingested"] = True
+    return {"docs": len(ctx["pdfs"]), "chunks": chunks, "seconds": total,
+            "chunks_per_s": chunks / total}
+
+def _ensure_ingested(ctx) -> None:
+    if not ctx.get("ingested"):
+        bench_ingest_pdf(ctx)
+
+def bench_query_pdf(ctx) -> Dict:
+    from langgraphagenticai.tools.pdf_tool import query_pdf
+
+    _ensure_ingested(ctx)
+    samples = [timed(query_pdf, q, ctx["namespace"])[1] for q in ctx["queries"]]
+    return latency_stats(samples)
+
+def bench_faiss_build(ctx) -> Dict:
+    from langgraphagenticai.utils.image_utils import create_faiss_index
+
+    index_path = os.path.join(ctx["workdir"], "image.index")
+    (_, paths), elapsed = timed(create_faiss_index, ctx["image_dir"], index_path)
+    ctx["index_path"] = index_path
+    return {"images": len(paths), "seconds": elapsed, "images_per_s": len(paths) / elapsed}
+
+def bench_image_similar(ctx) -> Dict:
+    from benchmarks.fakes import FakeGemini
+    from langgraphagenticai.tools.image_tool import ImageProcessor, set_processor
+
+    if "index_path" not in ctx:
+        bench_faiss_build(ctx)
+    proc = ImageProcessor(vision=FakeGemini(), index_path=ctx["index_path"],
+                          image_folder=ctx["image_dir"])
+    set_processor(proc)
+    probes = ctx["images"][: ctx["args"].similar_queries]
+    start = time.perf_counter()
+    samples = [timed(proc.similar, p, 5)[1] for p in probes]
+    wall = time.perf_counter() - start
+    return {**latency_stats(samples), "qps": len(probes) / wall}
+
+def bench_graph(ctx) -> Dict:
+    from langgraphagenticai.graph.chatbot_graph import create_pdf_graph
+
+    _ensure_ingested(ctx)
+    graph = create_pdf_graph()
+    out = {}
+    for level in ctx["args"].concurrency:
+        states = [
+            {"input": q, "lang": "de" if i % 2 else "en", "namespace": ctx["namespace"]}
+            for i, q in enumerate(ctx["queries"] * max(1, level))
+        ]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=level) as pool:
+            samples = list(pool.map(lambda s: timed(graph.invoke, s)[1], states))
+        wall = time.perf_counter() - start
+        out[str(level)] = {**latency_stats(samples), "throughput_rps": len(states) / wall}
+    return out
+
+RUNNERS = {
+    "pdf_parse": bench_pdf_parse,
+    "ingest_pdf": bench_ingest_pdf,
+    "query_pdf": bench_query_pdf,
+    "faiss_build": bench_faiss_build,
+    "image_similar": bench_image_similar,
+    "graph": bench_graph,
+}
+
+# ── Entry point ──────────────────────────────────────
+
+def main(argv=None) -> Dict:
+    ap = argparse.ArgumentParser(description="Offline performance benchmarks")
+    ap.add_argument("--out", help="write JSON here instead of stdout")
+    ap.add_argument("--only", help=f"comma-separated subset of {','.join(BENCHMARKS)}")
+    ap.add_argument("--pdfs", type=int, default=5)
+    ap.add_argument("--pages", type=int, default=20)
+    ap.add_argument("--images", type=int, default=200)
+    ap.add_argument("--queries", type=int, default=20)
+    ap.add_argument("--similar-queries", type=int, default=50)
+    ap.add_argument("--concurrency", type=lambda s: [int(x) for x in s.split(",")], default=[1, 4, 16])
+    ap.add_argument("--llm-latency-ms", type=float, default=0.0)
+    ap.add_argument("--vector-latency-ms", type=float, default=0.0)
+    ap.add_argument("--search-latency-ms", type=float, default=0.0)
+    args = ap.parse_args(argv)
+    selected = args.only.split(",") if args.only else BENCHMARKS
+
+    with tempfile.TemporaryDirectory(prefix="multirag-bench-") as workdir:
+        # must be set before the BM25 / namespace modules read them
+        os.environ["BM25_INDEX_DIR"] = os.path.join(workdir, "bm25")
+        os.environ["NAMESPACE_DB"] = os.path.join(workdir, "namespaces.db")
+        from benchmarks.corpora import make_image_corpus, make_pdf_corpus, VOCAB
+
+        install_fakes(args)
+        ctx = {
+            "args": args,
+            "workdir": workdir,
+            "namespace": "bench",
+            "queries": [" ".join(VOCAB[i:i + 4]) for i in range(args.queries)],
+        }
+        if {"pdf_parse", "ingest_pdf", "query_pdf", "graph"} & set(selected):
+            ctx["pdfs"] = make_pdf_corpus(os.path.join(workdir, "pdfs"), args.pdfs, args.pages)
+        if {"faiss_build", "image_similar"} & set(selected):
+            ctx["image_dir"] = os.path.join(workdir, "images")
+            ctx["images"] = make_image_corpus(ctx["image_dir"], args.images)
+
+        results = {}
+        for name in selected:
+            print(f"running {name}...", file=sys.stderr)
+            results[name] = RUNNERS[name](ctx)
+
+    report = {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "params": {k: v for k, v in vars(args).items() if k not in ("out", "only")},
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    return report
+
+if __name__ == "__main__":
+    main()
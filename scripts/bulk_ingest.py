@@ -0,0 +1,65 @@
+"""
+Ingest every PDF in a directory into Pinecone + BM25, extracting text across
+the shared process pool (large files are split by page range, small files
+run one per worker).
+
+    PYTHONPATH=src python scripts/bulk_ingest.py ./docs --namespace manuals --workers 8
+"""
+import os
+import sys
+import time
+import argparse
+from typing import List
+
+from langgraphagenticai.utils.pdf_utils import extract_many, shutdown_extraction_pool, split_text
+from langgraphagenticai.tools.pdf_tool import _doc_key, ingest_documents
+
+def find_pdfs(directory: str, recursive: bool = False) -> List[str]:
+    if recursive:
+        paths = [os.path.join(root, name)
+                 for root, _, names in os.walk(directory) for name in names]
+    else:
+        paths = [os.path.join(directory, name) for name in os.listdir(directory)]
+    return sorted(p for p in paths if p.lower().endswith(".pdf") and os.path.isfile(p))
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Bulk-ingest a directory of PDFs")
+    ap.add_argument("directory")
+    ap.add_argument("--namespace", default="default")
+    ap.add_argument("--workers", type=int, default=None, help="extraction processes (default: PDF_EXTRACT_WORKERS)")
+    ap.add_argument("--recursive", action="store_true")
+    args = ap.parse_args(argv)
+
+    paths = find_pdfs(args.directory, args.recursive)
+    if not paths:
+        print(f"No PDFs found in {args.directory}")
+        return 1
+
+    start = time.perf_counter()
+    pages = chunks = failed = 0
+    try:
+        for path, texts, error in extract_many(paths, workers=args.workers):
+            if error is not None:
+                failed += 1
+                print(f"❌ {path}: {error}")
+                continue
+            try:
+                docs = split_text("\n".join(texts))
+                res = ingest_documents(docs, _doc_key(path), os.path.basename(path), args.namespace)
+            except Exception as e:
+                failed += 1
+                print(f"❌ {path}: {e}")
+                continue
+            pages += len(texts)
+            chunks += res["ingested_chunks"]
+            print(f"✅ {path}: {len(texts)} pages, {res['ingested_chunks']} chunks")
+    finally:
+        shutdown_extraction_pool()
+
+    elapsed = time.perf_counter() - start
+    print(f"Ingested {len(paths) - failed}/{len(paths)} files, {pages} pages, "
+          f"{chunks} chunks in {elapsed:.1f}s into '{args.namespace}'")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,11 +3,37 @@
 import os
 import io
 import logging
-from fastapi import FastAPI, UploadFile, File, Form, Header, HTTPException, status
-from fastapi.responses import JSONResponse
-from typing import List, Dict
+from fastapi import FastAPI, UploadFile, File, Form, Header, HTTPException, Query, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import Any, List, Dict
 from PIL import Image
-from langgraphagenticai.tools.image_tool import query_image, search_similar_images
+from langgraphagenticai.tools.image_tool import (
+    loaded_models,
+    query_image,
+    search_similar_images,
+    warm_up_search,
+)
+from langgraphagenticai.graph.chatbot_graph import get_image_graph, stream_final_output
+from langgraphagenticai.utils.stream_utils import to_sse
+from langgraphagenticai.utils.image_utils import MAX_SIZE_MB, get_clip_model
+from langgraphagenticai.utils.cache_utils import AsyncSingleFlight
+from langgraphagenticai.utils.diagnostics import (
+    DIAG_MAX_PROFILE_S,
+    Readiness,
+    check_bearer,
+    process_memory,
+    sample_cpu_profile,
+    threadpool_stats,
+    tracemalloc_top,
+)
+from langgraphagenticai.utils.upload_utils import (
+    MULTIPART_SLACK,
+    MaxBodySizeMiddleware,
+    SpooledUpload,
+    UploadTooLarge,
+    spool_upload,
+)
 
 # ── Logging ─────────────────────────────────────────────
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
@@ -19,6 +45,11 @@ if not API_TOKEN:
     logger.error("API_AUTH_TOKEN is not set")
     raise RuntimeError("API_AUTH_TOKEN environment variable must be set")
 
+MAX_IMAGE_BYTES = MAX_SIZE_MB * 1024 * 1024
+
+# Identical concurrent /describe requests (same image bytes + question) share one Gemini call
+describe_flight = AsyncSingleFlight()
+
 # ── FastAPI setup ───────────────────────────────────────
 app = FastAPI(
     title="GPU Image Service",
@@ -28,17 +59,35 @@ app = FastAPI(
     redoc_url=None
 )
 
+# Oversized uploads get a 413 while streaming; auth (registered below) runs first
+app.add_middleware(MaxBodySizeMiddleware, max_bytes=MAX_IMAGE_BYTES + MULTIPART_SLACK)
+
+# Readiness probes (Docker HEALTHCHECK, load balancer) can't send the token
+PUBLIC_PATHS = {"/health"}
+
 @app.middleware("http")
 async def check_auth(request, call_next):
-    # All endpoints require Bearer token
-    auth = request.headers.get("authorization")
-    if auth != f"Bearer {API_TOKEN}":
+    # Every other endpoint requires the Bearer token
+    if request.url.path in PUBLIC_PATHS:
+        return await call_next(request)
+    if not check_bearer(request.headers.get("authorization"), API_TOKEN):
         return JSONResponse(
             {"detail": "Invalid or missing authorization token"},
             status_code=status.HTTP_401_UNAUTHORIZED
         )
     return await call_next(request)
 
+# ── Upload handling ──────────────────────────────────────
+async def _spool_image(file: UploadFile) -> SpooledUpload:
+    """
+    Stream the upload into a private spooled temp file (memory first, disk
+    past the spool threshold, removed on close) instead of /tmp/<filename>.
+    """
+    try:
+        return await spool_upload(file, MAX_IMAGE_BYTES)
+    except UploadTooLarge as e:
+        raise HTTPException(status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+
 # ── /describe endpoint ───────────────────────────────────
 @app.post("/describe", summary="Ask a question about an image")
 async def describe_image(
@@ -49,19 +98,54 @@ async def describe_image(
     Returns a concise answer about the contents of the image,
     powered by Gemini Vision (with retry/backoff).
     """
-    # save to temp
-    tmp_path = f"/tmp/{file.filename}"
-    data = await file.read()
-    with open(tmp_path, "wb") as f:
-        f.write(data)
+    upload = await _spool_image(file)
+    owned = False
+
+    def describe():
+        # only the leader runs this; its task owns (and closes) the upload
+        nonlocal owned
+        owned = True
+
+        async def run() -> str:
+            with upload:
+                return await run_in_threadpool(query_image, query, upload.rewind())
+        return run()
 
     try:
-        answer = query_image(query, tmp_path)
+        answer = await describe_flight.do(("describe", upload.sha256, query.strip()), describe)
         return {"description": answer}
     except Exception as e:
         logger.exception("describe_image failed")
         raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR,
                             detail="Image description failed")
+    finally:
+        if not owned:
+            upload.close()
+
+# ── /describe/stream endpoint ────────────────────────────
+@app.post("/describe/stream", summary="Stream an answer about an image (SSE)",
+          response_class=StreamingResponse)
+async def describe_image_stream(
+    file: UploadFile = File(..., description="Your image file"),
+    query: str      = Form(..., description="Your free-form question about the image")
+):
+    """
+    Same as /describe, but tokens are pushed as Server-Sent Events while
+    Gemini Vision generates them.
+    """
+    upload = await _spool_image(file)
+
+    def tokens():
+        # the spooled upload lives until the last token has been sent
+        with upload:
+            state = {"input": query, "lang": "en", "image_path": upload.rewind()}
+            yield from stream_final_output(get_image_graph(), state)
+
+    return StreamingResponse(
+        to_sse(tokens(), error_message="Image description failed"),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 # ── /search endpoint ─────────────────────────────────────
 @app.post("/search", summary="Find visually similar images")
@@ -73,27 +157,75 @@ async def find_similar(
     Returns a list of file-paths (or URLs) of the top_k images
     in your FAISS index most similar to the uploaded file.
     """
-    tmp_path = f"/tmp/{file.filename}"
-    data = await file.read()
-    with open(tmp_path, "wb") as f:
-        f.write(data)
+    with await _spool_image(file) as upload:
+        try:
+            matches = search_similar_images(upload.rewind(), top_k)
+            return {"matches": matches}
+        except ValueError as e:
+            # invalid image format / validation failure
+            raise HTTPException(status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except Exception as e:
+            logger.exception("find_similar failed")
+            raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR,
+                                detail="Similarity search failed")
 
-    try:
-        matches = search_similar_images(tmp_path, top_k)
-        return {"matches": matches}
-    except ValueError as e:
-        # invalid image format / validation failure
-        raise HTTPException(status.HTTP_400_BAD_REQUEST, detail=str(e))
-    except Exception as e:
-        logger.exception("find_similar failed")
-        raise HTTPException(status.HTTP_500_INTERNAL_SERVER_ERROR,
-                            detail="Similarity search failed")
+# ── Warm-up & readiness ─────────────────────────────────
+# /health answers 503 until CLIP and the FAISS index are loaded, so the
+# load balancer keeps routing around a worker that is still cold
+readiness = Readiness("clip", "faiss_index")
+
+def _warm_clip() -> None:
+    get_clip_model().encode(Image.new("RGB", (224, 224)))  # first call also pays graph init
+
+@app.on_event("startup")
+def start_warm_up() -> None:
+    readiness.warm_up({"clip": _warm_clip, "faiss_index": warm_up_search})
+
+@app.on_event("shutdown")
+def stop_warm_up() -> None:
+    readiness.stop()
 
 # ── Health & Root ───────────────────────────────────────
 @app.get("/", include_in_schema=False)
 async def root():
     return {"service": "gpu-image", "status": "ok"}
 
-@app.get("/health", summary="Service health check")
+@app.get("/health", summary="Readiness: 200 once CLIP and the FAISS index are loaded, else 503")
 async def health():
-    return {"status": "healthy"}
+    # error details stay behind auth, on /diagnostics
+    report = readiness.report()
+    return JSONResponse(
+        {"status": "healthy" if report["ready"] else "starting", "checks": report["checks"]},
+        status_code=status.HTTP_200_OK if report["ready"] else status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
+
+@app.get("/metrics", summary="Request coalescing counters")
+async def metrics() -> Dict[str, Any]:
+    return {"describe_single_flight": describe_flight.stats()}
+
+# ── Diagnostics (behind the same Bearer token) ───────────
+@app.get("/diagnostics", summary="Memory, loaded models, cache counters and executor queue depths")
+async def diagnostics() -> Dict[str, Any]:
+    return {
+        "readiness": readiness.report(),
+        "memory": process_memory(),
+        "models": loaded_models(),
+        "caches": {"describe_single_flight": describe_flight.stats()},
+        "executors": {"threadpool": threadpool_stats()},
+    }
+
+@app.get("/diagnostics/profile", summary="Sampling CPU profile of all threads over N seconds")
+async def diagnostics_profile(
+    seconds: float = Query(5.0, gt=0, le=DIAG_MAX_PROFILE_S),
+    interval: float = Query(0.01, ge=0.001, le=1.0),
+    top: int = Query(25, ge=1, le=200),
+) -> Dict[str, Any]:
+    # the sampler blocks, so it runs in a worker thread while requests keep flowing
+    return await run_in_threadpool(sample_cpu_profile, seconds, interval, top)
+
+@app.get("/diagnostics/tracemalloc", summary="Top allocation sites (first call starts tracing)")
+async def diagnostics_tracemalloc(
+    limit: int = Query(20, ge=1, le=200),
+    stop: bool = Query(False, description="Take a last snapshot and stop tracing"),
+) -> Dict[str, Any]:
+    return await run_in_threadpool(tracemalloc_top, limit, stop)
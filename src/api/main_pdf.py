@@ -1,19 +1,55 @@
 # src/api/main_pdf.py
 
 import os
-import uuid
+import sys
 import logging
-from typing import Any, Dict
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Request
-from fastapi.responses import RedirectResponse, JSONResponse
+from fastapi import APIRouter, Depends, FastAPI, UploadFile, File, Form, Header, HTTPException, Query, Request
+from fastapi.responses import RedirectResponse, JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
+from starlette.concurrency import run_in_threadpool
 from starlette.status import (
+    HTTP_202_ACCEPTED,
+    HTTP_400_BAD_REQUEST,
+    HTTP_401_UNAUTHORIZED,
+    HTTP_403_FORBIDDEN,
+    HTTP_413_REQUEST_ENTITY_TOO_LARGE,
     HTTP_422_UNPROCESSABLE_ENTITY,
     HTTP_500_INTERNAL_SERVER_ERROR,
+    HTTP_503_SERVICE_UNAVAILABLE,
 )
 from langgraphagenticai.tools import pdf_tool  # for type checking only; actual import done lazily
+from langgraphagenticai.tools.ingest_jobs import get_ingest_queue, job_status
+from langgraphagenticai.utils.cache_utils import AsyncSingleFlight
+from langgraphagenticai.utils.diagnostics import (
+    DIAG_MAX_PROFILE_S,
+    Readiness,
+    check_bearer,
+    process_memory,
+    sample_cpu_profile,
+    threadpool_stats,
+    tracemalloc_top,
+)
+from langgraphagenticai.utils.pdf_utils import extraction_pool_stats
+from langgraphagenticai.utils.namespace_utils import (
+    InvalidTenant,
+    document_namespace,
+    get_namespace_registry,
+    normalize_tenant,
+    parse_tenant_tokens,
+    tenant_for_token,
+    tenant_namespace,
+)
+from langgraphagenticai.utils.upload_utils import (
+    MAX_PDF_BYTES,
+    MULTIPART_SLACK,
+    MaxBodySizeMiddleware,
+    UploadTooLarge,
+    spool_upload,
+)
 
 # ─── CONFIG & LOGGER ──────────────────────────────────────────────────────────
 API_AUTH_TOKEN = os.getenv("API_AUTH_TOKEN", "")
@@ -21,6 +57,11 @@ if not API_AUTH_TOKEN:
     logging.warning("No API_AUTH_TOKEN set; skipping auth checks.")
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("pdf_rag_service")
+NAMESPACE_SWEEP_S = float(os.getenv("NAMESPACE_SWEEP_MINUTES", "60")) * 60
+TENANT_TOKENS = parse_tenant_tokens()  # per-tenant bearer tokens: token → tenant
+
+# Identical concurrent /process requests (same PDF bytes, question, tenant) share one run
+process_flight = AsyncSingleFlight()
 
 # ─── APP & CORS ────────────────────────────────────────────────────────────────
 app = FastAPI(
@@ -32,6 +73,10 @@ app = FastAPI(
     openapi_url="/openapi.json",
 )
 
+# Refuse oversized uploads while they stream in, not after buffering them
+# (added first so CORS, added last, stays outermost and decorates the 413)
+app.add_middleware(MaxBodySizeMiddleware, max_bytes=MAX_PDF_BYTES + MULTIPART_SLACK)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],      # tighten in prod!
@@ -45,10 +90,69 @@ app.add_middleware(
 def root() -> RedirectResponse:
     return RedirectResponse(url=app.docs_url)
 
+# ─── BACKGROUND INGEST WORKERS ────────────────────────────────────────────────
+@app.on_event("startup")
+def start_ingest_workers() -> None:
+    # also resumes jobs a previous process left queued or running
+    get_ingest_queue().start()
+
+@app.on_event("shutdown")
+def stop_ingest_workers() -> None:
+    get_ingest_queue().stop(timeout=5)
+
+# ─── NAMESPACE EVICTION & COMPACTION ──────────────────────────────────────────
+_stop_sweeper = threading.Event()
+
+def _sweep_namespaces() -> None:
+    while not _stop_sweeper.wait(NAMESPACE_SWEEP_S):
+        try:
+            from langgraphagenticai.tools.pdf_tool import run_namespace_maintenance
+            logger.info("Namespace maintenance: %s", run_namespace_maintenance())
+        except Exception:
+            logger.exception("Namespace maintenance failed")
+
+@app.on_event("startup")
+def start_namespace_sweeper() -> None:
+    threading.Thread(target=_sweep_namespaces, name="namespace-sweeper", daemon=True).start()
+
+@app.on_event("shutdown")
+def stop_namespace_sweeper() -> None:
+    _stop_sweeper.set()
+
+# ─── WARM-UP & READINESS ──────────────────────────────────────────────────────
+# Fly's http_check polls /health; it answers 503 until MiniLM and the Pinecone
+# client are loaded, so no traffic is routed to a machine still cold-starting
+readiness = Readiness("embeddings", "pinecone")
+
+def _warm_embeddings() -> None:
+    from langgraphagenticai.tools.pdf_tool import get_embeddings
+    get_embeddings().embed_query("warm-up")  # first call also pays tokenizer / graph init
+
+def _warm_pinecone() -> None:
+    from langgraphagenticai.tools.pdf_tool import get_pinecone_index
+    get_pinecone_index().describe_index_stats()
+
+@app.on_event("startup")
+def start_warm_up() -> None:
+    readiness.warm_up({"embeddings": _warm_embeddings, "pinecone": _warm_pinecone})
+
+@app.on_event("shutdown")
+def stop_warm_up() -> None:
+    readiness.stop()
+
 # ─── HEALTH CHECK ─────────────────────────────────────────────────────────────
-@app.get("/health", summary="Health check")
-async def health() -> Dict[str, str]:
-    return {"status": "ok"}
+@app.get("/health", summary="Readiness: 200 once models and indexes are loaded, else 503")
+async def health():
+    # error details stay behind auth, on /diagnostics
+    report = readiness.report()
+    return JSONResponse(
+        status_code=200 if report["ready"] else HTTP_503_SERVICE_UNAVAILABLE,
+        content={"status": "ok" if report["ready"] else "starting", "checks": report["checks"]},
+    )
+
+@app.get("/metrics", summary="Request coalescing counters")
+async def metrics() -> Dict[str, Any]:
+    return {"process_single_flight": process_flight.stats()}
 
 # ─── CUSTOM ERROR HANDLERS ────────────────────────────────────────────────────
 @app.exception_handler(RequestValidationError)
@@ -73,6 +177,49 @@ async def general_exception_handler(request: Request, exc: Exception):
         content={"detail": "Internal server error"},
     )
 
+# ─── UPLOAD HANDLING ──────────────────────────────────────────────────────────
+async def read_pdf_upload(file: UploadFile) -> Tuple[bytes, str]:
+    """
+    Stream the upload in chunks (413 past MAX_PDF_BYTES) and hand back the
+    bytes and their SHA-256; PyMuPDF parses them in memory, so nothing is
+    written to /tmp.
+    """
+    try:
+        with await spool_upload(file, MAX_PDF_BYTES) as upload:
+            return upload.getvalue(), upload.sha256
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    except Exception:
+        logger.exception("Failed to read uploaded PDF")
+        raise HTTPException(status_code=500, detail="Could not read uploaded PDF")
+
+# ─── TENANCY ──────────────────────────────────────────────────────────────────
+def resolve_tenant(header_tenant: Optional[str], form_tenant: Optional[str]) -> str:
+    """Tenant from the X-Tenant-ID header, else the `tenant` form field, else DEFAULT_TENANT."""
+    try:
+        return normalize_tenant(header_tenant or form_tenant)
+    except InvalidTenant as e:
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+
+def authenticated_tenant(authorization: Optional[str], header_tenant: Optional[str],
+                         form_tenant: Optional[str]) -> str:
+    """
+    Tenant for the endpoints that read or write a tenant's shared namespace.
+    A token from TENANT_TOKENS pins its own tenant; API_AUTH_TOKEN is the
+    operator credential and may act for whichever tenant is named.
+    """
+    tenant = tenant_for_token(authorization, TENANT_TOKENS)
+    if tenant is not None:
+        if (header_tenant or form_tenant) and resolve_tenant(header_tenant, form_tenant) != tenant:
+            raise HTTPException(status_code=HTTP_403_FORBIDDEN, detail="Token is not valid for this tenant")
+        return tenant
+    if API_AUTH_TOKEN and check_bearer(authorization, API_AUTH_TOKEN):
+        return resolve_tenant(header_tenant, form_tenant)
+    if not API_AUTH_TOKEN and not TENANT_TOKENS:
+        raise HTTPException(status_code=HTTP_403_FORBIDDEN,
+                            detail="Tenant endpoints are disabled: set API_AUTH_TOKEN or TENANT_TOKENS")
+    raise HTTPException(status_code=HTTP_401_UNAUTHORIZED, detail="Invalid or missing authorization token")
+
 # ─── PDF INGEST & QUERY ENDPOINT ───────────────────────────────────────────────
 @app.post(
     "/process",
@@ -82,51 +229,209 @@ async def general_exception_handler(request: Request, exc: Exception):
 async def process_pdf(
     query: str = Form(..., description="Your question about the PDF"),
     file: UploadFile = File(..., description="The PDF file to ingest"),
+    tenant: Optional[str] = Form(None, description="Tenant id (or send X-Tenant-ID)"),
+    x_tenant_id: Optional[str] = Header(None),
 ):
-    # 1) Save the upload to a temp file
-    tmp_dir = "/tmp"
-    file_id = uuid.uuid4().hex
-    tmp_path = os.path.join(tmp_dir, f"{file_id}_{file.filename}")
-    try:
-        contents = await file.read()
-        with open(tmp_path, "wb") as f:
-            f.write(contents)
-    except Exception:
-        logger.exception("Failed to save uploaded PDF")
-        raise HTTPException(status_code=500, detail="Could not save uploaded PDF")
+    tenant = resolve_tenant(x_tenant_id, tenant)
+
+    # 1) Stream the upload into memory (bounded by MAX_PDF_BYTES)
+    contents, sha256 = await read_pdf_upload(file)
 
     # 2) Lazy-import the RAG helpers
     try:
-        from langgraphagenticai.tools.pdf_tool import ingest_pdf, query_pdf
+        from langgraphagenticai.tools.pdf_tool import _doc_key, ingest_pdf, query_pdf
     except Exception:
         logger.exception("Failed to import PDF tool")
-        cleanup(tmp_path)
         raise HTTPException(status_code=500, detail="Internal import error")
 
-    # 3) Ingest into Pinecone
+    namespace = document_namespace(tenant, _doc_key(contents))
+
+    def run_pipeline() -> str:
+        # 3) Ingest into this tenant's namespace for this document
+        try:
+            ingest_result = ingest_pdf(contents, namespace=namespace, source_name=file.filename)
+            logger.info("Ingested %d chunks", ingest_result.get("ingested_chunks", 0))
+        except Exception:
+            logger.exception("Ingest error")
+            raise HTTPException(status_code=500, detail="Error ingesting PDF")
+
+        # 4) Run the RAG query
+        try:
+            answer = query_pdf(query, namespace)
+            logger.info("Query succeeded")
+        except Exception:
+            logger.exception("Query error")
+            raise HTTPException(status_code=500, detail="Error running query")
+        return answer
+
+    # Concurrent duplicates wait on the first request's run instead of repeating it
+    answer = await process_flight.do(
+        ("process", sha256, query.strip(), tenant),
+        lambda: run_in_threadpool(run_pipeline),
+    )
+    return {"output": answer, "namespace": namespace}
+
+# ─── STREAMING VARIANT (SSE) ──────────────────────────────────────────────────
+@app.post(
+    "/process/stream",
+    summary="Ingest PDF & stream the RAG answer as Server-Sent Events",
+    response_class=StreamingResponse,
+)
+async def process_pdf_stream(
+    query: str = Form(..., description="Your question about the PDF"),
+    file: UploadFile = File(..., description="The PDF file to ingest"),
+    tenant: Optional[str] = Form(None, description="Tenant id (or send X-Tenant-ID)"),
+    x_tenant_id: Optional[str] = Header(None),
+):
+    tenant = resolve_tenant(x_tenant_id, tenant)
+    contents, _ = await read_pdf_upload(file)
+
     try:
-        ingest_result = ingest_pdf(tmp_path)
+        from langgraphagenticai.graph.chatbot_graph import get_pdf_graph, stream_final_output
+        from langgraphagenticai.tools.pdf_tool import _doc_key, ingest_pdf
+        from langgraphagenticai.utils.stream_utils import to_sse
+    except Exception:
+        logger.exception("Failed to import PDF tool")
+        raise HTTPException(status_code=500, detail="Internal import error")
+
+    namespace = document_namespace(tenant, _doc_key(contents))
+
+    def tokens():
+        # Runs in Starlette's threadpool; ingest must finish before retrieval
+        ingest_result = ingest_pdf(contents, namespace=namespace, source_name=file.filename)
         logger.info("Ingested %d chunks", ingest_result.get("ingested_chunks", 0))
+        state = {"input": query, "lang": "en", "namespace": namespace}
+        yield from stream_final_output(get_pdf_graph(), state)
+
+    return StreamingResponse(
+        to_sse(tokens(), error_message="Error running query"),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# ─── BACKGROUND INGEST JOBS ───────────────────────────────────────────────────
+@app.post(
+    "/ingest",
+    summary="Queue a PDF for ingestion; returns a job id to poll",
+    status_code=HTTP_202_ACCEPTED,
+    response_model=Dict[str, Any],
+)
+async def ingest_job(
+    file: UploadFile = File(..., description="The PDF file to ingest"),
+    tenant: Optional[str] = Form(None, description="Tenant id (or send X-Tenant-ID)"),
+    x_tenant_id: Optional[str] = Header(None),
+    authorization: Optional[str] = Header(None),
+):
+    # background ingests build up the tenant's shared namespace, queried via /query
+    namespace = tenant_namespace(authenticated_tenant(authorization, x_tenant_id, tenant))
+    try:
+        with await spool_upload(file, MAX_PDF_BYTES) as upload:
+            job = await run_in_threadpool(
+                get_ingest_queue().submit, upload.rewind(), upload.filename, namespace, upload.size
+            )
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
     except Exception:
-        logger.exception("Ingest error")
-        cleanup(tmp_path)
-        raise HTTPException(status_code=500, detail="Error ingesting PDF")
+        logger.exception("Failed to queue ingest job")
+        raise HTTPException(status_code=500, detail="Could not queue PDF for ingestion")
 
-    # 4) Run the RAG query
+    logger.info("Queued ingest job %s (%d bytes)", job["id"], job["size"])
+    return {"job_id": job["id"], "status": job["status"], "namespace": namespace,
+            "status_url": f"/ingest/{job['id']}"}
+
+@app.get(
+    "/ingest/{job_id}",
+    summary="Ingest job status and progress",
+    response_model=Dict[str, Any],
+)
+async def ingest_job_status(job_id: str, x_tenant_id: Optional[str] = Header(None),
+                            authorization: Optional[str] = Header(None)):
+    namespace = tenant_namespace(authenticated_tenant(authorization, x_tenant_id, None))
+    job = get_ingest_queue().store.get(job_id)
+    if job is None or job["namespace"] != namespace:
+        # a plain 404 here, not the docs redirect: pollers need to see it
+        return JSONResponse(status_code=404, content={"detail": "Unknown job id"})
+    return job_status(job)
+
+# ─── TENANT QUERIES & USAGE ───────────────────────────────────────────────────
+@app.post(
+    "/query",
+    summary="RAG query over everything a tenant ingested via /ingest",
+    response_model=Dict[str, Any],
+)
+async def query_tenant(
+    query: str = Form(..., description="Your question"),
+    tenant: Optional[str] = Form(None, description="Tenant id (or send X-Tenant-ID)"),
+    x_tenant_id: Optional[str] = Header(None),
+    authorization: Optional[str] = Header(None),
+):
+    namespace = tenant_namespace(authenticated_tenant(authorization, x_tenant_id, tenant))
     try:
-        answer = query_pdf(query)
-        logger.info("Query succeeded")
+        from langgraphagenticai.tools.pdf_tool import query_pdf
+        answer = await run_in_threadpool(query_pdf, query, namespace)
     except Exception:
         logger.exception("Query error")
-        cleanup(tmp_path)
         raise HTTPException(status_code=500, detail="Error running query")
+    return {"output": answer, "namespace": namespace}
 
-    # 5) Clean up and respond
-    cleanup(tmp_path)
-    return {"output": answer}
+@app.get(
+    "/namespaces",
+    summary="A tenant's namespaces with document / vector counts and last use",
+    response_model=List[Dict[str, Any]],
+)
+async def tenant_namespaces(tenant: Optional[str] = None, x_tenant_id: Optional[str] = Header(None),
+                            authorization: Optional[str] = Header(None)):
+    return get_namespace_registry().usage(authenticated_tenant(authorization, x_tenant_id, tenant))
 
-def cleanup(path: str):
-    try:
-        os.remove(path)
-    except Exception:
-        logger.warning("Could not delete temp file %s", path)
+# ─── DIAGNOSTICS (bearer token; off unless API_AUTH_TOKEN is set) ─────────────
+def require_diagnostics_token(authorization: Optional[str] = Header(None)) -> None:
+    if not API_AUTH_TOKEN:
+        raise HTTPException(status_code=HTTP_403_FORBIDDEN,
+                            detail="Diagnostics are disabled: API_AUTH_TOKEN is not set")
+    if not check_bearer(authorization, API_AUTH_TOKEN):
+        raise HTTPException(status_code=HTTP_401_UNAUTHORIZED, detail="Invalid or missing authorization token")
+
+diagnostics = APIRouter(prefix="/diagnostics", tags=["diagnostics"],
+                        dependencies=[Depends(require_diagnostics_token)])
+
+def _if_loaded(module: str, stats: str) -> Optional[Dict[str, Any]]:
+    # report optional subsystems only once something imported them; never load them here
+    mod = sys.modules.get(module)
+    return getattr(mod, stats)() if mod is not None else None
+
+@diagnostics.get("", summary="Memory, loaded models, cache hit rates and executor queue depths")
+async def diagnostics_summary() -> Dict[str, Any]:
+    from langgraphagenticai.tools.pdf_tool import loaded_models
+    return {
+        "readiness": readiness.report(),
+        "memory": process_memory(),
+        "models": loaded_models(),
+        "caches": {
+            "process_single_flight": process_flight.stats(),
+            "translator": _if_loaded("langgraphagenticai.tools.translate_tool", "translator_stats"),
+            "search": _if_loaded("langgraphagenticai.tools.search_service", "search_service_stats"),
+        },
+        "executors": {
+            "threadpool": threadpool_stats(),
+            "ingest": get_ingest_queue().stats(),
+            "pdf_extraction": extraction_pool_stats(),
+        },
+    }
+
+@diagnostics.get("/profile", summary="Sampling CPU profile of all threads over N seconds")
+async def diagnostics_profile(
+    seconds: float = Query(5.0, gt=0, le=DIAG_MAX_PROFILE_S),
+    interval: float = Query(0.01, ge=0.001, le=1.0),
+    top: int = Query(25, ge=1, le=200),
+) -> Dict[str, Any]:
+    # the sampler blocks, so it runs in a worker thread while requests keep flowing
+    return await run_in_threadpool(sample_cpu_profile, seconds, interval, top)
+
+@diagnostics.get("/tracemalloc", summary="Top allocation sites (first call starts tracing)")
+async def diagnostics_tracemalloc(
+    limit: int = Query(20, ge=1, le=200),
+    stop: bool = Query(False, description="Take a last snapshot and stop tracing"),
+) -> Dict[str, Any]:
+    return await run_in_threadpool(tracemalloc_top, limit, stop)
+
+app.include_router(diagnostics)
@@ -0,0 +1,245 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ── Configuration ────────────────────────────────────
+
+AGNO_KB_DIR     = os.getenv("AGNO_KB_DIR", "tmp/agno_kb")        # downloaded PDFs + manifest
+LANCEDB_URI     = os.getenv("LANCEDB_URI", "tmp/lancedb")
+LANCEDB_TABLE   = os.getenv("LANCEDB_TABLE", "multi_agent_knowledge")
+KB_EMBEDDER     = os.getenv("AGNO_KB_EMBEDDER", "text-embedding-3-small")
+DEFAULT_KB_URLS = [u.strip() for u in os.getenv("AGNO_KB_URLS", "https://arxiv.org/pdf/2405.04231").split(",")
+                   if u.strip()]
+FETCH_TIMEOUT_S = float(os.getenv("AGNO_KB_FETCH_TIMEOUT", "30"))
+FRESH_S         = float(os.getenv("AGNO_KB_FRESH_MINUTES", "60")) * 60  # no revalidation inside this window
+SEARCH_OVERFETCH = 4  # shared table: fetch extra hits so filtering by URL still fills the limit
+
+# fetcher(url, request_headers) -> (status, response_headers, body)
+Fetcher = Callable[[str, Mapping[str, str]], Tuple[int, Mapping[str, str], bytes]]
+
+def http_fetch(url: str, headers: Mapping[str, str]) -> Tuple[int, Mapping[str, str], bytes]:
+    import httpx
+    r = httpx.get(url, headers=dict(headers), timeout=FETCH_TIMEOUT_S, follow_redirects=True)
+    if r.status_code not in (200, 304):
+        r.raise_for_status()
+    return r.status_code, r.headers, r.content
+
+# ── PDF download cache ───────────────────────────────
+
+class PdfCache:
+    """
+    Downloaded PDFs on disk, keyed by URL. Re-fetches are conditional
+    (If-None-Match / If-Modified-Since), so an unchanged PDF costs one 304.
+    The manifest records ETag, Last-Modified and the content hash of each
+    URL, plus the hash last loaded into the vector store. Copies checked
+    within the last `fresh_s` seconds are used without a request at all.
+    """
+
+    def __init__(self, cache_dir: str = AGNO_KB_DIR, fetcher: Fetcher = http_fetch,
+                 fresh_s: float = FRESH_S, clock: Callable[[], float] = time.time):
+        self.cache_dir = cache_dir
+        self.fetcher = fetcher
+        self.fresh_s = fresh_s
+        self._clock = clock
+        self._manifest_path = os.path.join(cache_dir, "manifest.json")
+        os.makedirs(cache_dir, exist_ok=True)
+        self.manifest: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(self._manifest_path):
+            with open(self._manifest_path) as f:
+                self.manifest = json.load(f)
+
+    def save(self) -> None:
+        tmp = self._manifest_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp, self._manifest_path)
+
+    def fetch(self, url: str) -> Dict[str, Any]:
+        """Return the manifest entry for `url`, downloading only if the server has a new version."""
+        entry = self.manifest.get(url)
+        headers = {}
+        if entry and os.path.exists(entry["path"]):
+            if self._clock() - entry.get("fetched_at", 0) < self.fresh_s:
+                return entry
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        else:
+            entry = None
+
+        try:
+            status, resp_headers, body = self.fetcher(url, headers)
+        except Exception:
+            if not entry:
+                raise
+            logger.warning("Could not revalidate %s; using cached copy", url, exc_info=True)
+            return entry
+        if status == 304 and entry:
+            entry["fetched_at"] = self._clock()
+            self.save()
+            return entry
+
+        sha = hashlib.sha256(body).hexdigest()
+        path = os.path.join(self.cache_dir, hashlib.sha1(url.encode()).hexdigest()[:16] + ".pdf")
+        if not entry or entry["sha256"] != sha:
+            with open(path + ".part", "wb") as f:
+                f.write(body)
+            os.replace(path + ".part", path)
+        entry = {
+            **(entry or {}),
+            "path": path,
+            "sha256": sha,
+            "etag": resp_headers.get("etag") or resp_headers.get("ETag"),
+            "last_modified": resp_headers.get("last-modified") or resp_headers.get("Last-Modified"),
+            "fetched_at": self._clock(),
+        }
+        self.manifest[url] = entry
+        self.save()
+        return entry
+
+    def mark_loaded(self, url: str) -> None:
+        self.manifest[url]["loaded_sha256"] = self.manifest[url]["sha256"]
+        self.save()
+
+    def clear_loaded(self) -> None:
+        for entry in self.manifest.values():
+            entry.pop("loaded_sha256", None)
+        self.save()
+
+# ── Per-request scoping ──────────────────────────────
+
+def filter_by_url(docs: Sequence[Any], urls: Sequence[str], limit: int) -> List[Any]:
+    """The first `limit` hits whose `url` metadata is one of `urls`."""
+    allowed = set(urls)
+    return [d for d in docs if (getattr(d, "meta_data", None) or {}).get("url") in allowed][:limit]
+
+_scoped_cls = None
+
+def _scoped_knowledge_cls():
+    """AgentKnowledge whose searches only return chunks from its own URLs."""
+    global _scoped_cls
+    if _scoped_cls is None:
+        from agno.knowledge.agent import AgentKnowledge
+
+        class ScopedKnowledge(AgentKnowledge):
+            urls: List[str] = []
+
+            def search(self, query: str, num_documents: Optional[int] = None, **kwargs):
+                limit = num_documents or self.num_documents
+                hits = super().search(query, num_documents=limit * SEARCH_OVERFETCH, **kwargs)
+                return filter_by_url(hits, self.urls, limit)
+
+            async def async_search(self, query: str, num_documents: Optional[int] = None, **kwargs):
+                limit = num_documents or self.num_documents
+                hits = await super().async_search(query, num_documents=limit * SEARCH_OVERFETCH, **kwargs)
+                return filter_by_url(hits, self.urls, limit)
+
+        _scoped_cls = ScopedKnowledge
+    return _scoped_cls
+
+# ── Knowledge base manager ───────────────────────────
+
+class KnowledgeManager:
+    """
+    One LanceDB table and AgentKnowledge shared by every agent. `sync(urls)`
+    brings the table up to date: new URLs are appended, and if a known URL's
+    content changed the table is rebuilt from the cached PDFs (LanceDB rows
+    can't be cheaply deleted per source). Unchanged URLs cost a 304 at most,
+    and nothing inside the cache's freshness window. The table is shared,
+    but `knowledge_for(urls)` only ever retrieves chunks from `urls`.
+    """
+
+    def __init__(self, cache: Optional[PdfCache] = None, uri: str = LANCEDB_URI,
+                 table_name: str = LANCEDB_TABLE):
+        self.cache = cache or PdfCache()
+        self.uri = uri
+        self.table_name = table_name
+        self._knowledge = None
+        self._lock = threading.Lock()
+
+    # -- agno plumbing (imported lazily) --
+
+    def knowledge(self):
+        if self._knowledge is None:
+            from agno.embedder.openai import OpenAIEmbedder
+            from agno.knowledge.agent import AgentKnowledge
+            from agno.vectordb.lancedb import LanceDb, SearchType
+
+            vector_db = LanceDb(
+                uri=self.uri,
+                table_name=self.table_name,
+                search_type=SearchType.hybrid,
+                embedder=OpenAIEmbedder(id=KB_EMBEDDER),
+            )
+            self._knowledge = AgentKnowledge(vector_db=vector_db)
+        return self._knowledge
+
+    def _table_exists(self) -> bool:
+        return self.knowledge().vector_db.exists()
+
+    def _insert(self, url: str, path: str) -> None:
+        from agno.document.reader.pdf_reader import PDFReader
+
+        docs = PDFReader(chunk=True).read(path)
+        for doc in docs:
+            doc.meta_data = {**(doc.meta_data or {}), "url": url}
+        self.knowledge().load_documents(docs, upsert=True, skip_existing=True)
+
+    def _recreate(self) -> None:
+        vector_db = self.knowledge().vector_db
+        vector_db.delete()
+        vector_db.create()
+
+    # -- sync --
+
+    def sync(self, urls: Sequence[str]) -> Dict[str, List[str]]:
+        with self._lock:
+            if not self._table_exists():
+                self.cache.clear_loaded()
+            entries = {url: self.cache.fetch(url) for url in urls}
+            new = [u for u, e in entries.items() if "loaded_sha256" not in e]
+            changed = [u for u, e in entries.items()
+                       if "loaded_sha256" in e and e["loaded_sha256"] != e["sha256"]]
+
+            to_load = new
+            if changed:
+                logger.info("Knowledge base content changed for %s; rebuilding", changed)
+                self._recreate()
+                self.cache.clear_loaded()
+                # everything previously loaded (not just this request's URLs) goes back in
+                to_load = [u for u, e in self.cache.manifest.items()
+                           if u not in entries and os.path.exists(e["path"])] + list(entries)
+            for url in to_load:
+                self._insert(url, self.cache.manifest[url]["path"])
+                self.cache.mark_loaded(url)
+
+            unchanged = [u for u in urls if u not in to_load]
+            return {"loaded": to_load, "changed": changed, "unchanged": unchanged}
+
+    def scoped(self, urls: Sequence[str]):
+        """A view of the shared table that only retrieves chunks from `urls`."""
+        return _scoped_knowledge_cls()(vector_db=self.knowledge().vector_db, urls=list(urls))
+
+    def knowledge_for(self, urls: Optional[Sequence[str]] = None):
+        urls = list(urls or DEFAULT_KB_URLS)
+        result = self.sync(urls)
+        if result["loaded"]:
+            logger.info("Knowledge base loaded %d PDF(s)", len(result["loaded"]))
+        return self.scoped(urls)
+
+_manager: Optional[KnowledgeManager] = None
+_manager_lock = threading.Lock()
+
+def get_knowledge_manager() -> KnowledgeManager:
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = KnowledgeManager()
+        return _manager
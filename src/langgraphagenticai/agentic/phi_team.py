@@ -1,22 +1,97 @@
 import os
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+import httpx
 from dotenv import load_dotenv
 from phi.agent import Agent
 from phi.model.groq import Groq
 from phi.tools.duckduckgo import DuckDuckGo
-from phi.tools.yfinance import YFinanceTools
+
+from langgraphagenticai.agentic.tools.finance_tools import cached_yfinance_tools
+from langgraphagenticai.utils.cache_utils import ObjectPool
 
 # Load .env
 load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# ── Configuration ────────────────────────────────────
+
+GROQ_MODEL_ID       = "llama3-70b-8192"
+PHI_POOL_SIZE       = int(os.getenv("PHI_POOL_SIZE", "4"))       # teams kept ready
+PHI_PARALLEL_CALLS  = int(os.getenv("PHI_PARALLEL_CALLS", "4"))  # concurrent sub-agent runs
+GROQ_TIMEOUT_S      = float(os.getenv("GROQ_TIMEOUT", "60"))
+
+# ── Shared clients & executor ────────────────────────
+
+_http_client: Optional[httpx.Client] = None
+_executor: Optional[ThreadPoolExecutor] = None
+_shared_lock = threading.Lock()
+
+def get_groq_http_client() -> httpx.Client:
+    """One keep-alive connection pool for every Groq model in the process."""
+    global _http_client
+    with _shared_lock:
+        if _http_client is None:
+            _http_client = httpx.Client(
+                timeout=GROQ_TIMEOUT_S,
+                limits=httpx.Limits(max_connections=PHI_POOL_SIZE * 3 + PHI_PARALLEL_CALLS,
+                                    max_keepalive_connections=PHI_POOL_SIZE * 3),
+            )
+        return _http_client
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _shared_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=PHI_PARALLEL_CALLS, thread_name_prefix="phi-agent")
+        return _executor
+
+def _groq() -> Groq:
+    return Groq(id=GROQ_MODEL_ID, http_client=get_groq_http_client())
+
+# ── Concurrent dispatch ──────────────────────────────
+
+def make_parallel_dispatch(members: List[Agent]) -> Callable[[Dict[str, str]], str]:
+    by_name = {a.name: a for a in members}
+
+    def ask_agents_in_parallel(tasks: Dict[str, str]) -> str:
+        """Use this to send independent tasks to several team members at the same time.
+
+        Args:
+            tasks: Maps a team member's name (e.g. "Web Search Agent", "Finance Agent") to the task for that member.
+
+        Returns:
+            str: Each member's answer under its name.
+        """
+        futures = {
+            name: _get_executor().submit(by_name[name].run, task, stream=False)
+            for name, task in tasks.items() if name in by_name
+        }
+        parts = []
+        for name in tasks:
+            if name not in futures:
+                parts.append(f"## {name}\nUnknown team member; choose from {sorted(by_name)}")
+                continue
+            try:
+                parts.append(f"## {name}\n{futures[name].result().content}")
+            except Exception as e:
+                logger.exception("Team member %s failed", name)
+                parts.append(f"## {name}\nError: {e}")
+        return "\n\n".join(parts)
+
+    return ask_agents_in_parallel
+
+# ── Team construction & pooling ──────────────────────
+
 def load_phi_team():
     try:
         web_agent = Agent(
             name="Web Search Agent",
             role="Searches the web using DuckDuckGo",
-            model=Groq(id="llama3-70b-8192"),
+            model=_groq(),
             tools=[DuckDuckGo()],
             show_tool_calls=True,
             markdown=True
@@ -25,8 +100,8 @@ def load_phi_team():
         finance_agent = Agent(
             name="Finance Agent",
             role="Fetches market data and stock insights",
-            model=Groq(id="llama3-70b-8192"),
-            tools=[YFinanceTools(
+            model=_groq(),
+            tools=[cached_yfinance_tools(
                 stock_price=True,
                 analyst_recommendations=True,
                 stock_fundamentals=True,
@@ -38,7 +113,12 @@ def load_phi_team():
 
         team = Agent(
             team=[web_agent, finance_agent],
-            instructions=["Always include sources", "Use tables"],
+            tools=[make_parallel_dispatch([web_agent, finance_agent])],
+            instructions=[
+                "Always include sources",
+                "Use tables",
+                "When a question needs both web and finance data, use ask_agents_in_parallel",
+            ],
             show_tool_calls=True,
             markdown=True
         )
@@ -46,3 +126,21 @@ def load_phi_team():
     except Exception as e:
         logger.exception("Failed to initialize Phi team")
         raise e
+
+def _new_session(team: Agent) -> None:
+    # pooled teams are reused across users: drop conversation state between checkouts
+    for agent in [team, *(team.team or [])]:
+        agent.new_session()
+
+_pool: Optional[ObjectPool] = None
+
+def get_phi_team_pool() -> ObjectPool:
+    """
+    Process-wide pool of configured teams, used as
+    `with get_phi_team_pool().checkout() as team: team.run(...)`.
+    """
+    global _pool
+    with _shared_lock:
+        if _pool is None:
+            _pool = ObjectPool(load_phi_team, size=PHI_POOL_SIZE, reset=_new_session)
+        return _pool
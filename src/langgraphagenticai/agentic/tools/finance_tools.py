@@ -0,0 +1,67 @@
+import os
+import inspect
+import functools
+import logging
+from typing import Any, Callable, Mapping
+
+from langgraphagenticai.utils.cache_utils import LRUCache, SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# ── Configuration ────────────────────────────────────
+
+YFINANCE_CACHE_TTL  = float(os.getenv("YFINANCE_CACHE_TTL", "30"))   # seconds
+YFINANCE_CACHE_SIZE = int(os.getenv("YFINANCE_CACHE_SIZE", "512"))
+
+_cache = LRUCache(maxsize=YFINANCE_CACHE_SIZE, ttl=YFINANCE_CACHE_TTL)
+_flight = SingleFlight()
+
+# ── Cached toolkit ───────────────────────────────────
+
+_MISS = object()
+
+def _cached(name: str, fn: Callable[..., Any], cache: LRUCache, flight: SingleFlight) -> Callable[..., Any]:
+    signature = inspect.signature(fn)
+
+    @functools.wraps(fn)  # keeps the signature phi builds the tool schema from
+    def wrapper(*args, **kwargs):
+        # key on the bound arguments, so positional/keyword calls and "aapl "/"AAPL" share an entry
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        if isinstance(bound.arguments.get("symbol"), str):
+            bound.arguments["symbol"] = bound.arguments["symbol"].strip().upper()
+        args, kwargs = bound.args, bound.kwargs
+        key = (name, tuple(bound.arguments.items()))
+        hit = cache.get(key, _MISS)
+        if hit is not _MISS:
+            return hit
+
+        def call():
+            result = fn(*args, **kwargs)
+            # YFinanceTools reports failures as "Error ..." strings; don't pin those
+            if not (isinstance(result, str) and result.startswith("Error")):
+                cache.set(key, result)
+            return result
+
+        return flight.do(key, call)
+    return wrapper
+
+def cache_toolkit_functions(functions: Mapping[str, Any], cache: LRUCache = _cache,
+                            flight: SingleFlight = _flight) -> None:
+    """
+    Wrap each phi `Function.entrypoint` in a TTL cache, collapsing concurrent
+    identical lookups (the same ticker asked for by several agents at once).
+    """
+    for name, function in functions.items():
+        function.entrypoint = _cached(name, function.entrypoint, cache, flight)
+
+def cached_yfinance_tools(**kwargs):
+    """YFinanceTools(**kwargs) whose lookups are cached for YFINANCE_CACHE_TTL seconds."""
+    from phi.tools.yfinance import YFinanceTools
+
+    tools = YFinanceTools(**kwargs)
+    cache_toolkit_functions(tools.functions)
+    return tools
+
+def yfinance_cache_stats():
+    return {**_cache.stats(), **_flight.stats()}
@@ -1,21 +1,34 @@
-from langgraphagenticai.graph.chatbot_graph import create_graph
+from langgraphagenticai.graph.chatbot_graph import get_image_graph, get_pdf_graph, stream_final_output
 
 class MultiRAGTool:
     name = "MultiRAGLangGraph"
     description = "RAG chain that queries PDF, image, and web in a pipeline."
 
-    def __init__(self):
-        self.graph = create_graph()
+    def _graph(self, image_path):
+        # Questions about an image go through the image graph, everything else through the PDF one
+        return get_image_graph() if image_path else get_pdf_graph()
 
-    def run(self, query, lang="en", pdf_path=None, image_path=None):
-        state = {
+    def _state(self, query, lang, pdf_path, image_path, namespace=None):
+        return {
             "input": query,
             "lang": lang,
             "pdf_path": pdf_path,
-            "image_path": image_path
+            "image_path": image_path,
+            "namespace": namespace
         }
+
+    def run(self, query, lang="en", pdf_path=None, image_path=None, namespace=None):
+        state = self._state(query, lang, pdf_path, image_path, namespace)
         try:
-            result = self.graph.invoke(state)
+            result = self._graph(image_path).invoke(state)
             return result.get("final_output", "✅ Done but no output.")
         except Exception as e:
             return f"❌ LangGraph tool failed: {e}"
+
+    def stream(self, query, lang="en", pdf_path=None, image_path=None, namespace=None):
+        """Yield the answer incrementally instead of returning it at the end."""
+        state = self._state(query, lang, pdf_path, image_path, namespace)
+        try:
+            yield from stream_final_output(self._graph(image_path), state)
+        except Exception as e:
+            yield f"❌ LangGraph tool failed: {e}"
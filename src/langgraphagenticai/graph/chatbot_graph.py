@@ -1,8 +1,10 @@
 # src/langgraphagenticai/graph/chatbot_graph.py
 
 import logging
+from typing import Any, Dict, Iterator
 from langgraph.graph import StateGraph
 from langgraphagenticai.state.state import GraphState
+from langgraphagenticai.utils.stream_utils import iter_tokens
 from langgraphagenticai.nodes.node_runners import (
     run_query_pdf,     # calls your PDF-RAG tool
     run_query_image,   # calls your Image tool
@@ -74,3 +76,32 @@ def create_image_graph() -> StateGraph:
     g.set_finish_point("translate")
 
     return g.compile()
+
+
+_pdf_graph = None
+_image_graph = None
+
+def get_pdf_graph():
+    """Process-wide compiled PDF graph (compiled on first use)."""
+    global _pdf_graph
+    if _pdf_graph is None:
+        _pdf_graph = create_pdf_graph()
+    return _pdf_graph
+
+def get_image_graph():
+    """Process-wide compiled image graph (compiled on first use)."""
+    global _image_graph
+    if _image_graph is None:
+        _image_graph = create_image_graph()
+    return _image_graph
+
+
+def stream_final_output(graph, state: Dict[str, Any]) -> Iterator[str]:
+    """
+    Run a compiled graph and yield pieces of `final_output` as soon as the
+    node producing it emits them (LLM tokens, translated chunks, or the
+    whole fallback answer), instead of waiting for `invoke` to return.
+    """
+    return iter_tokens(
+        lambda on_token: graph.invoke(state, config={"configurable": {"on_token": on_token}})
+    )
@@ -1,20 +1,32 @@
 # src/langgraphagenticai/nodes/node_runners.py
 
-from langgraphagenticai.tools.pdf_tool import query_pdf
-from langgraphagenticai.tools.image_tool import query_image
+from langgraphagenticai.tools.pdf_tool import query_pdf, stream_query_pdf
+from langgraphagenticai.tools.image_tool import query_image, stream_query_image
 from langgraphagenticai.tools.search_tool import query_search
-from langgraphagenticai.tools.translate_tool import translate_text
-from typing import Dict, Any
+from langgraphagenticai.tools.translate_tool import translate_text, stream_translate_text
+from langgraphagenticai.utils.stream_utils import StreamInterrupted, get_token_sink, emit_all
+from typing import Dict, Any, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
-def run_query_pdf(state: Dict[str, Any]) -> Dict[str, Any]:
+def _streams_directly(state: Dict[str, Any], on_token) -> bool:
+    # Without translation the tool's own tokens are the final output
+    return on_token is not None and state.get("lang", "en") == "en"
+
+def run_query_pdf(state: Dict[str, Any], config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Enhanced PDF query runner with better error handling"""
     try:
-        if state.get("pdf_path"):
-            logger.info(f"Processing PDF at: {state['pdf_path']}")
-            response = query_pdf(state["input"], state["pdf_path"])
+        if state.get("pdf_path") or state.get("namespace"):
+            namespace = state.get("namespace") or "default"
+            logger.info(f"Querying PDF namespace: {namespace}")
+            on_token = get_token_sink(config)
+            if _streams_directly(state, on_token):
+                response = emit_all(stream_query_pdf(state["input"], namespace), on_token)
+                if response:
+                    return {**state, "pdf_result": response, "output_streamed": True}
+            else:
+                response = query_pdf(state["input"], namespace)
             
             # Validate response before returning
             if not response or isinstance(response, Exception):
@@ -22,22 +34,32 @@ def run_query_pdf(state: Dict[str, Any]) -> Dict[str, Any]:
                 
             return {**state, "pdf_result": response}
         return state
+    except StreamInterrupted:
+        raise  # a partial answer is already out: end the stream with an error, no fallback
     except Exception as e:
         logger.error(f"PDF query failed: {str(e)}")
         return {**state, "pdf_error": str(e)}
 
-def run_query_image(state: Dict[str, Any]) -> Dict[str, Any]:
+def run_query_image(state: Dict[str, Any], config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Enhanced image query runner"""
     try:
         if state.get("image_path"):
             logger.info(f"Processing image at: {state['image_path']}")
-            response = query_image(state["input"], state["image_path"])
+            on_token = get_token_sink(config)
+            if _streams_directly(state, on_token):
+                response = emit_all(stream_query_image(state["input"], state["image_path"]), on_token)
+                if response:
+                    return {**state, "image_result": response, "output_streamed": True}
+            else:
+                response = query_image(state["input"], state["image_path"])
             
             if not response or isinstance(response, Exception):
                 raise ValueError("Image processing returned invalid response")
                 
             return {**state, "image_result": response}
         return state
+    except StreamInterrupted:
+        raise  # a partial answer is already out: end the stream with an error, no fallback
     except Exception as e:
         logger.error(f"Image query failed: {str(e)}")
         return {**state, "image_error": str(e)}
@@ -56,8 +78,10 @@ def run_query_search(state: Dict[str, Any]) -> Dict[str, Any]:
         logger.error(f"Search failed: {str(e)}")
         return {**state, "search_error": str(e)}
 
-def run_translation(state: Dict[str, Any]) -> Dict[str, Any]:
+def run_translation(state: Dict[str, Any], config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Enhanced translation runner with fallback logic"""
+    on_token = get_token_sink(config)
+    base = None
     try:
         # Determine base content with fallback logic
         base = (
@@ -67,13 +91,26 @@ def run_translation(state: Dict[str, Any]) -> Dict[str, Any]:
             "No content available for translation"
         )
         
+        # Tokens already went out from the query node
+        if state.get("output_streamed"):
+            return {**state, "final_output": base}
+
         # Only translate if needed and content exists
         if state.get("lang") != "en" and base != "No content available for translation":
             logger.info(f"Translating to {state['lang']}")
-            translated = translate_text(base, state["lang"])
+            if on_token:
+                translated = emit_all(stream_translate_text(base, state["lang"]), on_token)
+            else:
+                translated = translate_text(base, state["lang"])
             return {**state, "final_output": translated}
-            
+
+        if on_token:
+            on_token(base)
         return {**state, "final_output": base}
+    except StreamInterrupted:
+        raise
     except Exception as e:
         logger.error(f"Translation failed: {str(e)}")
+        if on_token and base:
+            on_token(base)  # nothing was streamed yet: the untranslated answer is the output
         return {**state, "translation_error": str(e), "final_output": base}
\ No newline at end of file
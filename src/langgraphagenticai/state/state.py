@@ -14,6 +14,7 @@ class GraphState(TypedDict):
     input: str
     lang: Literal["en", "de", "hi", "fr"]
     pdf_path: NotRequired[Optional[str]]
+    namespace: NotRequired[Optional[str]]   # vector namespace to query (defaults to "default")
     image_path: NotRequired[Optional[str]]
     
     # Processing results
@@ -28,6 +29,9 @@ class GraphState(TypedDict):
     search_error: NotRequired[Optional[str]]
     translation_error: NotRequired[Optional[str]]
     
+    # Streaming: set once the final text has already been sent token by token
+    output_streamed: NotRequired[Optional[bool]]
+
     # System metadata (optional)
     processing_time: NotRequired[Optional[float]]
     current_node: NotRequired[Optional[str]]
\ No newline at end of file
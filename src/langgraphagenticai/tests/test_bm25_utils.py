@@ -0,0 +1,34 @@
+from langgraphagenticai.utils.bm25_utils import BM25Index, reciprocal_rank_fusion, tokenize
+
+
+def test_tokenize_keeps_identifiers():
+    assert tokenize("Error ERR-4821 on v2.3.1.") == ["error", "err-4821", "on", "v2.3.1"]
+
+
+def test_exact_term_ranks_first():
+    idx = BM25Index()
+    idx.add([
+        ("a", "printer shows ERR-4821 after paper jam"),
+        ("b", "printer shows ERR-1937 after toner change"),
+        ("c", "router firewall packet loss"),
+    ])
+    assert idx.search("what is err-4821", k=1)[0][0] == "a"
+    assert idx.search("firewall")[0][0] == "c"
+
+
+def test_log_persistence_and_incremental_updates(tmp_path):
+    path = str(tmp_path / "ns.jsonl")
+    idx = BM25Index(path)
+    idx.add([("a", "alpha beta"), ("b", "gamma delta")])
+    idx.add([("c", "epsilon")])
+    idx.remove(["b"])
+
+    reloaded = BM25Index(path)
+    assert set(reloaded.texts) == {"a", "c"}
+    assert reloaded.search("gamma") == []
+    assert reloaded.search("epsilon")[0][0] == "c"
+
+
+def test_reciprocal_rank_fusion():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "a"]], k=60)
+    assert [d for d, _ in fused] == ["a", "c", "b"]
@@ -0,0 +1,95 @@
+import time
+import queue
+import asyncio
+import threading
+
+import pytest
+
+from langgraphagenticai.utils.cache_utils import AsyncSingleFlight, ObjectPool
+
+
+def test_async_single_flight_collapses_concurrent_duplicates():
+    flight = AsyncSingleFlight()
+    runs = []
+
+    async def work(key):
+        runs.append(key)
+        await asyncio.sleep(0.01)
+        return f"answer for {key}"
+
+    async def main():
+        calls = [flight.do(k, lambda k=k: work(k)) for k in ["a"] * 5 + ["b"]]
+        results = await asyncio.gather(*calls)
+        again = await flight.do("a", lambda: work("a"))  # finished flights are not reused
+        return results, again
+
+    results, again = asyncio.run(main())
+    assert results == ["answer for a"] * 5 + ["answer for b"]
+    assert again == "answer for a"
+    assert runs == ["a", "b", "a"]
+    assert flight.stats() == {"calls": 7, "collapsed": 4, "in_flight": 0}
+
+
+def test_async_single_flight_shares_errors_and_survives_leader_cancel():
+    flight = AsyncSingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def slow():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def main():
+        errors = await asyncio.gather(flight.do("x", fail), flight.do("x", fail), return_exceptions=True)
+        leader = asyncio.ensure_future(flight.do("y", slow))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do("y", slow))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return errors, await follower
+
+    errors, followed = asyncio.run(main())
+    assert all(isinstance(e, ValueError) for e in errors)
+    assert followed == "done"
+
+
+def test_object_pool_reuses_and_resets():
+    built, resets = [], []
+    pool = ObjectPool(lambda: built.append(object()) or built[-1], size=2, reset=resets.append)
+
+    with pool.checkout() as a:
+        with pool.checkout() as b:
+            assert a is not b
+    with pool.checkout() as c:
+        assert c in (a, b)
+
+    assert len(built) == 2 and len(resets) == 3
+    assert pool.stats()["idle"] == 2
+
+
+def test_object_pool_wakes_waiters_when_a_reset_fails():
+    def reset(obj):
+        if obj == 0:
+            raise RuntimeError("session reset failed")
+
+    built = []
+    pool = ObjectPool(lambda: built.append(len(built)) or built[-1], size=1, reset=reset)
+    got, held = [], []
+
+    def wait_for_one():
+        held.append(pool.checkout(timeout=5))  # kept open, so the object stays checked out
+        got.append(held[-1].__enter__())
+
+    with pool.checkout() as first:
+        waiter = threading.Thread(target=wait_for_one)
+        waiter.start()
+        time.sleep(0.05)  # let it block on the full pool
+    waiter.join(timeout=5)
+
+    assert first == 0 and got == [1]  # the discarded object's slot went to the waiter
+    assert pool.stats()["created"] == 1 and pool.stats()["waits"] == 1
+    with pytest.raises(queue.Empty):
+        with pool.checkout(timeout=0.01):
+            pass
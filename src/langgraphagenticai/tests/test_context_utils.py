@@ -0,0 +1,67 @@
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from langgraphagenticai.utils.context_utils import (
+    Candidate,
+    assemble_context,
+    drop_near_duplicates,
+    iter_mmr,
+    mmr_order,
+)
+
+
+def words(n):
+    return " ".join(["tok"] * n)
+
+
+def test_drop_near_duplicates():
+    cands = [
+        Candidate("a", "same text", [1.0, 0.0]),
+        Candidate("b", "same   text", [0.0, 1.0]),
+        Candidate("c", "other", [0.99, 0.01]),
+        Candidate("d", "fresh", [0.0, 1.0]),
+    ]
+    assert [c.id for c in drop_near_duplicates(cands)] == ["a", "d"]
+
+
+def test_mmr_prefers_diverse_chunks():
+    q = [1.0, 0.2]
+    cands = [
+        Candidate("a", "x", [1.0, 0.0]),
+        Candidate("b", "y", [0.98, 0.05]),
+        Candidate("c", "z", [0.6, 0.8]),
+    ]
+    assert [c.id for c in mmr_order(q, cands, lambda_mult=0.5)][:2] == ["b", "c"]
+
+
+def test_assemble_context_respects_budget():
+    cands = [Candidate(str(i), words(30) + f" {i}", [1.0, float(i)]) for i in range(6)]
+    ctx = assemble_context([1.0, 0.0], cands, token_budget=100, max_chunks=10,
+                           counter=lambda t: len(t.split()))
+    assert ctx.context_tokens <= 100
+    assert len(ctx.chunks) == 3
+    assert ctx.candidate_tokens == 6 * 31
+    assert ctx.tokens_saved == 4 * 31 - ctx.context_tokens
+
+
+def test_mmr_stops_early_and_stays_fast():
+    rng = np.random.default_rng(0)
+    vecs = rng.normal(size=(20, 384)).tolist()
+    cands = [Candidate(str(i), f"chunk {i}", v) for i, v in enumerate(vecs)]
+    query = rng.normal(size=384).tolist()
+
+    full = mmr_order(query, cands)
+    assert [c.id for c in mmr_order(query, cands, limit=6)] == [c.id for c in full[:6]]
+    assert len({c.id for c in full}) == 20
+    assert next(iter_mmr(query, cands)).id == full[0].id
+
+    start = time.perf_counter()
+    for _ in range(20):
+        ctx = assemble_context(query, cands, token_budget=10_000, max_chunks=6,
+                               counter=lambda t: len(t.split()))
+    assert len(ctx.chunks) == 6
+    assert (time.perf_counter() - start) / 20 < 0.02
+
@@ -0,0 +1,56 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from langgraphagenticai.utils.diagnostics import Readiness, check_bearer, executor_depth, sample_cpu_profile
+
+
+def busy_loop(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_cpu_profile_finds_the_hot_function():
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_loop, args=(stop,), name="busy")
+    worker.start()
+    try:
+        profile = sample_cpu_profile(0.2, interval=0.005)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert profile["samples"] > 0 and profile["threads"]["busy"] > 0
+    assert any(row["function"].startswith("busy_loop") for row in profile["top_total"])
+
+
+def test_readiness_retries_failed_warm_up_steps():
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 2:
+            raise ConnectionError("index not reachable")
+
+    readiness = Readiness("model", "index")
+    assert readiness.report()["checks"] == {"model": False, "index": False}
+    readiness.warm_up({"model": lambda: None, "index": flaky}, retry_s=0.01).join(timeout=5)
+
+    report = readiness.report()
+    assert report["ready"] and report["errors"] == {}
+    assert len(attempts) == 2
+
+
+def test_executor_depth_and_bearer_check():
+    assert executor_depth(None) == {"started": False}
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        release = threading.Event()
+        pool.submit(release.wait)
+        pool.submit(time.sleep, 0)
+        depth = executor_depth(pool)
+        release.set()
+    assert (depth["max_workers"], depth["queued"]) == (1, 1)
+
+    assert check_bearer("Bearer s3cret", "s3cret")
+    assert not check_bearer("Bearer wrong", "s3cret")
+    assert not check_bearer(None, "s3cret") and not check_bearer("Bearer ", "")
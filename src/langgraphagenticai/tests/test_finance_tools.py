@@ -0,0 +1,40 @@
+import inspect
+from types import SimpleNamespace
+
+from langgraphagenticai.agentic.tools.finance_tools import cache_toolkit_functions
+from langgraphagenticai.utils.cache_utils import LRUCache, SingleFlight
+
+
+def test_toolkit_lookups_are_cached_per_ticker():
+    calls = []
+
+    def get_current_stock_price(symbol: str) -> str:
+        calls.append(symbol)
+        return "Error fetching" if symbol == "BAD" else f"{symbol}: 100"
+
+    functions = {"get_current_stock_price": SimpleNamespace(entrypoint=get_current_stock_price)}
+    cache_toolkit_functions(functions, LRUCache(ttl=30), SingleFlight())
+    price = functions["get_current_stock_price"].entrypoint
+
+    assert price("NVDA") == price("NVDA") == "NVDA: 100"
+    price("AAPL")
+    price("BAD")
+    price("BAD")  # errors are not cached
+    assert calls == ["NVDA", "AAPL", "BAD", "BAD"]
+    assert list(inspect.signature(price).parameters) == ["symbol"]
+
+
+def test_tickers_are_normalised_before_caching():
+    calls = []
+
+    def get_company_news(symbol: str, num_stories: int = 3) -> str:
+        calls.append(symbol)
+        return f"{symbol}: news"
+
+    functions = {"get_company_news": SimpleNamespace(entrypoint=get_company_news)}
+    cache_toolkit_functions(functions, LRUCache(ttl=30), SingleFlight())
+    news = functions["get_company_news"].entrypoint
+
+    assert news("aapl") == news(" AAPL ") == news(symbol="Aapl") == "AAPL: news"
+    assert calls == ["AAPL"]
+
@@ -0,0 +1,77 @@
+import io
+
+from langgraphagenticai.tools.ingest_jobs import DONE, FAILED, QUEUED, RUNNING, IngestQueue, JobStore
+
+
+def _queue(tmp_path, runner):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    return IngestQueue(store, str(tmp_path / "uploads"), workers=1, runner=runner)
+
+
+def test_smallest_jobs_run_first_and_report_progress(tmp_path):
+    order = []
+
+    def runner(job, progress):
+        order.append(job["filename"])
+        progress(pages_parsed=3, chunks_embedded=10, batches_upserted=1)
+        if job["filename"] == "bad.pdf":
+            raise ValueError("broken PDF")
+
+    q = _queue(tmp_path, runner)
+    big = q.submit(io.BytesIO(b"x" * 300), "big.pdf", "default", 300)
+    small = q.submit(io.BytesIO(b"x" * 10), "small.pdf", "default", 10)
+    bad = q.submit(io.BytesIO(b"x" * 100), "bad.pdf", "default", 100)
+    q.start()
+    q.join()
+    q.stop(timeout=5)
+
+    assert order == ["small.pdf", "bad.pdf", "big.pdf"]
+    done = q.store.get(big["id"])
+    assert done["status"] == DONE
+    assert (done["pages_parsed"], done["chunks_embedded"], done["batches_upserted"]) == (3, 10, 1)
+    assert q.store.get(small["id"])["status"] == DONE
+    failed = q.store.get(bad["id"])
+    assert failed["status"] == FAILED and failed["error"] == "broken PDF"
+    assert not list((tmp_path / "uploads").iterdir())  # uploads removed once finished
+
+
+def test_restart_resumes_or_fails_interrupted_jobs(tmp_path):
+    q = _queue(tmp_path, runner=lambda job, progress: None)
+    survivor = q.submit(io.BytesIO(b"pdf"), "a.pdf", "default", 3)
+    lost = q.submit(io.BytesIO(b"pdf"), "b.pdf", "default", 3)
+    q.store.update(survivor["id"], status=RUNNING, batches_upserted=2)
+    q.store.update(lost["id"], status=QUEUED)
+    (tmp_path / "uploads" / lost["path"].rsplit("/", 1)[-1]).unlink()
+    q.store.close()
+
+    seen = []
+    restarted = _queue(tmp_path, runner=lambda job, progress: seen.append(job["batches_upserted"]))
+    restarted.start()
+    restarted.join()
+    restarted.stop(timeout=5)
+
+    assert seen == [2]  # resumed from the recorded batch
+    assert restarted.store.get(survivor["id"])["status"] == DONE
+    gone = restarted.store.get(lost["id"])
+    assert gone["status"] == FAILED and "restart" in gone["error"]
+
+
+def test_jobs_that_keep_crashing_the_worker_are_failed_on_restart(tmp_path):
+    q = _queue(tmp_path, runner=lambda job, progress: None)
+    crasher = q.submit(io.BytesIO(b"pdf"), "huge.pdf", "default", 3)
+    retried = q.submit(io.BytesIO(b"pdf"), "ok.pdf", "default", 3)
+    assert q.store.claim(crasher["id"]) and q.store.get(crasher["id"])["attempts"] == 1
+    q.store.update(crasher["id"], attempts=3)  # claimed on three boots, never finished
+    q.store.update(retried["id"], status=RUNNING, attempts=2)
+    q.store.close()
+
+    restarted = _queue(tmp_path, runner=lambda job, progress: None)
+    restarted.start()
+    restarted.join()
+    restarted.stop(timeout=5)
+
+    gave_up = restarted.store.get(crasher["id"])
+    assert gave_up["status"] == FAILED and "3 attempts" in gave_up["error"]
+    assert restarted.store.get(retried["id"])["status"] == DONE
+    assert restarted.store.get(retried["id"])["attempts"] == 3
+    assert not list((tmp_path / "uploads").iterdir())
@@ -0,0 +1,97 @@
+from types import SimpleNamespace
+
+from langgraphagenticai.agentic.knowledge_manager import KnowledgeManager, PdfCache, filter_by_url
+
+URL = "https://example.org/paper.pdf"
+
+
+class FakeServer:
+    def __init__(self):
+        self.docs = {URL: (b"%PDF v1", '"v1"')}
+        self.requests = []
+
+    def __call__(self, url, headers):
+        self.requests.append(dict(headers))
+        body, etag = self.docs[url]
+        if headers.get("If-None-Match") == etag:
+            return 304, {}, b""
+        return 200, {"etag": etag}, body
+
+
+class RecordingManager(KnowledgeManager):
+    """Vector store calls recorded instead of hitting agno/LanceDB."""
+
+    def __init__(self, cache):
+        super().__init__(cache)
+        self.table = []
+        self.recreated = 0
+
+    def _table_exists(self):
+        return bool(self.table) or self.recreated > 0
+
+    def _insert(self, url, path):
+        with open(path, "rb") as f:
+            self.table.append((url, f.read()))
+
+    def _recreate(self):
+        self.table = []
+        self.recreated += 1
+
+    def scoped(self, urls):
+        return ("scoped", urls)
+
+
+def test_cache_revalidates_with_etag(tmp_path):
+    server = FakeServer()
+    cache = PdfCache(str(tmp_path), fetcher=server, fresh_s=0)
+    first = cache.fetch(URL)
+    assert open(first["path"], "rb").read() == b"%PDF v1"
+
+    again = PdfCache(str(tmp_path), fetcher=server, fresh_s=0).fetch(URL)  # manifest survives restarts
+    assert server.requests[-1] == {"If-None-Match": '"v1"'}
+    assert again["sha256"] == first["sha256"]
+
+
+def test_cache_skips_revalidation_inside_freshness_window(tmp_path):
+    server = FakeServer()
+    now = [1000.0]
+    cache = PdfCache(str(tmp_path), fetcher=server, fresh_s=60, clock=lambda: now[0])
+    cache.fetch(URL)
+    now[0] += 59
+    PdfCache(str(tmp_path), fetcher=server, fresh_s=60, clock=lambda: now[0]).fetch(URL)
+    assert len(server.requests) == 1
+    now[0] += 2
+    cache.fetch(URL)
+    assert len(server.requests) == 2
+
+
+def test_sync_loads_only_new_or_changed_content(tmp_path):
+    server = FakeServer()
+    manager = RecordingManager(PdfCache(str(tmp_path), fetcher=server, fresh_s=0))
+
+    assert manager.sync([URL])["loaded"] == [URL]
+    assert manager.sync([URL]) == {"loaded": [], "changed": [], "unchanged": [URL]}
+    assert manager.table == [(URL, b"%PDF v1")]
+
+    other = "https://example.org/other.pdf"
+    server.docs[other] = (b"%PDF other", '"o1"')
+    assert manager.sync([other])["loaded"] == [other]  # appended, no rebuild
+    assert manager.recreated == 0
+
+    server.docs[URL] = (b"%PDF v2", '"v2"')
+    result = manager.sync([URL])
+    assert result["changed"] == [URL] and manager.recreated == 1
+    assert sorted(manager.table) == [(other, b"%PDF other"), (URL, b"%PDF v2")]
+
+
+def test_retrieval_is_scoped_to_the_requested_urls(tmp_path):
+    server = FakeServer()
+    other = "https://example.org/other.pdf"
+    server.docs[other] = (b"%PDF other", '"o1"')
+    manager = RecordingManager(PdfCache(str(tmp_path), fetcher=server))
+    manager.knowledge_for([other])
+
+    assert manager.knowledge_for([URL]) == ("scoped", [URL])  # shares the table, not the hits
+    hits = [SimpleNamespace(meta_data={"url": u}) for u in [other, URL, other, URL, URL]]
+    assert [h.meta_data["url"] for h in filter_by_url(hits, [URL], limit=2)] == [URL, URL]
+
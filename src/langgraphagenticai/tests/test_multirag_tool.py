@@ -0,0 +1,32 @@
+import pytest
+
+pytest.importorskip("langgraph")
+multirag_tool = pytest.importorskip("langgraphagenticai.agentic.tools.multirag_tool")
+node_runners = pytest.importorskip("langgraphagenticai.nodes.node_runners")
+
+
+def test_stream_runs_the_pdf_graph_end_to_end(monkeypatch):
+    asked = []
+
+    def fake_stream(query, namespace):
+        asked.append((query, namespace))
+        yield from ["The answer ", "is ", "42."]
+
+    monkeypatch.setattr(node_runners, "stream_query_pdf", fake_stream)
+    tool = multirag_tool.MultiRAGTool()
+
+    tokens = list(tool.stream("What is it?", namespace="t1:doc"))
+    assert tokens == ["The answer ", "is ", "42."]
+    assert asked == [("What is it?", "t1:doc")]
+
+
+def test_stream_falls_back_to_search_when_the_pdf_fails_first(monkeypatch):
+    def failing_stream(query, namespace):
+        raise ConnectionError("pinecone down")
+        yield
+
+    monkeypatch.setattr(node_runners, "stream_query_pdf", failing_stream)
+    monkeypatch.setattr(node_runners, "query_search", lambda query: f"web: {query}")
+
+    tokens = list(multirag_tool.MultiRAGTool().stream("What is it?", namespace="t1:doc"))
+    assert "".join(tokens) == "web: What is it?"
@@ -0,0 +1,79 @@
+import pytest
+
+from langgraphagenticai.utils.namespace_utils import (
+    InvalidTenant,
+    NamespaceRegistry,
+    document_namespace,
+    evict_namespaces,
+    find_orphans,
+    parse_tenant_tokens,
+    tenant_for_token,
+    tenant_namespace,
+)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_namespace_names_are_scoped_and_validated():
+    assert tenant_namespace("Acme") == "t-acme"
+    assert document_namespace("acme", "abc123") == "t-acme--abc123"
+    with pytest.raises(InvalidTenant):
+        tenant_namespace("../other")
+
+
+def test_registry_accounts_per_document(tmp_path):
+    reg = NamespaceRegistry(str(tmp_path / "ns.db"), clock=Clock())
+    reg.record_document("t-acme", "doc1", vectors=10, chars=5000)
+    reg.record_document("t-acme", "doc1", vectors=12, chars=6000)  # re-ingest replaces
+    reg.record_document("t-acme", "doc2", vectors=3, chars=900)
+    reg.record_document("t-beta", "doc9", vectors=1, chars=10)
+
+    [acme] = reg.usage("acme")
+    assert (acme["docs"], acme["vectors"], acme["chars"]) == (2, 15, 6900)
+
+
+def test_eviction_by_ttl_then_lru_cap(tmp_path):
+    clock = Clock()
+    reg = NamespaceRegistry(str(tmp_path / "ns.db"), clock=clock)
+    reg.record_document("default", "legacy", vectors=1000, chars=1)  # unmanaged: never evicted
+    reg.record_document("t-cold", "d", vectors=5, chars=1)
+    clock.now += 500
+    reg.record_document("t-warm", "d", vectors=40, chars=1)
+    clock.now += 500
+    reg.record_document("t-hot", "d", vectors=40, chars=1)
+
+    deleted = []
+    evicted = evict_namespaces(reg, deleted.append, ttl_s=800, max_vectors=50, now=clock.now)
+
+    assert evicted == deleted == ["t-cold", "t-warm"]
+    assert sorted(reg.names()) == ["default", "t-hot"]
+
+
+def test_orphans_are_only_namespaces_the_registry_removed(tmp_path):
+    reg = NamespaceRegistry(str(tmp_path / "ns.db"))
+    reg.register("t-acme")
+    reg.register("t-gone--abc")
+    reg.remove("t-gone--abc")
+    live = ["t-acme", "t-gone--abc", "t-other-machine", "default", ""]
+    # a namespace this (possibly brand-new) registry never saw is not evidence of anything
+    assert find_orphans(live, reg) == ["t-gone--abc"]
+    assert find_orphans(live, NamespaceRegistry(str(tmp_path / "fresh.db"))) == []
+
+    reg.register("t-gone--abc")  # re-ingested after eviction
+    assert find_orphans(live, reg) == []
+
+
+def test_tenant_tokens_pin_the_tenant():
+    tokens = parse_tenant_tokens("Acme=tok-a, beta=tok-b")
+    assert tokens == {"tok-a": "acme", "tok-b": "beta"}
+    assert tenant_for_token("Bearer tok-b", tokens) == "beta"
+    assert tenant_for_token("Bearer tok-x", tokens) is None
+    assert tenant_for_token("tok-a", tokens) is None
+    with pytest.raises(ValueError):
+        parse_tenant_tokens("acme")
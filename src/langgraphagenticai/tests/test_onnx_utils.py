@@ -0,0 +1,38 @@
+from langgraphagenticai.utils import onnx_utils
+from langgraphagenticai.utils.onnx_utils import compare_recall, recall_at_k
+
+DOCS = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
+QUERIES = [[0.9, 0.1, 0.0], [0.1, 0.9, 0.0], [0.0, 0.2, 0.8]]
+
+
+def test_recall_at_k():
+    assert recall_at_k(QUERIES, DOCS, [0, 1, 2], k=1) == 1.0
+    assert recall_at_k(QUERIES, DOCS, [1, 1, 1], k=1) == 1 / 3
+    assert recall_at_k(QUERIES, DOCS, [1, 1, 1], k=2) == 1.0
+
+
+def test_compare_recall_flags_degraded_candidate():
+    close = [[d + 0.01 for d in doc] for doc in DOCS]
+    ok = compare_recall((QUERIES, DOCS), (QUERIES, close), [0, 1, 2], tolerance=0.02)
+    assert ok["ok"] and ok["min_cosine_to_reference"] > 0.99
+
+    swapped = [DOCS[1], DOCS[0], DOCS[2]]
+    bad = compare_recall((QUERIES, DOCS), (QUERIES, swapped), [0, 1, 2], tolerance=0.02)
+    assert not bad["ok"] and bad["candidate_recall"] == 1 / 3
+
+
+def test_load_falls_back_and_remembers_verdict(tmp_path, monkeypatch):
+    monkeypatch.setattr(onnx_utils, "ONNX_MODEL_DIR", str(tmp_path))
+    exports, checks = [], []
+
+    def load():
+        return onnx_utils._load(
+            "org/model",
+            export=exports.append,
+            build=lambda d: "int8-model",
+            verify=lambda m: checks.append(m) or {"ok": False},
+        )
+
+    assert load() is None  # failed the recall check → fp32
+    assert load() is None
+    assert len(exports) == 1 and len(checks) == 1  # export and check run once
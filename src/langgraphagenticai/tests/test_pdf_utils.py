@@ -0,0 +1,82 @@
+import pytest
+
+fitz = pytest.importorskip("fitz")
+pytest.importorskip("langchain")
+
+from langgraphagenticai.utils import pdf_utils
+
+
+def make_pdf(path, pages):
+    doc = fitz.open()
+    for i in range(pages):
+        doc.new_page().insert_text((72, 72), f"page {i}")
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def test_page_ranges_cover_every_page_once():
+    assert pdf_utils._page_ranges(10, 3) == [(0, 4), (4, 8), (8, 10)]
+    assert pdf_utils._page_ranges(2, 8) == [(0, 1), (1, 2)]
+    for count, parts in [(1, 1), (7, 2), (100, 6), (64, 64)]:
+        ranges = pdf_utils._page_ranges(count, parts)
+        assert [p for s, e in ranges for p in range(s, e)] == list(range(count))
+        assert len(ranges) <= parts
+
+
+def test_small_documents_stay_serial(tmp_path, monkeypatch):
+    def no_pool(*_):
+        raise AssertionError("pool used below PDF_PARALLEL_MIN_PAGES")
+
+    monkeypatch.setattr(pdf_utils, "PDF_PARALLEL_MIN_PAGES", 64)
+    monkeypatch.setattr(pdf_utils, "get_extraction_pool", no_pool)
+    pages = pdf_utils.extract_pages(make_pdf(tmp_path / "small.pdf", 3), workers=4)
+    assert [p.strip() for p in pages] == ["page 0", "page 1", "page 2"]
+
+
+def test_parallel_extraction_keeps_page_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_utils, "PDF_PARALLEL_MIN_PAGES", 4)
+    path = make_pdf(tmp_path / "big.pdf", 11)
+    try:
+        from_path = pdf_utils.extract_pages(path, workers=2)
+        with open(path, "rb") as f:
+            from_bytes = pdf_utils.extract_pages(f.read(), workers=2)
+    finally:
+        pdf_utils.shutdown_extraction_pool()
+    expected = [f"page {i}" for i in range(11)]
+    assert [p.strip() for p in from_path] == expected
+    assert [p.strip() for p in from_bytes] == expected
+
+
+def test_extract_many_reports_unreadable_files_and_continues(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_utils, "PDF_PARALLEL_MIN_PAGES", 4)
+    corrupt = tmp_path / "corrupt.pdf"
+    corrupt.write_bytes(b"not a pdf")
+    paths = [make_pdf(tmp_path / "a.pdf", 2), str(corrupt), make_pdf(tmp_path / "b.pdf", 5)]
+    try:
+        results = list(pdf_utils.extract_many(paths, workers=2, window=1))
+    finally:
+        pdf_utils.shutdown_extraction_pool()
+
+    assert [r[0] for r in results] == paths
+    (_, a, a_err), (_, bad, bad_err), (_, b, b_err) = results
+    assert a_err is None and len(a) == 2
+    assert bad is None and bad_err is not None
+    assert b_err is None and [p.strip() for p in b] == [f"page {i}" for i in range(5)]
+
+
+def test_progress_is_reported_as_page_ranges_finish(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_utils, "PDF_PARALLEL_MIN_PAGES", 4)
+    path = make_pdf(tmp_path / "big.pdf", 11)
+    serial, parallel = [], []
+    try:
+        pdf_utils.extract_pages(path, workers=1, on_progress=lambda *a: serial.append(a))
+        pages = pdf_utils.extract_pages(path, workers=2, on_progress=lambda *a: parallel.append(a))
+    finally:
+        pdf_utils.shutdown_extraction_pool()
+
+    assert [p.strip() for p in pages] == [f"page {i}" for i in range(11)]
+    assert serial == [(0, 11), (11, 11)]
+    assert parallel[0] == (0, 11) and parallel[-1] == (11, 11)
+    assert len(parallel) == 1 + len(pdf_utils._page_ranges(11, 4))
+    assert [n for n, _ in parallel] == sorted(n for n, _ in parallel)
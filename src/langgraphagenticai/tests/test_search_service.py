@@ -0,0 +1,65 @@
+import threading
+import time
+
+import pytest
+
+from langgraphagenticai.tools.search_service import SearchService, normalize_query
+from langgraphagenticai.utils.cache_utils import LRUCache, RateLimiter
+
+
+class LocalBackend:
+    """Stand-in search engine: slow enough for callers to overlap."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, query):
+        with self._lock:
+            self.calls.append(query)
+        time.sleep(self.delay)
+        return f"results for {normalize_query(query)}"
+
+
+def test_cache_hit_on_normalized_query():
+    backend = LocalBackend(delay=0)
+    svc = SearchService("web", backend, limiter=RateLimiter(100, 10))
+    assert svc.search("LangGraph  agents") == "results for langgraph agents"
+    assert svc.search("  langgraph agents ") == "results for langgraph agents"
+    assert len(backend.calls) == 1
+    assert svc.stats()["cache"]["hits"] == 1
+
+
+def test_concurrent_identical_queries_share_one_call():
+    backend = LocalBackend()
+    svc = SearchService("web", backend, limiter=RateLimiter(100, 10))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(svc.search("pinecone"))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ["results for pinecone"] * 8
+    assert len(backend.calls) == 1
+
+
+def test_ttl_expiry_and_rate_limit():
+    now = [0.0]
+    cache = LRUCache(10, ttl=60, clock=lambda: now[0])
+    backend = LocalBackend(delay=0)
+    limiter = RateLimiter(rate=1, burst=1, clock=lambda: now[0], sleep=lambda s: None)
+    svc = SearchService("web", backend, cache=cache, limiter=limiter, rate_wait=0)
+
+    svc.search("faiss")
+    now[0] = 30
+    svc.search("faiss")
+    assert len(backend.calls) == 1
+
+    now[0] = 61
+    svc.search("faiss")
+    assert len(backend.calls) == 2
+
+    # bucket is empty again and we refuse to wait
+    with pytest.raises(RuntimeError, match="rate limit"):
+        svc.search("other")
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from langgraphagenticai.utils.stream_utils import (
+    StreamInterrupted,
+    emit_all,
+    get_token_sink,
+    iter_tokens,
+    to_sse,
+)
+
+
+def test_iter_tokens_yields_in_order_and_reraises():
+    def run(on_token):
+        for tok in ["Hel", "lo", "!"]:
+            on_token(tok)
+
+    assert list(iter_tokens(run)) == ["Hel", "lo", "!"]
+
+    def failing(on_token):
+        on_token("partial")
+        raise RuntimeError("boom")
+
+    stream = iter_tokens(failing)
+    assert next(stream) == "partial"
+    with pytest.raises(RuntimeError):
+        next(stream)
+
+
+def test_get_token_sink_and_emit_all():
+    seen = []
+    sink = get_token_sink({"configurable": {"on_token": seen.append}})
+    assert emit_all(["a", "", "b"], sink) == "ab"
+    assert seen == ["a", "b"]
+    assert get_token_sink(None) is None
+
+
+def test_emit_all_flags_failures_after_tokens_went_out():
+    def broken(first=True):
+        if first:
+            yield "partial"
+        raise ConnectionError("dropped")
+
+    with pytest.raises(StreamInterrupted):
+        emit_all(broken(), [].append)
+    with pytest.raises(ConnectionError):  # nothing sent yet: callers may still fall back
+        emit_all(broken(first=False), [].append)
+    with pytest.raises(ConnectionError):
+        emit_all(broken(), None)
+
+
+def test_to_sse_frames():
+    def broken():
+        yield "x"
+        raise ValueError("nope")
+
+    frames = list(to_sse(iter(["a\nb", "c"])))
+    assert json.loads(frames[0][len("data: "):]) == {"token": "a\nb"}
+    assert frames[-1].startswith("event: done\n")
+    assert json.loads(frames[-1].split("data: ", 1)[1]) == {"output": "a\nbc"}
+
+    frames = list(to_sse(broken(), error_message="failed"))
+    assert frames[-1].startswith("event: error\n")
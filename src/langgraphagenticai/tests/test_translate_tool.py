@@ -0,0 +1,108 @@
+import re
+import threading
+
+import pytest
+
+from langgraphagenticai.tools.translate_tool import (
+    Translator,
+    detect_language,
+    set_translator,
+    split_into_chunks,
+    stream_translate_text,
+)
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeGemini:
+    """Upper-cases every segment; understands the batch marker format."""
+
+    def __init__(self):
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt):
+        with self._lock:
+            self.prompts.append(prompt)
+        if "[[0]]" in prompt:
+            body = prompt.split("commentary.\n\n", 1)[1]
+            return FakeResponse(re.sub(r"(?m)^(?!\[\[\d+\]\]$).+$",
+                                       lambda m: m.group(0).upper(), body))
+        return FakeResponse(prompt.split(":\n\n", 1)[1].upper())
+
+
+def test_detect_language():
+    assert detect_language("The cat is on the mat and it is happy.") == "en"
+    assert detect_language("Die Katze ist auf der Matte und sie ist nicht müde.") == "de"
+    assert detect_language("नमस्ते दुनिया") == "hi"
+    assert detect_language("42") is None
+
+
+def test_split_into_chunks_roundtrip():
+    text = "First sentence here. Second one.\n\n" + " ".join(["Word."] * 50) + "\n\nTail"
+    chunks = split_into_chunks(text, max_chars=60)
+    assert all(len(c) <= 60 for c, _ in chunks)
+    assert "".join(c + s for c, s in chunks) == text
+
+
+def test_split_into_chunks_keeps_line_breaks_in_long_paragraphs():
+    items = "\n".join(f"- Item number {i} is listed here." for i in range(12))
+    text = "Intro.\n\n" + items + "\n  Done.  \n\nTail"
+    chunks = split_into_chunks(text, max_chars=80)
+    assert all(len(c) <= 80 for c, _ in chunks)
+    assert "".join(c + s for c, s in chunks) == text
+
+
+def test_translate_uses_cache_and_skips_target_language():
+    fake = FakeGemini()
+    tr = Translator(model=fake, max_workers=2)
+    text = "The report is ready and the results are good."
+    assert tr.translate(text, "de") == text.upper()
+    assert tr.translate(text, "de") == text.upper()
+    assert len(fake.prompts) == 1
+
+    german = "Der Bericht ist fertig und die Ergebnisse sind nicht schlecht."
+    assert tr.translate(german, "de") == german
+    assert len(fake.prompts) == 1
+
+
+def test_translate_batch_single_call():
+    fake = FakeGemini()
+    tr = Translator(model=fake, max_workers=2)
+    texts = ["the first answer is here", "the second answer is here", "the first answer is here"]
+    out = tr.translate_batch(texts, "fr")
+    assert out == [t.upper() for t in texts]
+    assert len(fake.prompts) == 1
+    # cached afterwards
+    assert tr.translate(texts[1], "fr") == texts[1].upper()
+    assert len(fake.prompts) == 1
+
+
+class BrokenGemini:
+    """Streams `good` pieces, then fails."""
+
+    def __init__(self, good=0):
+        self.good = good
+
+    def generate_content(self, prompt, stream=False):
+        for i in range(self.good):
+            yield FakeResponse(f"piece{i} ")
+        raise ConnectionError("gemini unavailable")
+
+
+def test_stream_translate_falls_back_only_before_the_first_chunk():
+    text = "The report is ready and the results are good."
+    try:
+        set_translator(Translator(model=BrokenGemini()))
+        assert list(stream_translate_text(text, "de")) == ["Translation failed: gemini unavailable"]
+
+        set_translator(Translator(model=BrokenGemini(good=2)))
+        stream = stream_translate_text(text, "de")
+        assert [next(stream), next(stream)] == ["piece0 ", "piece1 "]
+        with pytest.raises(ConnectionError):
+            next(stream)
+    finally:
+        set_translator(None)
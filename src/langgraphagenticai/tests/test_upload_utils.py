@@ -0,0 +1,72 @@
+import asyncio
+import hashlib
+
+import pytest
+
+from langgraphagenticai.utils.upload_utils import MaxBodySizeMiddleware, UploadTooLarge, spool_upload
+
+
+class FakeUpload:
+    def __init__(self, data, filename="x.pdf"):
+        self.data = data
+        self.filename = filename
+        self.pos = 0
+        self.reads = 0
+
+    async def read(self, n=-1):
+        self.reads += 1
+        chunk = self.data[self.pos:self.pos + n]
+        self.pos += len(chunk)
+        return chunk
+
+
+def test_spool_upload_hashes_content():
+    data = b"%PDF" + b"x" * 5000
+    upload = asyncio.run(spool_upload(FakeUpload(data), max_bytes=10_000, chunk_size=1024))
+    with upload:
+        assert upload.size == len(data)
+        assert upload.sha256 == hashlib.sha256(data).hexdigest()
+        assert upload.getvalue() == data
+
+
+def test_spool_upload_stops_at_limit():
+    src = FakeUpload(b"x" * 100_000)
+    with pytest.raises(UploadTooLarge):
+        asyncio.run(spool_upload(src, max_bytes=4096, chunk_size=1024))
+    assert src.reads == 5  # stopped right after crossing the limit
+
+
+def _run(app, headers, chunks):
+    sent = []
+    messages = [{"type": "http.request", "body": c, "more_body": i < len(chunks) - 1}
+                for i, c in enumerate(chunks)]
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "headers": headers}
+    asyncio.run(MaxBodySizeMiddleware(app, max_bytes=10)(scope, receive, send))
+    return sent
+
+
+async def reading_app(scope, receive, send):
+    while True:
+        msg = await receive()
+        if not msg.get("more_body"):
+            break
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def test_middleware_rejects_declared_and_streamed_bodies():
+    sent = _run(reading_app, [(b"content-length", b"999")], [b""])
+    assert sent[0]["status"] == 413
+
+    sent = _run(reading_app, [], [b"123456", b"789012"])
+    assert sent[0]["status"] == 413
+
+    sent = _run(reading_app, [], [b"1234", b"5678"])
+    assert sent[0]["status"] == 200
@@ -1,9 +1,9 @@
-from langchain_community.tools import ArxivQueryRun
 from langchain.agents import Tool
+from langgraphagenticai.tools.search_service import get_search_service
 
 def load_arxiv_tool():
     return Tool(
         name="Arxiv Search",
-        func=ArxivQueryRun().run,
+        func=get_search_service("arxiv").search,
         description="Search academic papers from arXiv.org using keywords."
     )
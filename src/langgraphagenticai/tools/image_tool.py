@@ -1,11 +1,15 @@
 import os
 import logging
-from typing import List, Union
+from typing import Any, Dict, Iterator, List, Union
 from google.generativeai import GenerativeModel
 from google.api_core import retry as gp_retry
-from PIL import Image
+from langgraphagenticai.utils import image_utils
+from langgraphagenticai.utils.diagnostics import faiss_footprint, model_footprint
+from langgraphagenticai.utils.stream_utils import StreamInterrupted
 from langgraphagenticai.utils.image_utils import (
+    ImageSource,
     get_clip_model,
+    open_image,
     validate_image,
     optimize_image,
     create_faiss_index,
@@ -34,29 +38,56 @@ def _generate_vision(vision_model: GenerativeModel, image_bytes: bytes, query: s
     ])
     return clean_gemini_response(resp.text)
 
+# Longest prefix clean_gemini_response may strip; buffer this much before emitting
+_CLEAN_HEAD_CHARS = 32
+
+def _stream_vision(vision_model: GenerativeModel, image_bytes: bytes, query: str) -> Iterator[str]:
+    """
+    Streaming twin of `_generate_vision`. The opening characters are buffered
+    so the usual Gemini prefixes can still be stripped before anything is sent.
+    """
+    resp = vision_model.generate_content([
+        {"mime_type": "image/jpeg", "data": image_bytes},
+        {"text": f"{query}\n\nPlease respond concisely under 100 words."}
+    ], stream=True)
+    head, cleaned = "", False
+    for chunk in resp:
+        text = getattr(chunk, "text", "")
+        if cleaned:
+            yield text
+            continue
+        head += text
+        if len(head) >= _CLEAN_HEAD_CHARS:
+            cleaned = True
+            yield clean_gemini_response(head)
+    if not cleaned and head:
+        yield clean_gemini_response(head)
+
 # ── Core classes ─────────────────────────────────────
 
 class ImageProcessor:
     """Handle single‐image Q&A via Gemini Vision + FAISS search fallback."""
 
-    def __init__(self):
-        # init vision model
+    def __init__(self, vision: GenerativeModel = None,
+                 index_path: str = DEFAULT_INDEX_PATH,
+                 image_folder: str = DEFAULT_IMAGE_FOLDER):
+        # init vision model (callers may pass their own, e.g. a benchmark stand-in)
         try:
-            self.vision = GenerativeModel(VISION_MODEL_NAME)
+            self.vision = vision if vision is not None else GenerativeModel(VISION_MODEL_NAME)
         except Exception as e:
             logger.error("Vision init failed", exc_info=True)
             raise RuntimeError("Could not initialize vision model")
 
         # init or load FAISS for similarity search
-        idx_path = DEFAULT_INDEX_PATH
+        idx_path = index_path
         if os.path.exists(idx_path):
             idx, paths = load_faiss_index(idx_path)
         else:
-            idx, paths = create_faiss_index(DEFAULT_IMAGE_FOLDER, idx_path)
+            idx, paths = create_faiss_index(image_folder, idx_path)
         self.index = idx
         self.paths = paths
 
-    def describe(self, image_path: str, query: str) -> str:
+    def describe(self, image_path: ImageSource, query: str) -> str:
         """
         Run Gemini Vision Q&A on the image.
         """
@@ -76,7 +107,36 @@ class ImageProcessor:
             logger.exception("Vision call failed")
             return "❌ Vision service temporarily unavailable."
 
-    def similar(self, image_path: str, top_k: int = 3) -> List[str]:
+    def describe_stream(self, image_path: ImageSource, query: str) -> Iterator[str]:
+        """
+        Like `describe`, but yields the answer incrementally.
+        """
+        if not query.strip():
+            yield "❌ Please ask a question about the image."
+            return
+
+        if not validate_image(image_path):
+            yield "❌ Invalid image; must be JPEG/PNG under 10 MB."
+            return
+
+        data = optimize_image(image_path)
+        if not data:
+            yield "❌ Failed to preprocess image."
+            return
+
+        emitted = False
+        try:
+            for tok in _stream_vision(self.vision, data, query):
+                emitted = True
+                yield tok
+        except Exception as e:
+            logger.exception("Vision stream failed")
+            if emitted:
+                # part of the answer is already out; let the caller end the stream with an error
+                raise StreamInterrupted("vision stream failed mid-answer") from e
+            yield "❌ Vision service temporarily unavailable."
+
+    def similar(self, image_path: ImageSource, top_k: int = 3) -> List[str]:
         """
         Return file‐paths of top_k visually‐similar images.
         """
@@ -88,7 +148,8 @@ class ImageProcessor:
             raise RuntimeError("Could not preprocess image for search")
 
         model = get_clip_model()
-        feat = model.encode(Image.open(image_path)).astype('float32').reshape(1, -1)
+        with open_image(image_path) as img:
+            feat = model.encode(img).astype('float32').reshape(1, -1)
         D, I = self.index.search(feat, top_k)
         return [ self.paths[int(i)] for i in I[0] if i >= 0 ]
 
@@ -103,13 +164,37 @@ def _get_processor() -> ImageProcessor:
         _processor = ImageProcessor()
     return _processor
 
-def query_image(query: str, image_path: str) -> str:
+def warm_up_search() -> None:
+    """Create the vision client and load the FAISS index now, not on the first request."""
+    _get_processor()
+
+def loaded_models() -> Dict[str, Any]:
+    """Footprint of what this process has loaded so far (asking loads nothing)."""
+    processor = _processor
+    return {
+        "clip": model_footprint(image_utils._clip),
+        "faiss": faiss_footprint(processor.index if processor is not None else None),
+        "vision": {"loaded": processor is not None},
+    }
+
+def set_processor(processor: ImageProcessor) -> None:
+    """Install a pre-built processor (e.g. one wired to local stand-ins)."""
+    global _processor
+    _processor = processor
+
+def query_image(query: str, image_path: ImageSource) -> str:
     """
     For your node_runner: describe what's in the image.
     """
     return _get_processor().describe(image_path, query)
 
-def search_similar_images(image_path: str, top_k: int = 3) -> List[str]:
+def stream_query_image(query: str, image_path: ImageSource) -> Iterator[str]:
+    """
+    Streaming variant of `query_image`.
+    """
+    return _get_processor().describe_stream(image_path, query)
+
+def search_similar_images(image_path: ImageSource, top_k: int = 3) -> List[str]:
     """
     For your image‐search node: return similar image paths.
     """
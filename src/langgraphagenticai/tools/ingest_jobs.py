@@ -0,0 +1,270 @@
+import os
+import time
+import uuid
+import queue
+import shutil
+import sqlite3
+import logging
+import threading
+from typing import Any, BinaryIO, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# ── Configuration ────────────────────────────────────
+
+INGEST_DIR     = os.getenv("INGEST_DIR", "/tmp/ingest")
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "2"))
+INGEST_KEEP_S  = int(os.getenv("INGEST_KEEP_HOURS", "24")) * 3600  # finished jobs kept for polling
+INGEST_MAX_ATTEMPTS = int(os.getenv("INGEST_MAX_ATTEMPTS", "3"))   # runs before a job that keeps killing the worker is failed
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+_COLUMNS = [
+    "id", "status", "filename", "path", "namespace", "size", "created_at", "updated_at",
+    "pages_total", "pages_parsed", "chunks_total", "chunks_embedded",
+    "batches_total", "batches_upserted", "attempts", "error",
+]
+
+# ── Job store ────────────────────────────────────────
+
+class JobStore:
+    """
+    Ingest jobs in a local SQLite file, so status survives restarts and can
+    be polled from any request. One connection guarded by a lock; every
+    write commits immediately.
+    """
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        with self._db:
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    filename TEXT,
+                    path TEXT NOT NULL,
+                    namespace TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    pages_total INTEGER DEFAULT 0,
+                    pages_parsed INTEGER DEFAULT 0,
+                    chunks_total INTEGER DEFAULT 0,
+                    chunks_embedded INTEGER DEFAULT 0,
+                    batches_total INTEGER DEFAULT 0,
+                    batches_upserted INTEGER DEFAULT 0,
+                    attempts INTEGER DEFAULT 0,
+                    error TEXT
+                )""")
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(jobs)")}
+            if "attempts" not in columns:  # job files from before attempts were counted
+                self._db.execute("ALTER TABLE jobs ADD COLUMN attempts INTEGER DEFAULT 0")
+
+    def create(self, path: str, filename: str, namespace: str, size: int) -> Dict[str, Any]:
+        now = self._clock()
+        job_id = uuid.uuid4().hex
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO jobs (id, status, filename, path, namespace, size, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, filename, path, namespace, size, now, now),
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def update(self, job_id: str, **fields) -> None:
+        fields = {k: v for k, v in fields.items() if k in _COLUMNS and k != "id"}
+        fields["updated_at"] = self._clock()
+        assignments = ", ".join(f"{k} = ?" for k in fields)
+        with self._lock, self._db:
+            self._db.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def claim(self, job_id: str) -> bool:
+        """
+        Atomically move a queued job to running and count the attempt; False
+        if someone else has it.
+        """
+        with self._lock, self._db:
+            cur = self._db.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE id = ? AND status = ?",
+                (RUNNING, self._clock(), job_id, QUEUED),
+            )
+        return cur.rowcount == 1
+
+    def with_status(self, *statuses: str) -> List[Dict[str, Any]]:
+        marks = ", ".join("?" for _ in statuses)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT * FROM jobs WHERE status IN ({marks}) ORDER BY size, created_at", statuses
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def purge(self, older_than_s: float) -> int:
+        """Forget finished jobs last updated more than `older_than_s` ago."""
+        cutoff = self._clock() - older_than_s
+        with self._lock, self._db:
+            cur = self._db.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?", (DONE, FAILED, cutoff)
+            )
+        return cur.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+# ── Ingest runner ────────────────────────────────────
+
+def run_ingest_job(job: Dict[str, Any], progress: Callable[..., None]) -> None:
+    """
+    Parse → split → batched embed/upsert for one job, reporting counts as it
+    goes. A job that was interrupted mid-upsert resumes after the last batch
+    it recorded (chunk ids are deterministic, so the split is identical).
+    """
+    from langgraphagenticai.utils.pdf_utils import extract_pages, split_text
+    from langgraphagenticai.tools.pdf_tool import _doc_key, ingest_documents
+
+    pages = extract_pages(
+        job["path"],
+        on_progress=lambda parsed, total: progress(pages_total=total, pages_parsed=parsed),
+    )
+    docs = split_text("\n".join(pages))
+    ingest_documents(
+        docs, _doc_key(job["path"]), job["filename"], job["namespace"],
+        start_batch=job.get("batches_upserted") or 0, on_progress=progress,
+    )
+
+# ── Worker pool ──────────────────────────────────────
+
+class IngestQueue:
+    """
+    Bounded pool of worker threads draining a priority queue of ingest jobs,
+    smallest upload first so short documents are not stuck behind huge ones.
+    Uploads are kept under `upload_dir` until their job finishes.
+    On start, jobs left queued or running by a previous process are picked
+    up again if their upload is still on disk, and failed otherwise. A job
+    that has already been started INGEST_MAX_ATTEMPTS times (i.e. it keeps
+    taking the process down) is failed instead of being run again.
+    """
+
+    def __init__(self, store: JobStore, upload_dir: str, workers: int = INGEST_WORKERS,
+                 runner: Callable[[Dict[str, Any], Callable[..., None]], None] = run_ingest_job,
+                 max_attempts: int = INGEST_MAX_ATTEMPTS):
+        self.store = store
+        self.upload_dir = upload_dir
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.runner = runner
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._seq = 0
+        self._seq_lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        os.makedirs(upload_dir, exist_ok=True)
+
+    def _put(self, job: Dict[str, Any]) -> None:
+        with self._seq_lock:
+            self._seq += 1
+            self._queue.put((job["size"], self._seq, job["id"]))
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self.store.purge(INGEST_KEEP_S)
+        in_queue = {item[2] for item in list(self._queue.queue)}
+        for job in self.store.with_status(QUEUED, RUNNING):
+            if job["id"] in in_queue:
+                continue
+            if job["attempts"] >= self.max_attempts:
+                logger.error("Ingest job %s was interrupted %d times; giving up", job["id"], job["attempts"])
+                self.store.update(job["id"], status=FAILED,
+                                  error=f"Gave up after {job['attempts']} attempts interrupted by a restart")
+                self._remove_upload(job)
+            elif os.path.exists(job["path"]):
+                logger.info("Resuming ingest job %s (%s)", job["id"], job["status"])
+                self.store.update(job["id"], status=QUEUED)
+                self._put(job)
+            else:
+                self.store.update(job["id"], status=FAILED, error="Interrupted by restart; upload is gone")
+        for i in range(self.workers):
+            t = threading.Thread(target=self._work, name=f"ingest-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Let workers finish their current job; unstarted jobs stay queued in the store."""
+        for _ in self._threads:
+            self._queue.put((-1, 0, None))  # sorts ahead of every real job
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+
+    def submit(self, fileobj: BinaryIO, filename: str, namespace: str, size: int) -> Dict[str, Any]:
+        """Copy the upload into `upload_dir`, record the job and queue it."""
+        path = os.path.join(self.upload_dir, f"{uuid.uuid4().hex}.pdf")
+        with open(path, "wb") as out:
+            shutil.copyfileobj(fileobj, out)
+        job = self.store.create(path, filename, namespace, size)
+        self._put(job)
+        return job
+
+    def queued(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> Dict[str, int]:
+        return {"workers": self.workers, "alive": sum(t.is_alive() for t in self._threads),
+                "queued": self.queued(), "running": len(self.store.with_status(RUNNING))}
+
+    def join(self) -> None:
+        """Block until every queued job has been processed."""
+        self._queue.join()
+
+    def _work(self) -> None:
+        while True:
+            _, _, job_id = self._queue.get()
+            try:
+                if job_id is None:
+                    return
+                if self.store.claim(job_id):
+                    self._run(self.store.get(job_id))
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job: Dict[str, Any]) -> None:
+        job_id = job["id"]
+        try:
+            self.runner(job, lambda **counts: self.store.update(job_id, **counts))
+            self.store.update(job_id, status=DONE)
+        except Exception as e:
+            logger.exception("Ingest job %s failed", job_id)
+            self.store.update(job_id, status=FAILED, error=str(e) or type(e).__name__)
+        self._remove_upload(job)
+
+    @staticmethod
+    def _remove_upload(job: Dict[str, Any]) -> None:
+        try:
+            os.remove(job["path"])
+        except OSError:
+            pass
+
+# ── Shared instance ──────────────────────────────────
+
+_ingest_queue: Optional[IngestQueue] = None
+
+def get_ingest_queue() -> IngestQueue:
+    global _ingest_queue
+    if _ingest_queue is None:
+        store = JobStore(os.path.join(INGEST_DIR, "jobs.db"))
+        _ingest_queue = IngestQueue(store, os.path.join(INGEST_DIR, "uploads"))
+    return _ingest_queue
+
+def job_status(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Public view of a job row (no server paths)."""
+    return {k: v for k, v in job.items() if k != "path"}
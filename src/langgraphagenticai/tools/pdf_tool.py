@@ -1,72 +1,288 @@
 import os
-from typing import List, Dict
+import hashlib
+import logging
+from typing import Any, Callable, List, Dict, Iterator, Optional, Union
 
 # Updated imports to use community packages
 from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_community.vectorstores import Pinecone as PineconeVectorStore
 from langchain_community.chat_models import ChatOpenAI
-from langchain.chains import RetrievalQA
+from langchain.schema import Document
 from pinecone import Pinecone
 
 from langgraphagenticai.utils.pdf_utils import load_and_split_pdf
+from langgraphagenticai.utils.context_utils import Candidate, ContextResult, assemble_context
+from langgraphagenticai.utils.bm25_utils import (
+    bm25_namespaces,
+    bm25_stats,
+    drop_bm25_index,
+    get_bm25_index,
+    reciprocal_rank_fusion,
+)
+from langgraphagenticai.utils.namespace_utils import (
+    NAMESPACE_COMPACT,
+    evict_namespaces,
+    find_orphans,
+    get_namespace_registry,
+)
+from langgraphagenticai.utils.onnx_utils import load_quantized_text_model, use_onnx
+from langgraphagenticai.utils.diagnostics import model_footprint
+
+logger = logging.getLogger(__name__)
 
 # ─────────────────────────────────────────────────────────────────────────────
 #   CONFIGURATION FROM ENV
 # ─────────────────────────────────────────────────────────────────────────────
-PINECONE_API_KEY = os.environ["PINECONE_API_KEY"]
-PINECONE_INDEX = os.environ["PINECONE_INDEX_NAME"]
 EMBEDDING_MODEL_ID = "sentence-transformers/all-MiniLM-L6-v2"
 
+# Retrieval: over-fetch, rerank with MMR, then pack to a token budget
+RAG_FETCH_K = int(os.getenv("RAG_FETCH_K", "20"))
+RAG_MAX_CHUNKS = int(os.getenv("RAG_MAX_CHUNKS", "6"))
+RAG_CONTEXT_TOKENS = int(os.getenv("RAG_CONTEXT_TOKENS", "1500"))
+RAG_MMR_LAMBDA = float(os.getenv("RAG_MMR_LAMBDA", "0.5"))
+RAG_DUP_THRESHOLD = float(os.getenv("RAG_DUP_THRESHOLD", "0.95"))
+# "dense" (Pinecone only), "bm25" (lexical only) or "hybrid" (RRF of both)
+RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "hybrid")
+# Chunks embedded and upserted per round trip during ingest
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "64"))
+
 # ─────────────────────────────────────────────────────────────────────────────
-#   SETUP PINECONE & VECTORSTORE (Fixed initialization)
+#   PINECONE, EMBEDDINGS & LLM (created on first use, swappable for benchmarks)
 # ─────────────────────────────────────────────────────────────────────────────
-pc = Pinecone(api_key=PINECONE_API_KEY)
-pinecone_index = pc.Index(PINECONE_INDEX)  # Renamed to avoid confusion
+_pinecone_index = None
+_embeddings = None
+_llm_factory: Callable[..., Any] = ChatOpenAI
 
-embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL_ID)
+def get_pinecone_index():
+    global _pinecone_index
+    if _pinecone_index is None:
+        pc = Pinecone(api_key=os.environ["PINECONE_API_KEY"])
+        _pinecone_index = pc.Index(os.environ["PINECONE_INDEX_NAME"])
+    return _pinecone_index
 
-# Initialize vectorstore with correct parameters
-vectordb = PineconeVectorStore(
-    client=pinecone_index,
-    embedding=embeddings,  # Pass the embeddings object directly
-    text_key="text"
-)
+def get_embeddings():
+    global _embeddings
+    if _embeddings is None and use_onnx():
+        _embeddings = load_quantized_text_model(EMBEDDING_MODEL_ID)  # None → fp32 fallback
+    if _embeddings is None:
+        _embeddings = HuggingFaceEmbeddings(model_name=EMBEDDING_MODEL_ID)
+    return _embeddings
+
+def loaded_models() -> Dict[str, Any]:
+    """Footprint of what this process has loaded so far (asking loads nothing)."""
+    return {
+        "minilm": model_footprint(_embeddings),
+        "pinecone": {"connected": _pinecone_index is not None},
+        "bm25_docs": bm25_stats(),
+    }
+
+def get_llm(streaming: bool = False):
+    return _llm_factory(streaming=streaming)
+
+def configure_backends(index=None, embeddings=None, llm_factory: Optional[Callable[..., Any]] = None) -> None:
+    """
+    Replace the Pinecone index, embedding model and/or chat-model factory,
+    e.g. with local stand-ins for offline benchmarks.
+    """
+    global _pinecone_index, _embeddings, _llm_factory
+    if index is not None:
+        _pinecone_index = index
+    if embeddings is not None:
+        _embeddings = embeddings
+    if llm_factory is not None:
+        _llm_factory = llm_factory
 
 # ───────────────────────────────────────────────────`──────────────────────────
 #   PDF INGEST & QUERY FUNCTIONS
 # ─────────────────────────────────────────────────────────────────────────────
-def ingest_pdf(pdf_path: str, namespace: str = "default") -> Dict[str, int]:
+def _doc_key(pdf_path: Union[str, bytes]) -> str:
+    """Content hash, so re-ingesting the same PDF overwrites instead of duplicating."""
+    h = hashlib.sha1()
+    if isinstance(pdf_path, (bytes, bytearray)):
+        h.update(pdf_path)
+    else:
+        with open(pdf_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+    return h.hexdigest()[:16]
+
+def ingest_documents(docs: List[Document], doc_key: str, source_name: str,
+                     namespace: str = "default", batch_size: int = INGEST_BATCH_SIZE,
+                     start_batch: int = 0,
+                     on_progress: Optional[Callable[..., None]] = None) -> Dict[str, int]:
+    """
+    Embed already-split chunks and upsert them into Pinecone and the
+    namespace's BM25 index under ids "<doc_key>-<n>", one batch at a time.
+    Ids are deterministic, so batches before `start_batch` (already upserted
+    by an interrupted run) can be skipped. `on_progress(**counts)` is called
+    after each batch with chunks_embedded / batches_upserted / batches_total.
+    """
+    batches_total = -(-len(docs) // batch_size) if docs else 0
+    report = on_progress or (lambda **_: None)
+    registry = get_namespace_registry()
+    registry.register(namespace)  # before upserting, so compaction never sees it as orphaned
+    report(chunks_total=len(docs), batches_total=batches_total)
+
+    for b in range(start_batch, batches_total):
+        batch = docs[b * batch_size:(b + 1) * batch_size]
+        texts = [doc.page_content for doc in batch]
+        embeddings = get_embeddings().embed_documents(texts)
+        report(chunks_embedded=min(len(docs), (b + 1) * batch_size))
+
+        vectors = [
+            {
+                "id": f"{doc_key}-{b * batch_size + i}",
+                "values": embedding,
+                "metadata": {
+                    "text": text,
+                    "source": source_name
+                }
+            }
+            for i, (text, embedding) in enumerate(zip(texts, embeddings))
+        ]
+        get_pinecone_index().upsert(vectors=vectors, namespace=namespace)
+        get_bm25_index(namespace).add((v["id"], v["metadata"]["text"]) for v in vectors)
+        report(batches_upserted=b + 1)
+
+    registry.record_document(namespace, doc_key, vectors=len(docs),
+                             chars=sum(len(doc.page_content) for doc in docs))
+    return {"ingested_chunks": len(docs)}
+
+def ingest_pdf(pdf_path: Union[str, bytes], namespace: str = "default",
+               source_name: Optional[str] = None) -> Dict[str, int]:
     """
     Load PDF, split into chunks, embed, and upsert into Pinecone.
+    `pdf_path` may also be the raw PDF bytes (then pass `source_name`).
+    The chunks are also added to the namespace's local BM25 index.
     Returns dictionary with count of ingested chunks.
     """
     docs = load_and_split_pdf(pdf_path)
-    vectors = []
-    
-    for i, doc in enumerate(docs):
-        embedding = embeddings.embed_documents([doc.page_content])[0]
-                
-        vectors.append({
-            "id": f"doc-{i}",
-            "values": embedding,
-            "metadata": {
-                "text": doc.page_content,
-                "source": os.path.basename(pdf_path)
-            }
-        })
-    
-    pinecone_index.upsert(vectors=vectors, namespace=namespace)
-    return {"ingested_chunks": len(vectors)}
+    doc_key = _doc_key(pdf_path)
+    if source_name is None:
+        source_name = os.path.basename(pdf_path) if isinstance(pdf_path, str) else f"{doc_key}.pdf"
+    return ingest_documents(docs, doc_key, source_name, namespace)
 
-def query_pdf(query: str, namespace: str = "default") -> str:
+STUFF_PROMPT = (
+    "Use the following pieces of context to answer the question at the end. "
+    "If you don't know the answer, just say that you don't know, "
+    "don't try to make up an answer.\n\n{context}\n\nQuestion: {question}\nHelpful Answer:"
+)
+
+def _dense_candidates(query_vec: List[float], namespace: str) -> List[Candidate]:
+    res = get_pinecone_index().query(
+        vector=query_vec,
+        top_k=RAG_FETCH_K,
+        namespace=namespace,
+        include_values=True,
+        include_metadata=True,
+    )
+    return [
+        Candidate(id=m.id, text=(m.metadata or {}).get("text", ""),
+                  vector=list(m.values) if m.values else None, score=m.score)
+        for m in res.matches
+    ]
+
+def _fuse(query: str, dense: List[Candidate], namespace: str) -> List[Candidate]:
+    """
+    Reciprocal-rank-fuse dense matches with BM25 hits; vectors for lexical-only
+    hits are fetched from Pinecone so MMR can still compare them.
+    """
+    bm25 = get_bm25_index(namespace)
+    lexical = bm25.search(query, RAG_FETCH_K)
+    rankings = [[c.id for c in dense], [doc_id for doc_id, _ in lexical]]
+    if RETRIEVAL_MODE == "bm25":
+        rankings = rankings[1:]
+    fused = reciprocal_rank_fusion(rankings)[:RAG_FETCH_K]
+
+    by_id = {c.id: c for c in dense}
+    missing = [doc_id for doc_id, _ in fused if doc_id not in by_id]
+    if missing:
+        fetched = get_pinecone_index().fetch(ids=missing, namespace=namespace).vectors
+        for doc_id in missing:
+            vec = fetched.get(doc_id)
+            by_id[doc_id] = Candidate(id=doc_id, text=bm25.texts.get(doc_id, ""),
+                                      vector=list(vec.values) if vec is not None else None)
+    out = []
+    for doc_id, score in fused:
+        cand = by_id[doc_id]
+        cand.score = score
+        out.append(cand)
+    return out
+
+def retrieve_context(query: str, namespace: str = "default") -> ContextResult:
     """
-    Run a RetrievalQA chain over Pinecone index and return the answer.
+    Over-fetch RAG_FETCH_K matches (with their stored vectors), fuse them with
+    BM25 hits unless RETRIEVAL_MODE is "dense", rerank with MMR, drop
+    near-duplicates and pack up to RAG_CONTEXT_TOKENS.
     """
-    retriever = vectordb.as_retriever(namespace=namespace)
-    qa = RetrievalQA.from_chain_type(
-        llm=ChatOpenAI(),
-        chain_type="stuff",
-        retriever=retriever,
-        return_source_documents=False
+    get_namespace_registry().touch(namespace)
+    query_vec = get_embeddings().embed_query(query)
+    candidates = _dense_candidates(query_vec, namespace) if RETRIEVAL_MODE != "bm25" else []
+    hybrid = RETRIEVAL_MODE != "dense"
+    if hybrid:
+        candidates = _fuse(query, candidates, namespace)
+    ctx = assemble_context(
+        query_vec, candidates,
+        token_budget=RAG_CONTEXT_TOKENS,
+        max_chunks=RAG_MAX_CHUNKS,
+        lambda_mult=RAG_MMR_LAMBDA,
+        dup_threshold=RAG_DUP_THRESHOLD,
+        rank_by_score=hybrid,
     )
-    return qa.run(query)
\ No newline at end of file
+    logger.info(
+        "Context (%s): %d/%d chunks, %d tokens (baseline %d, saved %d, %d duplicates dropped)",
+        RETRIEVAL_MODE, len(ctx.chunks), len(candidates), ctx.context_tokens,
+        ctx.baseline_tokens, ctx.tokens_saved, ctx.dropped_duplicates,
+    )
+    return ctx
+
+def _build_prompt(query: str, namespace: str) -> str:
+    ctx = retrieve_context(query, namespace)
+    return STUFF_PROMPT.format(context=ctx.text, question=query)
+
+def stream_query_pdf(query: str, namespace: str = "default") -> Iterator[str]:
+    """
+    Same retrieval as `query_pdf`, but yields the answer token by token as
+    the LLM produces it instead of waiting for the full completion.
+    """
+    llm = get_llm(streaming=True)
+    for chunk in llm.stream(_build_prompt(query, namespace)):
+        if chunk.content:
+            yield chunk.content
+
+def query_pdf(query: str, namespace: str = "default") -> str:
+    """
+    Answer `query` from the budgeted, reranked context over the Pinecone index.
+    """
+    return get_llm().invoke(_build_prompt(query, namespace)).content
+
+# ─────────────────────────────────────────────────────────────────────────────
+#   NAMESPACE LIFECYCLE
+# ─────────────────────────────────────────────────────────────────────────────
+def delete_namespace(namespace: str) -> None:
+    """Drop a namespace's vectors from Pinecone and its local BM25 index."""
+    get_pinecone_index().delete(delete_all=True, namespace=namespace)
+    drop_bm25_index(namespace)
+
+def compact_namespaces() -> List[str]:
+    """
+    Re-delete namespaces the registry evicted that still hold vectors (or a
+    BM25 file), e.g. after a delete that didn't fully land. Namespaces the
+    registry never knew are left alone; tombstones whose data is gone are
+    dropped.
+    """
+    registry = get_namespace_registry()
+    live = set(get_pinecone_index().describe_index_stats().namespaces) | set(bm25_namespaces())
+    orphans = find_orphans(live, registry)
+    for namespace in orphans:
+        delete_namespace(namespace)
+    registry.forget_removed(ns for ns in registry.removed() if ns not in live)
+    if orphans:
+        logger.info("Compacted %d orphaned namespace(s): %s", len(orphans), orphans)
+    return orphans
+
+def run_namespace_maintenance(compact: bool = NAMESPACE_COMPACT) -> Dict[str, List[str]]:
+    """Evict cold namespaces (TTL / LRU over the vector cap), then, if enabled, compact orphans."""
+    return {
+        "evicted": evict_namespaces(get_namespace_registry(), delete_namespace),
+        "orphans_deleted": compact_namespaces() if compact else [],
+    }
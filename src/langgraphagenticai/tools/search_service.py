@@ -0,0 +1,129 @@
+import os
+import re
+import logging
+import threading
+from typing import Callable, Dict, Optional
+
+from langgraphagenticai.utils.cache_utils import LRUCache, RateLimiter, SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# ── Configuration ────────────────────────────────────
+
+SEARCH_CACHE_TTL   = float(os.getenv("SEARCH_CACHE_TTL", "900"))     # seconds
+SEARCH_CACHE_SIZE  = int(os.getenv("SEARCH_CACHE_SIZE", "512"))
+SEARCH_RATE_PER_S  = float(os.getenv("SEARCH_RATE_PER_S", "1.0"))
+SEARCH_RATE_BURST  = int(os.getenv("SEARCH_RATE_BURST", "3"))
+SEARCH_RATE_WAIT_S = float(os.getenv("SEARCH_RATE_WAIT_S", "10"))
+SEARCH_MAX_RESULTS = int(os.getenv("SEARCH_MAX_RESULTS", "4"))
+ARXIV_SUMMARY_MAX  = int(os.getenv("ARXIV_SUMMARY_MAX_CHARS", "4000"))
+
+SearchBackend = Callable[[str], str]
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive cache key for a search query."""
+    return re.sub(r"\s+", " ", query).strip().lower()
+
+# ── Core class ───────────────────────────────────────
+
+class SearchService:
+    """
+    Wraps a search backend (any `str -> str` callable) with a TTL cache on
+    the normalized query, single-flight coalescing of identical concurrent
+    queries and a token-bucket limiter on outbound calls.
+    """
+
+    def __init__(self, name: str, backend: SearchBackend,
+                 cache: Optional[LRUCache] = None,
+                 limiter: Optional[RateLimiter] = None,
+                 rate_wait: float = SEARCH_RATE_WAIT_S):
+        self.name = name
+        self.backend = backend
+        self.cache = cache if cache is not None else LRUCache(SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL)
+        self.limiter = limiter if limiter is not None else RateLimiter(SEARCH_RATE_PER_S, SEARCH_RATE_BURST)
+        self.rate_wait = rate_wait
+        self.flight = SingleFlight()
+
+    def _fetch(self, key: str, query: str) -> str:
+        # another caller may have filled the cache while we queued
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        if not self.limiter.acquire(timeout=self.rate_wait):
+            raise RuntimeError(f"{self.name} search rate limit exceeded")
+        logger.info("Outbound %s search: %s", self.name, query)
+        result = self.backend(query)
+        if result:
+            self.cache.set(key, result)
+        return result
+
+    def search(self, query: str) -> str:
+        key = normalize_query(query)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        return self.flight.do(key, lambda: self._fetch(key, query))
+
+    def stats(self) -> Dict[str, Dict]:
+        return {"cache": self.cache.stats(), "coalescing": self.flight.stats()}
+
+# ── Default backends (one long-lived client each) ────
+
+def _duckduckgo_backend() -> SearchBackend:
+    # One DDGS for the process: its HTTP session (and connection pool) is
+    # reused, where the langchain wrapper opened a new one per query
+    from duckduckgo_search import DDGS
+
+    ddgs = DDGS()
+
+    def search(query: str) -> str:
+        hits = ddgs.text(query, max_results=SEARCH_MAX_RESULTS) or []
+        snippets = [hit["body"] for hit in hits if hit.get("body")]
+        return " ".join(snippets) if snippets else "No good DuckDuckGo Search Result was found"
+    return search
+
+def _arxiv_backend() -> SearchBackend:
+    # Search.results() builds a fresh Client per call; keep one instead
+    import arxiv
+
+    client = arxiv.Client()
+
+    def search(query: str) -> str:
+        results = client.results(arxiv.Search(query=query[:300], max_results=SEARCH_MAX_RESULTS))
+        docs = [
+            f"Published: {r.published.date()}\n"
+            f"Title: {r.title}\n"
+            f"Authors: {', '.join(a.name for a in r.authors)}\n"
+            f"Summary: {r.summary}"
+            for r in results
+        ]
+        return "\n\n".join(docs)[:ARXIV_SUMMARY_MAX] if docs else "No good Arxiv Result was found"
+    return search
+
+_BACKEND_FACTORIES: Dict[str, Callable[[], SearchBackend]] = {
+    "web": _duckduckgo_backend,
+    "arxiv": _arxiv_backend,
+}
+
+# ── Public API ───────────────────────────────────────
+
+_services: Dict[str, SearchService] = {}
+_services_lock = threading.Lock()
+
+def get_search_service(name: str) -> SearchService:
+    """Process-wide service for `name` ("web" or "arxiv"), created on first use."""
+    with _services_lock:
+        if name not in _services:
+            _services[name] = SearchService(name, _BACKEND_FACTORIES[name]())
+        return _services[name]
+
+def set_search_backend(name: str, backend: SearchBackend, **kwargs) -> SearchService:
+    """Install a service around a custom backend, e.g. a local stand-in in tests."""
+    with _services_lock:
+        _services[name] = SearchService(name, backend, **kwargs)
+        return _services[name]
+
+def search_service_stats() -> Dict[str, Dict]:
+    """Cache / coalescing counters of every service created so far."""
+    with _services_lock:
+        return {name: service.stats() for name, service in _services.items()}
@@ -1,4 +1,4 @@
-from langchain_community.tools import DuckDuckGoSearchRun
+from langgraphagenticai.tools.search_service import get_search_service
 
 def query_search(query: str) -> str:
-    return DuckDuckGoSearchRun().run(query)
+    return get_search_service("web").search(query)
@@ -1,15 +1,356 @@
-import google.generativeai as genai
 import os
-GOOGLE_API_KEY = os.environ["GOOGLE_API_KEY"]
+import re
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-genai.configure(api_key=GOOGLE_API_KEY)
-gemini_pro = genai.GenerativeModel("gemini-pro")
+from langgraphagenticai.utils.cache_utils import LRUCache, text_hash
+from langgraphagenticai.utils.diagnostics import executor_depth
+
+logger = logging.getLogger(__name__)
+
+# ── Configuration ────────────────────────────────────
+
+TRANSLATE_MODEL_NAME = os.getenv("TRANSLATE_MODEL_NAME", "gemini-pro")
+CHUNK_MAX_CHARS      = int(os.getenv("TRANSLATE_CHUNK_MAX_CHARS", "4000"))
+BATCH_MAX_CHARS      = int(os.getenv("TRANSLATE_BATCH_MAX_CHARS", "8000"))
+MAX_WORKERS          = int(os.getenv("TRANSLATE_MAX_WORKERS", "4"))
+CACHE_SIZE           = int(os.getenv("TRANSLATE_CACHE_SIZE", "2048"))
+
+LANGUAGE_NAMES = {"en": "English", "de": "German", "hi": "Hindi", "fr": "French"}
+
+# ── Local language detection ─────────────────────────
+
+_STOPWORDS = {
+    "en": {"the", "and", "is", "are", "of", "to", "in", "that", "it", "with", "for", "this", "was", "on"},
+    "de": {"der", "die", "das", "und", "ist", "nicht", "mit", "ein", "eine", "zu", "auf", "für", "sich", "von"},
+    "fr": {"le", "la", "les", "et", "est", "des", "une", "un", "du", "pour", "pas", "que", "dans", "sur"},
+}
+_WORD_RE       = re.compile(r"[^\W\d_]+", re.UNICODE)
+_DEVANAGARI_RE = re.compile(r"[ऀ-ॿ]")
+
+def detect_language(text: str) -> Optional[str]:
+    """
+    Cheap local guess of the language of `text` (one of en/de/fr/hi).
+    Returns None when there is not enough signal to decide.
+    """
+    letters = [c for c in text if c.isalpha()]
+    if not letters:
+        return None
+    devanagari = len(_DEVANAGARI_RE.findall(text))
+    if devanagari / len(letters) > 0.5:
+        return "hi"
+
+    words = [w.lower() for w in _WORD_RE.findall(text)]
+    scores = {lang: sum(w in stops for w in words) for lang, stops in _STOPWORDS.items()}
+    best = max(scores, key=scores.get)
+    ranked = sorted(scores.values(), reverse=True)
+    # need a few hits and a clear margin over the runner-up
+    if ranked[0] < 2 or ranked[0] < 2 * ranked[1]:
+        return None
+    return best
+
+# ── Chunking ─────────────────────────────────────────
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?।])(\s+)")  # keeps the gap so layout survives
+
+def _hard_split(text: str, max_chars: int) -> List[str]:
+    return [text[i:i + max_chars] for i in range(0, len(text), max_chars)]
+
+def split_into_chunks(text: str, max_chars: int = CHUNK_MAX_CHARS) -> List[Tuple[str, str]]:
+    """
+    Split `text` into chunks of at most `max_chars`, on paragraph and then
+    sentence boundaries. Returns (chunk, separator) pairs such that
+    "".join(c + s for c, s in pairs) reproduces the layout of the input.
+    """
+    pieces: List[Tuple[str, str]] = []
+    paragraphs = text.split("\n\n")
+    for p_idx, para in enumerate(paragraphs):
+        para_sep = "\n\n" if p_idx < len(paragraphs) - 1 else ""
+        if len(para) <= max_chars:
+            pieces.append((para, para_sep))
+            continue
+        split = _SENTENCE_RE.split(para)  # sentence, gap, sentence, gap, ..., sentence
+        for sent, sent_sep in zip(split[0::2], split[1::2] + [para_sep]):
+            if not sent:  # whitespace after the paragraph's last sentence
+                prev, prev_sep = pieces[-1]
+                pieces[-1] = (prev, prev_sep + sent_sep)
+                continue
+            parts = _hard_split(sent, max_chars) if len(sent) > max_chars else [sent]
+            for part_idx, part in enumerate(parts):
+                pieces.append((part, sent_sep if part_idx == len(parts) - 1 else ""))
+
+    # greedily merge neighbours back up to the budget to keep requests few
+    chunks: List[Tuple[str, str]] = []
+    for piece, sep in pieces:
+        if chunks:
+            prev, prev_sep = chunks[-1]
+            if len(prev) + len(prev_sep) + len(piece) <= max_chars:
+                chunks[-1] = (prev + prev_sep + piece, sep)
+                continue
+        chunks.append((piece, sep))
+    return chunks
+
+# ── Batch prompt helpers ─────────────────────────────
+
+_MARKER_RE = re.compile(r"^\[\[(\d+)\]\]\s*$", re.MULTILINE)
+
+def _batch_prompt(texts: List[str], language: str) -> str:
+    body = "\n\n".join(f"[[{i}]]\n{t}" for i, t in enumerate(texts))
+    return (
+        f"Translate each numbered segment below to {language}. "
+        "Return every segment in the same order, each preceded by its marker "
+        "line exactly as given (e.g. [[0]]). Do not add any commentary.\n\n"
+        f"{body}"
+    )
+
+def _parse_batch_response(text: str, expected: int) -> Dict[int, str]:
+    markers = list(_MARKER_RE.finditer(text))
+    out: Dict[int, str] = {}
+    for pos, m in enumerate(markers):
+        end = markers[pos + 1].start() if pos + 1 < len(markers) else len(text)
+        idx = int(m.group(1))
+        if 0 <= idx < expected:
+            out[idx] = text[m.end():end].strip()
+    return out
+
+# ── Core class ───────────────────────────────────────
+
+class Translator:
+    """
+    Gemini-backed translation with a (text hash, target_lang) cache,
+    parallel chunking for long inputs and batched multi-string requests.
+
+    `model` is anything exposing `generate_content(prompt)` that returns an
+    object with a `.text` attribute, so tests can pass a fake client.
+    """
+
+    def __init__(self, model: Any = None, cache: Optional[LRUCache] = None,
+                 max_chars: int = CHUNK_MAX_CHARS, batch_max_chars: int = BATCH_MAX_CHARS,
+                 max_workers: int = MAX_WORKERS):
+        self._model = model
+        self.cache = cache if cache is not None else LRUCache(CACHE_SIZE)
+        self.max_chars = max_chars
+        self.batch_max_chars = batch_max_chars
+        self.max_workers = max_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self) -> Any:
+        with self._lock:
+            if self._model is None:
+                import google.generativeai as genai
+                genai.configure(api_key=os.environ["GOOGLE_API_KEY"])
+                self._model = genai.GenerativeModel(TRANSLATE_MODEL_NAME)
+            return self._model
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix="translate")
+            return self._pool
+
+    def stats(self) -> Dict[str, Any]:
+        return {"cache": self.cache.stats(), "executor": executor_depth(self._pool)}
+
+    # -- single string ---------------------------------
+
+    def _needs_translation(self, text: str, target_lang: str) -> bool:
+        return bool(text.strip()) and detect_language(text) != target_lang
+
+    def _prompt(self, text: str, target_lang: str) -> str:
+        language = LANGUAGE_NAMES.get(target_lang, target_lang)
+        return f"Translate this to {language}. Reply with the translation only:\n\n{text}"
+
+    def _call(self, text: str, target_lang: str) -> str:
+        response = self.model.generate_content(self._prompt(text, target_lang))
+        return response.text.strip()
+
+    def _translate_chunk(self, text: str, target_lang: str) -> str:
+        key = (text_hash(text), target_lang)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        result = self._call(text, target_lang)
+        self.cache.set(key, result)
+        return result
+
+    def translate(self, text: str, target_lang: str) -> str:
+        """Translate one string, reusing cached chunks where possible."""
+        if not self._needs_translation(text, target_lang):
+            return text
+
+        key = (text_hash(text), target_lang)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        chunks = split_into_chunks(text, self.max_chars)
+        if len(chunks) == 1:
+            result = self._translate_chunk(chunks[0][0], target_lang)
+        else:
+            logger.info("Translating %d chunks in parallel", len(chunks))
+            translated = list(self.pool.map(
+                lambda c: self._translate_chunk(c, target_lang)
+                if self._needs_translation(c, target_lang) else c,
+                [c for c, _ in chunks],
+            ))
+            result = "".join(t + sep for t, (_, sep) in zip(translated, chunks))
+
+        self.cache.set(key, result)
+        return result
+
+    def translate_stream(self, text: str, target_lang: str) -> Iterator[str]:
+        """
+        Yield the translation incrementally. Chunks are translated in order
+        (so output stays in order) and each one is cached once complete.
+        """
+        if not self._needs_translation(text, target_lang):
+            yield text
+            return
+
+        key = (text_hash(text), target_lang)
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        parts = []
+        for chunk, sep in split_into_chunks(text, self.max_chars):
+            chunk_key = (text_hash(chunk), target_lang)
+            translated = self.cache.get(chunk_key)
+            if translated is not None:
+                yield translated
+            elif not self._needs_translation(chunk, target_lang):
+                translated = chunk
+                yield chunk
+            else:
+                pieces = []
+                for piece in self.model.generate_content(self._prompt(chunk, target_lang), stream=True):
+                    piece_text = getattr(piece, "text", "")
+                    if piece_text:
+                        pieces.append(piece_text)
+                        yield piece_text
+                translated = "".join(pieces).strip()
+                self.cache.set(chunk_key, translated)
+            if sep:
+                yield sep
+            parts.append(translated + sep)
+        self.cache.set(key, "".join(parts))
+
+    # -- many strings ----------------------------------
+
+    def _translate_group(self, texts: List[str], target_lang: str) -> List[str]:
+        if len(texts) == 1:
+            return [self._translate_chunk(texts[0], target_lang)]
+
+        language = LANGUAGE_NAMES.get(target_lang, target_lang)
+        response = self.model.generate_content(_batch_prompt(texts, language))
+        parsed = _parse_batch_response(response.text, len(texts))
+        results = []
+        for i, text in enumerate(texts):
+            if parsed.get(i):
+                results.append(parsed[i])
+                self.cache.set((text_hash(text), target_lang), parsed[i])
+            else:
+                # model dropped or mangled a segment: redo just that one
+                logger.warning("Batch translation missing segment %d; retrying singly", i)
+                results.append(self._translate_chunk(text, target_lang))
+        return results
+
+    def translate_batch(self, texts: List[str], target_lang: str) -> List[str]:
+        """
+        Translate many strings, packing short uncached ones into as few
+        model calls as `batch_max_chars` allows. Order is preserved.
+        """
+        results: List[Optional[str]] = [None] * len(texts)
+        pending: Dict[str, List[int]] = {}
+        long_texts: Dict[str, List[int]] = {}
+
+        for i, text in enumerate(texts):
+            if not self._needs_translation(text, target_lang):
+                results[i] = text
+                continue
+            cached = self.cache.get((text_hash(text), target_lang))
+            if cached is not None:
+                results[i] = cached
+                continue
+            bucket = long_texts if len(text) > self.max_chars else pending
+            bucket.setdefault(text, []).append(i)
+
+        groups: List[List[str]] = []
+        size = 0
+        for text in pending:
+            if not groups or size + len(text) > self.batch_max_chars:
+                groups.append([])
+                size = 0
+            groups[-1].append(text)
+            size += len(text)
+
+        futures = [(group, self.pool.submit(self._translate_group, group, target_lang))
+                   for group in groups]
+        for group, future in futures:
+            for text, translated in zip(group, future.result()):
+                for i in pending[text]:
+                    results[i] = translated
+        for text, idxs in long_texts.items():
+            translated = self.translate(text, target_lang)
+            for i in idxs:
+                results[i] = translated
+        return results  # type: ignore[return-value]
+
+# ── Public API ───────────────────────────────────────
+
+_translator: Translator = None
+
+def _get_translator() -> Translator:
+    global _translator
+    if _translator is None:
+        _translator = Translator()
+    return _translator
+
+def translator_stats() -> Optional[Dict[str, Any]]:
+    """Cache and executor counters, or None if nothing has been translated yet."""
+    translator = _translator
+    return translator.stats() if translator is not None else None
+
+def set_translator(translator: Optional[Translator]) -> None:
+    """Swap the process-wide translator (e.g. one with a fake model in tests)."""
+    global _translator
+    _translator = translator
 
 def translate_text(text: str, target_lang: str) -> str:
     try:
-        if target_lang != "en":
-            prompt = f"Translate this to {target_lang}: {text}"
-            response = gemini_pro.generate_content(prompt)
-            return response.text
+        if target_lang == "en":
+            return text
+        return _get_translator().translate(text, target_lang)
     except Exception as e:
         return f"Translation failed: {e}"
+
+def stream_translate_text(text: str, target_lang: str) -> Iterator[str]:
+    """
+    Streaming variant of `translate_text`. A failure before the first chunk
+    yields the same "Translation failed" message; after it, it is raised.
+    """
+    if target_lang == "en":
+        yield text
+        return
+    emitted = False
+    try:
+        for piece in _get_translator().translate_stream(text, target_lang):
+            emitted = True
+            yield piece
+    except Exception as e:
+        if emitted:
+            raise
+        yield f"Translation failed: {e}"
+
+def translate_batch(texts: List[str], target_lang: str) -> List[str]:
+    """Translate several strings with one model call where possible."""
+    if target_lang == "en":
+        return list(texts)
+    return _get_translator().translate_batch(texts, target_lang)
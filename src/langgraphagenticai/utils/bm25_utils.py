@@ -0,0 +1,195 @@
+import os
+import re
+import json
+import math
+import logging
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ── Configuration ────────────────────────────────────
+
+BM25_INDEX_DIR = os.getenv("BM25_INDEX_DIR", "/tmp/bm25_index")
+BM25_K1 = 1.5
+BM25_B = 0.75
+RRF_K = 60
+
+# ── Tokenization ─────────────────────────────────────
+
+# keeps identifiers such as "ERR-4821", "v2.3.1" or "AB_12" as one token
+_TOKEN_RE = re.compile(r"\w(?:[\w.\-]*\w)?", re.UNICODE)
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+# ── Inverted index ───────────────────────────────────
+
+class BM25Index:
+    """
+    In-memory Okapi BM25 index with an append-only JSONL operation log, so
+    new chunks are persisted without rewriting the whole index. The log is
+    compacted on load once it is mostly superseded entries.
+    """
+
+    def __init__(self, path: Optional[str] = None, k1: float = BM25_K1, b: float = BM25_B):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self.texts: Dict[str, str] = {}
+        self._lengths: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._total_len = 0
+        self._lock = threading.RLock()
+        if path and os.path.exists(path):
+            self._replay()
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    # -- mutation --------------------------------------
+
+    def _index(self, doc_id: str, text: str) -> None:
+        if doc_id in self.texts:
+            self._unindex(doc_id)
+        terms = Counter(tokenize(text))
+        for term, tf in terms.items():
+            self._postings[term][doc_id] = tf
+        self.texts[doc_id] = text
+        self._lengths[doc_id] = sum(terms.values())
+        self._total_len += self._lengths[doc_id]
+
+    def _unindex(self, doc_id: str) -> None:
+        for term in set(tokenize(self.texts[doc_id])):
+            posting = self._postings.get(term)
+            if posting is not None:
+                posting.pop(doc_id, None)
+                if not posting:
+                    del self._postings[term]
+        self._total_len -= self._lengths.pop(doc_id)
+        del self.texts[doc_id]
+
+    def _append_log(self, ops: List[dict]) -> None:
+        if not self.path or not ops:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for op in ops:
+                f.write(json.dumps(op, ensure_ascii=False) + "\n")
+
+    def add(self, docs: Iterable[Tuple[str, str]]) -> int:
+        """Index (id, text) pairs, replacing existing ids. Returns count added."""
+        with self._lock:
+            ops = []
+            for doc_id, text in docs:
+                if self.texts.get(doc_id) == text:
+                    continue
+                self._index(doc_id, text)
+                ops.append({"op": "add", "id": doc_id, "text": text})
+            self._append_log(ops)
+            return len(ops)
+
+    def remove(self, doc_ids: Iterable[str]) -> int:
+        with self._lock:
+            ops = []
+            for doc_id in doc_ids:
+                if doc_id in self.texts:
+                    self._unindex(doc_id)
+                    ops.append({"op": "remove", "id": doc_id})
+            self._append_log(ops)
+            return len(ops)
+
+    # -- persistence -----------------------------------
+
+    def _replay(self) -> None:
+        entries = 0
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                op = json.loads(line)
+                entries += 1
+                if op["op"] == "add":
+                    self._index(op["id"], op["text"])
+                elif op["op"] == "remove" and op["id"] in self.texts:
+                    self._unindex(op["id"])
+        if entries > 2 * max(len(self.texts), 1):
+            self.compact()
+
+    def compact(self) -> None:
+        """Rewrite the log to one `add` per live document."""
+        if not self.path:
+            return
+        with self._lock:
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                for doc_id, text in self.texts.items():
+                    f.write(json.dumps({"op": "add", "id": doc_id, "text": text}, ensure_ascii=False) + "\n")
+            os.replace(tmp, self.path)
+
+    # -- query -----------------------------------------
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """Top-`k` (id, score) pairs for `query`, best first."""
+        with self._lock:
+            n = len(self.texts)
+            if not n:
+                return []
+            avg_len = self._total_len / n
+            scores: Dict[str, float] = defaultdict(float)
+            for term in set(tokenize(query)):
+                posting = self._postings.get(term)
+                if not posting:
+                    continue
+                idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+                for doc_id, tf in posting.items():
+                    norm = tf + self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / avg_len)
+                    scores[doc_id] += idf * tf * (self.k1 + 1) / norm
+            return sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:k]
+
+# ── Rank fusion ──────────────────────────────────────
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = RRF_K) -> List[Tuple[str, float]]:
+    """Fuse ranked id lists: score(d) = Σ 1 / (k + rank). Best first."""
+    fused: Dict[str, float] = defaultdict(float)
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            fused[doc_id] += 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda kv: kv[1], reverse=True)
+
+# ── Per-namespace registry ───────────────────────────
+
+_indexes: Dict[str, BM25Index] = {}
+_indexes_lock = threading.Lock()
+
+def _safe_name(namespace: str) -> str:
+    return re.sub(r"[^\w.\-]", "_", namespace)
+
+def get_bm25_index(namespace: str = "default") -> BM25Index:
+    """Process-wide BM25 index for `namespace`, loaded from BM25_INDEX_DIR."""
+    with _indexes_lock:
+        if namespace not in _indexes:
+            path = os.path.join(BM25_INDEX_DIR, f"{_safe_name(namespace)}.jsonl")
+            _indexes[namespace] = BM25Index(path)
+            logger.info("Loaded BM25 index %s (%d docs)", namespace, len(_indexes[namespace]))
+        return _indexes[namespace]
+
+def drop_bm25_index(namespace: str) -> None:
+    """Forget `namespace`'s index and delete its file."""
+    with _indexes_lock:
+        _indexes.pop(namespace, None)
+        path = os.path.join(BM25_INDEX_DIR, f"{_safe_name(namespace)}.jsonl")
+        if os.path.exists(path):
+            os.remove(path)
+
+def bm25_namespaces() -> List[str]:
+    """Namespaces with an index file on disk."""
+    if not os.path.isdir(BM25_INDEX_DIR):
+        return []
+    return [name[:-len(".jsonl")] for name in os.listdir(BM25_INDEX_DIR) if name.endswith(".jsonl")]
+
+def bm25_stats() -> Dict[str, int]:
+    """Document count of every index loaded in this process."""
+    with _indexes_lock:
+        return {ns: len(idx) for ns, idx in _indexes.items()}
@@ -0,0 +1,267 @@
+import time
+import queue
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterator, List, Optional, Tuple
+
+# ── Key helpers ──────────────────────────────────────
+
+def text_hash(text: str) -> str:
+    """Stable SHA-256 hex digest of `text` for use as a cache key."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+# ── In-process LRU cache ─────────────────────────────
+
+class LRUCache:
+    """
+    Thread-safe LRU cache with hit/miss counters and optional per-entry TTL.
+    `get` returns `default` on a miss; `None` values are cacheable.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _live(self, key: Hashable) -> bool:
+        # caller holds the lock
+        if key not in self._data:
+            return False
+        expires = self._data[key][1]
+        if expires is not None and expires <= self._clock():
+            del self._data[key]
+            return False
+        return True
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if self._live(key):
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key][0]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expires = self._clock() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._live(key)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else None,
+            }
+
+# ── Request coalescing ───────────────────────────────
+
+class SingleFlight:
+    """
+    Collapse concurrent calls sharing a key into one execution: the first
+    caller runs `fn`, everyone arriving while it is in flight waits for and
+    receives the same result (or exception).
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.collapsed = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self.calls += 1
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self.collapsed += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return future.result()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"calls": self.calls, "collapsed": self.collapsed,
+                    "in_flight": len(self._inflight)}
+
+class AsyncSingleFlight:
+    """
+    SingleFlight for coroutines on one event loop. The first caller's
+    `fn()` runs as a task; concurrent callers with the same key await that
+    task. It is shielded, so one client going away does not cancel the
+    work the others are waiting on. `fn` is only called for the leader.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, "asyncio.Future"] = {}
+        self.calls = 0
+        self.collapsed = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is not None:
+            self.collapsed += 1
+        else:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, int]:
+        return {"calls": self.calls, "collapsed": self.collapsed,
+                "in_flight": len(self._inflight)}
+
+# ── Object pooling ───────────────────────────────────
+
+class ObjectPool:
+    """
+    Reuse expensive objects (configured agents, clients) across requests.
+    `checkout()` hands out an idle instance, builds a new one while fewer
+    than `size` exist, and otherwise waits for one to be returned. `reset`
+    runs on every return so no per-request state leaks to the next user.
+    """
+
+    def __init__(self, factory: Callable[[], Any], size: int,
+                 reset: Optional[Callable[[Any], None]] = None):
+        self.factory = factory
+        self.size = size
+        self.reset = reset
+        self._idle: List[Any] = []  # LIFO: the most recently used (warmest) object first
+        # guards _idle and created; notified whenever an object or a build slot frees up
+        self._cond = threading.Condition()
+        self.created = 0
+        self.checkouts = 0
+        self.waits = 0
+
+    def _acquire(self, timeout: Optional[float]) -> Any:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            if not self._idle and self.created >= self.size:
+                self.waits += 1
+            while not self._idle and self.created >= self.size:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise queue.Empty
+                self._cond.wait(remaining)
+            if self._idle:
+                return self._idle.pop()
+            self.created += 1
+        try:
+            return self.factory()
+        except BaseException:
+            self._discard()
+            raise
+
+    def _discard(self) -> None:
+        # give up a build slot and let a waiter build the replacement
+        with self._cond:
+            self.created -= 1
+            self._cond.notify()
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """Borrow an object; raises queue.Empty if none frees up within `timeout`."""
+        obj = self._acquire(timeout)
+        with self._cond:
+            self.checkouts += 1
+        try:
+            yield obj
+        finally:
+            try:
+                if self.reset is not None:
+                    self.reset(obj)
+            except Exception:
+                self._discard()  # a half-reset object is not safe to hand out again
+            else:
+                with self._cond:
+                    self._idle.append(obj)
+                    self._cond.notify()
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {"size": self.size, "created": self.created, "idle": len(self._idle),
+                    "checkouts": self.checkouts, "waits": self.waits}
+
+# ── Rate limiting ────────────────────────────────────
+
+class RateLimiter:
+    """
+    Token bucket: allows `rate` acquisitions per second with bursts up to
+    `burst`. `acquire` blocks until a token is free, or returns False once
+    `timeout` seconds have passed.
+    """
+
+    def __init__(self, rate: float, burst: int = 1,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None and self._clock() + wait > deadline:
+                return False
+            self._sleep(wait)
@@ -0,0 +1,162 @@
+import math
+import logging
+from itertools import islice
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+except ImportError:  # token counts fall back to a word-based estimate
+    tiktoken = None
+
+# ── Configuration ────────────────────────────────────
+
+TOKEN_ENCODING = "cl100k_base"   # gpt-3.5 / gpt-4 family
+
+# ── Token counting ───────────────────────────────────
+
+_encoding = None
+def count_tokens(text: str) -> int:
+    """Token count under the OpenAI chat encoding (approximate without tiktoken)."""
+    global _encoding
+    if tiktoken is None:
+        return math.ceil(len(text.split()) * 4 / 3)
+    if _encoding is None:
+        _encoding = tiktoken.get_encoding(TOKEN_ENCODING)
+    return len(_encoding.encode(text))
+
+# ── Vector helpers ───────────────────────────────────
+
+def cosine(a: Sequence[float], b: Sequence[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    na = math.sqrt(sum(x * x for x in a))
+    nb = math.sqrt(sum(y * y for y in b))
+    return dot / (na * nb) if na and nb else 0.0
+
+def unit_rows(vectors: Sequence[Sequence[float]]):
+    """Row-normalised float32 matrix (zero vectors stay zero), so dot products are cosines."""
+    import numpy as np
+
+    m = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    return m / np.where(norms == 0, 1.0, norms)
+
+# ── Candidate / result types ─────────────────────────
+
+@dataclass
+class Candidate:
+    id: str
+    text: str
+    vector: Optional[List[float]] = None
+    score: float = 0.0
+
+@dataclass
+class ContextResult:
+    chunks: List[Candidate] = field(default_factory=list)
+    context_tokens: int = 0
+    candidate_tokens: int = 0
+    baseline_tokens: int = 0
+    dropped_duplicates: int = 0
+
+    @property
+    def text(self) -> str:
+        return "\n\n".join(c.text for c in self.chunks)
+
+    @property
+    def tokens_saved(self) -> int:
+        """Tokens saved versus stuffing the plain top-k (can be negative)."""
+        return self.baseline_tokens - self.context_tokens
+
+# ── Reranking & packing ──────────────────────────────
+
+def iter_mmr(query_vec: Sequence[float], candidates: List[Candidate],
+             lambda_mult: float = 0.5, rank_by_score: bool = False) -> Iterator[Candidate]:
+    """
+    Maximal marginal relevance ordering, lazily: trade similarity to the
+    query against similarity to what has already been picked. Relevance is
+    cosine to `query_vec`, or the candidates' own (e.g. fused) scores scaled
+    to [0, 1] when `rank_by_score` is set. Candidates without a vector
+    follow the ranked ones in their incoming order. The similarity matrix
+    is computed once and each pick only updates a running max-redundancy
+    vector, so stopping after k picks costs O(k·n).
+    """
+    import numpy as np
+
+    pool = [c for c in candidates if c.vector is not None]
+    if pool:
+        unit = unit_rows([c.vector for c in pool])
+        if rank_by_score:
+            scores = np.asarray([c.score for c in pool], dtype=np.float32)
+            relevance = scores / (float(scores.max()) or 1.0)
+        else:
+            relevance = unit @ unit_rows([query_vec])[0]
+        sim = unit @ unit.T
+        redundancy = np.zeros(len(pool), dtype=np.float32)  # nothing picked yet
+        remaining = np.ones(len(pool), dtype=bool)
+        for step in range(len(pool)):
+            mmr = np.where(remaining, lambda_mult * relevance - (1 - lambda_mult) * redundancy, -np.inf)
+            best = int(np.argmax(mmr))
+            remaining[best] = False
+            redundancy = sim[best].copy() if step == 0 else np.maximum(redundancy, sim[best])
+            yield pool[best]
+    yield from (c for c in candidates if c.vector is None)
+
+def mmr_order(query_vec: Sequence[float], candidates: List[Candidate],
+              lambda_mult: float = 0.5, rank_by_score: bool = False,
+              limit: Optional[int] = None) -> List[Candidate]:
+    """The first `limit` (default: all) candidates in MMR order; see iter_mmr."""
+    return list(islice(iter_mmr(query_vec, candidates, lambda_mult, rank_by_score), limit))
+
+def drop_near_duplicates(candidates: List[Candidate], threshold: float = 0.95) -> List[Candidate]:
+    """Keep the first of any group of chunks that are (near-)identical."""
+    vectored = [c for c in candidates if c.vector is not None]
+    row = {id(c): r for r, c in enumerate(vectored)}
+    sim = None
+    if vectored:
+        unit = unit_rows([c.vector for c in vectored])
+        sim = unit @ unit.T
+    kept: List[Candidate] = []
+    kept_rows: List[int] = []
+    seen_text = set()
+    for c in candidates:
+        norm = " ".join(c.text.split())
+        if norm in seen_text:
+            continue
+        if c.vector is not None:
+            r = row[id(c)]
+            if kept_rows and float(sim[r, kept_rows].max()) >= threshold:
+                continue
+            kept_rows.append(r)
+        seen_text.add(norm)
+        kept.append(c)
+    return kept
+
+def assemble_context(query_vec: Sequence[float], candidates: List[Candidate],
+                     token_budget: int, max_chunks: int,
+                     lambda_mult: float = 0.5, dup_threshold: float = 0.95,
+                     baseline_k: int = 4, rank_by_score: bool = False,
+                     counter: Callable[[str], int] = count_tokens) -> ContextResult:
+    """
+    Rerank over-fetched `candidates` (assumed in similarity order), drop
+    near-duplicates and greedily pack chunks until `token_budget` is spent.
+    A chunk that does not fit is skipped so smaller ones behind it may still.
+    """
+    sizes = {id(c): counter(c.text) for c in candidates}
+    result = ContextResult(
+        candidate_tokens=sum(sizes.values()),
+        baseline_tokens=sum(sizes[id(c)] for c in candidates[:baseline_k]),
+    )
+    unique = drop_near_duplicates(candidates, dup_threshold)
+    result.dropped_duplicates = len(candidates) - len(unique)
+
+    # MMR is lazy: ranking stops as soon as max_chunks have been packed
+    for c in iter_mmr(query_vec, unique, lambda_mult, rank_by_score):
+        if len(result.chunks) >= max_chunks:
+            break
+        if result.context_tokens + sizes[id(c)] > token_budget:
+            continue
+        result.chunks.append(c)
+        result.context_tokens += sizes[id(c)]
+    return result
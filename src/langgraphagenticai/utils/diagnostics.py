@@ -0,0 +1,230 @@
+import os
+import gc
+import sys
+import hmac
+import time
+import logging
+import resource
+import threading
+import tracemalloc
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# ── Configuration ────────────────────────────────────
+
+DIAG_MAX_PROFILE_S      = float(os.getenv("DIAG_MAX_PROFILE_SECONDS", "60"))
+DIAG_TRACEMALLOC_FRAMES = int(os.getenv("DIAG_TRACEMALLOC_FRAMES", "10"))
+WARMUP_RETRY_MAX_S      = 60
+
+def check_bearer(authorization: Optional[str], token: Optional[str]) -> bool:
+    """Constant-time check of an `Authorization: Bearer <token>` header."""
+    if not token or not authorization:
+        return False
+    return hmac.compare_digest(authorization.encode(), f"Bearer {token}".encode())
+
+# ── CPU sampling profiler ────────────────────────────
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+def sample_cpu_profile(seconds: float, interval: float = 0.01, top: int = 25,
+                       max_depth: int = 40) -> Dict[str, Any]:
+    """
+    Statistical profile of every thread (except the sampler) for `seconds`:
+    `sys._current_frames()` is read every `interval` and each stack counted.
+    "self" counts the innermost frame (where time is spent), "total" every
+    frame on the stack. Blocks the calling thread; run it off the event loop.
+    """
+    seconds = max(0.0, min(seconds, DIAG_MAX_PROFILE_S))
+    me = threading.get_ident()
+    names = {t.ident: t.name for t in threading.enumerate()}
+    self_counts: Counter = Counter()
+    total_counts: Counter = Counter()
+    stacks: Counter = Counter()
+    threads: Counter = Counter()
+    samples = 0
+    deadline = time.monotonic() + seconds
+    while True:
+        for ident, frame in sys._current_frames().items():
+            if ident == me:
+                continue
+            labels = []
+            while frame is not None and len(labels) < max_depth:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            if not labels:
+                continue
+            samples += 1
+            threads[names.get(ident, str(ident))] += 1
+            self_counts[labels[0]] += 1
+            for label in set(labels):
+                total_counts[label] += 1
+            stacks[" ← ".join(labels[:8])] += 1
+        if time.monotonic() >= deadline:
+            break
+        time.sleep(interval)
+
+    def rows(counter: Counter, key: str) -> List[Dict[str, Any]]:
+        return [{key: k, "samples": n, "pct": round(100 * n / samples, 1) if samples else 0.0}
+                for k, n in counter.most_common(top)]
+
+    return {
+        "seconds": seconds,
+        "interval": interval,
+        "samples": samples,
+        "threads": dict(threads),
+        "top_self": rows(self_counts, "function"),
+        "top_total": rows(total_counts, "function"),
+        "top_stacks": rows(stacks, "stack"),
+    }
+
+# ── Memory ───────────────────────────────────────────
+
+def tracemalloc_top(limit: int = 20, stop: bool = False) -> Dict[str, Any]:
+    """
+    Top allocation sites by live size. The first call starts tracing (only
+    allocations made from then on are seen, and tracing has overhead);
+    `stop=True` returns a final snapshot and turns it off.
+    """
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(DIAG_TRACEMALLOC_FRAMES)
+        return {"tracing": True, "started": True,
+                "note": "tracemalloc started; call again to see allocations made since"}
+    snapshot = tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ])
+    current, peak = tracemalloc.get_traced_memory()
+    top_stats = [
+        {"site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+         "size_kb": round(stat.size / 1024, 1), "count": stat.count}
+        for stat in snapshot.statistics("lineno")[:limit]
+    ]
+    if stop:
+        tracemalloc.stop()
+    return {"tracing": not stop, "traced_mb": round(current / 2**20, 2),
+            "traced_peak_mb": round(peak / 2**20, 2), "top": top_stats}
+
+def process_memory() -> Dict[str, Any]:
+    rss_mb = None
+    try:
+        with open("/proc/self/statm") as f:
+            rss_mb = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, IndexError):
+        pass
+    return {
+        "rss_mb": round(rss_mb, 1) if rss_mb is not None else None,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "threads": threading.active_count(),
+        "gc_counts": gc.get_count(),
+    }
+
+def model_footprint(model: Any) -> Dict[str, Any]:
+    """
+    Parameter + buffer bytes of a torch model (or a wrapper exposing one as
+    `.client`, like HuggingFaceEmbeddings), or the on-disk size of an ONNX
+    model directory (`.model_dir`).
+    """
+    if model is None:
+        return {"loaded": False}
+    target = getattr(model, "client", model)
+    size = None
+    if hasattr(target, "parameters"):
+        tensors = list(target.parameters()) + list(getattr(target, "buffers", lambda: [])())
+        size = sum(t.numel() * t.element_size() for t in tensors)
+    elif getattr(model, "model_dir", None):
+        size = sum(os.path.getsize(os.path.join(model.model_dir, f))
+                   for f in os.listdir(model.model_dir) if f.endswith(".onnx"))
+    return {"loaded": True, "type": type(model).__name__,
+            "mb": round(size / 2**20, 1) if size is not None else None}
+
+def faiss_footprint(index: Any) -> Dict[str, Any]:
+    if index is None:
+        return {"loaded": False}
+    ntotal, dim = int(index.ntotal), int(index.d)
+    return {"loaded": True, "type": type(index).__name__, "vectors": ntotal, "dim": dim,
+            "mb": round(ntotal * dim * 4 / 2**20, 1)}  # float32 storage of a flat index
+
+# ── Executors ────────────────────────────────────────
+
+def executor_depth(executor: Any) -> Dict[str, Any]:
+    """Queued work and worker counts of a concurrent.futures executor (None = not started yet)."""
+    if executor is None:
+        return {"started": False}
+    if hasattr(executor, "_work_queue"):  # ThreadPoolExecutor
+        return {"started": True, "max_workers": executor._max_workers,
+                "threads": len(executor._threads), "queued": executor._work_queue.qsize()}
+    pending = getattr(executor, "_pending_work_items", {})  # ProcessPoolExecutor
+    return {"started": True, "max_workers": executor._max_workers,
+            "processes": len(getattr(executor, "_processes", None) or {}), "pending": len(pending)}
+
+def threadpool_stats() -> Dict[str, Any]:
+    """Occupancy of the anyio pool behind run_in_threadpool; call from the event loop."""
+    from anyio.to_thread import current_default_thread_limiter
+
+    limiter = current_default_thread_limiter()
+    stats = limiter.statistics()
+    return {"max_threads": limiter.total_tokens, "busy": stats.borrowed_tokens,
+            "waiting": stats.tasks_waiting}
+
+# ── Readiness ────────────────────────────────────────
+
+class Readiness:
+    """
+    Named startup checks (models loaded, indexes opened). The service is
+    ready once all of them passed; `warm_up` runs the loaders in a
+    background thread, retrying failed ones with backoff.
+    """
+
+    def __init__(self, *checks: str):
+        self._ok = {name: False for name in checks}
+        self._errors: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.started_at = time.time()
+
+    def mark(self, name: str, ok: bool = True, error: Optional[str] = None) -> None:
+        with self._lock:
+            self._ok[name] = ok
+            if error:
+                self._errors[name] = error
+            else:
+                self._errors.pop(name, None)
+
+    @property
+    def ready(self) -> bool:
+        with self._lock:
+            return all(self._ok.values())
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"ready": all(self._ok.values()), "checks": dict(self._ok),
+                    "errors": dict(self._errors), "uptime_s": round(time.time() - self.started_at, 1)}
+
+    def _run(self, steps: Dict[str, Callable[[], Any]], retry_s: float) -> None:
+        for name, step in steps.items():
+            delay = retry_s
+            while not self._stop.is_set():
+                start = time.perf_counter()
+                try:
+                    step()
+                except Exception as e:
+                    logger.exception("Warm-up step %s failed; retrying in %.0fs", name, delay)
+                    self.mark(name, False, f"{type(e).__name__}: {e}")
+                    self._stop.wait(delay)
+                    delay = min(delay * 2, WARMUP_RETRY_MAX_S)
+                    continue
+                self.mark(name, True)
+                logger.info("Warm-up step %s done in %.1fs", name, time.perf_counter() - start)
+                break
+
+    def warm_up(self, steps: Dict[str, Callable[[], Any]], retry_s: float = 5.0) -> threading.Thread:
+        thread = threading.Thread(target=self._run, args=(steps, retry_s), name="warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self) -> None:
+        self._stop.set()
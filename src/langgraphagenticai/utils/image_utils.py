@@ -1,12 +1,14 @@
 import os
 import io
 import logging
-from typing import List, Union, Tuple
+from typing import BinaryIO, List, Union, Tuple
 from PIL import Image
 import numpy as np
 import faiss
 from sentence_transformers import SentenceTransformer
 
+from langgraphagenticai.utils.onnx_utils import load_quantized_clip, use_onnx
+
 logger = logging.getLogger(__name__)
 
 # ── Configuration ────────────────────────────────────
@@ -15,12 +17,18 @@ SUPPORTED_FORMATS = ('.png', '.jpg', '.jpeg', '.webp')
 MAX_SIZE_MB      = 10        # 10 MB
 MAX_PIXELS       = 20_000_000  # ~20 MP
 CLIP_MODEL       = 'clip-ViT-B-32'
+SUPPORTED_PIL    = ('JPEG', 'PNG', 'WEBP')
+
+# A path on disk, or an open binary file (e.g. a spooled upload)
+ImageSource = Union[str, BinaryIO]
 
 # ── Paths & embedding model singletons ───────────────
 
 _clip = None
 def get_clip_model() -> SentenceTransformer:
     global _clip
+    if _clip is None and use_onnx():
+        _clip = load_quantized_clip(CLIP_MODEL)  # None → fp32 fallback
     if _clip is None:
         _clip = SentenceTransformer(CLIP_MODEL)
     return _clip
@@ -36,21 +44,40 @@ def get_image_paths(folder: str) -> List[str]:
                 paths.append(os.path.join(root, f))
     return paths
 
-def validate_image(path: str) -> bool:
+def open_image(src: ImageSource) -> Image.Image:
+    """Open a path or rewind-and-open a binary file object."""
+    if isinstance(src, str):
+        return Image.open(src)
+    src.seek(0)
+    return Image.open(src)
+
+def _source_size(src: ImageSource) -> int:
+    if isinstance(src, str):
+        return os.path.getsize(src)
+    src.seek(0, os.SEEK_END)
+    size = src.tell()
+    src.seek(0)
+    return size
+
+def validate_image(path: ImageSource) -> bool:
     """Check existence, size, format, resolution."""
     try:
-        if not os.path.exists(path):
-            logger.error(f"File not found: {path}")
-            return False
-        size = os.path.getsize(path)
+        if isinstance(path, str):
+            if not os.path.exists(path):
+                logger.error(f"File not found: {path}")
+                return False
+            ext = os.path.splitext(path)[1].lower()
+            if ext not in SUPPORTED_FORMATS:
+                logger.error(f"Unsupported format: {ext}")
+                return False
+        size = _source_size(path)
         if size > MAX_SIZE_MB * 1024**2:
             logger.error(f"Image too big ({size} bytes)")
             return False
-        ext = os.path.splitext(path)[1].lower()
-        if ext not in SUPPORTED_FORMATS:
-            logger.error(f"Unsupported format: {ext}")
-            return False
-        with Image.open(path) as img:
+        with open_image(path) as img:
+            if not isinstance(path, str) and img.format not in SUPPORTED_PIL:
+                logger.error(f"Unsupported format: {img.format}")
+                return False
             w, h = img.size
             if w * h > MAX_PIXELS:
                 logger.error(f"Resolution too high: {w}×{h}")
@@ -60,12 +87,12 @@ def validate_image(path: str) -> bool:
         logger.error(f"Validation error: {e}")
         return False
 
-def optimize_image(path: str) -> Union[bytes, None]:
+def optimize_image(path: ImageSource) -> Union[bytes, None]:
     """
     Downsample if >4 MP, convert to JPEG, return raw bytes.
     """
     try:
-        with Image.open(path) as img:
+        with open_image(path) as img:
             w, h = img.size
             if w * h > 4_000_000:
                 img.thumbnail((2000, 2000))
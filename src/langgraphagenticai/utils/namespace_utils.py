@@ -0,0 +1,234 @@
+import os
+import re
+import hmac
+import time
+import sqlite3
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# ── Configuration ────────────────────────────────────
+
+NAMESPACE_DB          = os.getenv("NAMESPACE_DB", "/tmp/namespaces.db")
+NAMESPACE_PREFIX      = "t-"                                           # only these are ever evicted/compacted
+DEFAULT_TENANT        = os.getenv("DEFAULT_TENANT", "public")
+NAMESPACE_TTL_S       = float(os.getenv("NAMESPACE_TTL_HOURS", "72")) * 3600
+NAMESPACE_MAX_VECTORS = int(os.getenv("NAMESPACE_MAX_VECTORS", "500000"))  # across all tenants
+TOUCH_INTERVAL_S      = 60                                             # coalesce last-used writes
+NAMESPACE_COMPACT     = os.getenv("NAMESPACE_COMPACT", "0") == "1"     # retry deletes of evicted namespaces
+TENANT_TOKENS         = os.getenv("TENANT_TOKENS", "")                 # "tenant=token,tenant2=token2"
+
+_TENANT_RE = re.compile(r"^[a-z0-9][a-z0-9_-]{0,47}$")
+
+class InvalidTenant(ValueError):
+    """Raised for tenant ids that can't be used in a namespace name."""
+
+# ── Naming ───────────────────────────────────────────
+
+def normalize_tenant(tenant: Optional[str]) -> str:
+    tenant = (tenant or DEFAULT_TENANT).strip().lower()
+    if not _TENANT_RE.match(tenant):
+        raise InvalidTenant("Tenant id must be 1-48 chars of a-z, 0-9, '_' or '-'")
+    return tenant
+
+def tenant_namespace(tenant: Optional[str]) -> str:
+    """Namespace holding every document a tenant ingested in the background."""
+    return f"{NAMESPACE_PREFIX}{normalize_tenant(tenant)}"
+
+def document_namespace(tenant: Optional[str], doc_key: str) -> str:
+    """Namespace for one tenant's single document (ingest-and-ask requests)."""
+    return f"{tenant_namespace(tenant)}--{doc_key}"
+
+def namespace_tenant(namespace: str) -> Optional[str]:
+    if not namespace.startswith(NAMESPACE_PREFIX):
+        return None
+    return namespace[len(NAMESPACE_PREFIX):].split("--", 1)[0]
+
+# ── Tenant credentials ───────────────────────────────
+
+def parse_tenant_tokens(spec: str = TENANT_TOKENS) -> Dict[str, str]:
+    """`"acme=tok1,beta=tok2"` → {"tok1": "acme", "tok2": "beta"}."""
+    tokens = {}
+    for pair in filter(None, (p.strip() for p in spec.split(","))):
+        tenant, _, token = pair.partition("=")
+        if not token:
+            raise ValueError(f"TENANT_TOKENS entry {tenant!r} has no token")
+        tokens[token.strip()] = normalize_tenant(tenant)
+    return tokens
+
+def tenant_for_token(authorization: Optional[str], tokens: Dict[str, str]) -> Optional[str]:
+    """The tenant whose token is presented as `Authorization: Bearer <token>`, if any."""
+    if not authorization or not authorization.startswith("Bearer "):
+        return None
+    presented = authorization[len("Bearer "):].encode()
+    match = None
+    for token, tenant in tokens.items():  # compare against every token: no early exit to time
+        if hmac.compare_digest(presented, token.encode()):
+            match = tenant
+    return match
+
+# ── Registry ─────────────────────────────────────────
+
+class NamespaceRegistry:
+    """
+    Which namespaces exist, what is in them and when they were last used,
+    in SQLite. Size is accounted per (namespace, document), so re-ingesting
+    the same PDF replaces its count instead of adding to it. Removed
+    namespaces leave a tombstone until their data is confirmed gone.
+    """
+
+    def __init__(self, path: str = NAMESPACE_DB, clock: Callable[[], float] = time.time):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        with self._db:
+            self._db.executescript("""
+                CREATE TABLE IF NOT EXISTS namespaces (
+                    name TEXT PRIMARY KEY,
+                    tenant TEXT,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS namespace_docs (
+                    namespace TEXT NOT NULL,
+                    doc_key TEXT NOT NULL,
+                    vectors INTEGER NOT NULL,
+                    chars INTEGER NOT NULL,
+                    PRIMARY KEY (namespace, doc_key)
+                );
+                CREATE TABLE IF NOT EXISTS removed_namespaces (
+                    name TEXT PRIMARY KEY,
+                    removed_at REAL NOT NULL
+                );""")
+
+    def register(self, namespace: str) -> None:
+        """Record the namespace (before anything is upserted, so compaction never sees it as orphaned)."""
+        now = self._clock()
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO namespaces (name, tenant, created_at, last_used_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET last_used_at = excluded.last_used_at",
+                (namespace, namespace_tenant(namespace), now, now),
+            )
+            self._db.execute("DELETE FROM removed_namespaces WHERE name = ?", (namespace,))
+
+    def record_document(self, namespace: str, doc_key: str, vectors: int, chars: int) -> None:
+        self.register(namespace)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO namespace_docs (namespace, doc_key, vectors, chars) VALUES (?, ?, ?, ?)",
+                (namespace, doc_key, vectors, chars),
+            )
+
+    def touch(self, namespace: str) -> None:
+        now = self._clock()
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE namespaces SET last_used_at = ? WHERE name = ? AND last_used_at < ?",
+                (now, namespace, now - TOUCH_INTERVAL_S),
+            )
+
+    def remove(self, namespace: str) -> None:
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM namespace_docs WHERE namespace = ?", (namespace,))
+            self._db.execute("DELETE FROM namespaces WHERE name = ?", (namespace,))
+            self._db.execute("INSERT OR REPLACE INTO removed_namespaces (name, removed_at) VALUES (?, ?)",
+                             (namespace, self._clock()))
+
+    def removed(self) -> List[str]:
+        """Namespaces this registry removed whose data may not be gone yet."""
+        with self._lock:
+            return [r[0] for r in self._db.execute("SELECT name FROM removed_namespaces")]
+
+    def forget_removed(self, names: Iterable[str]) -> None:
+        with self._lock, self._db:
+            self._db.executemany("DELETE FROM removed_namespaces WHERE name = ?", [(n,) for n in names])
+
+    def usage(self, tenant: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Namespaces with their size, least recently used first."""
+        sql = """
+            SELECT n.name, n.tenant, n.created_at, n.last_used_at,
+                   COUNT(d.doc_key) AS docs,
+                   COALESCE(SUM(d.vectors), 0) AS vectors,
+                   COALESCE(SUM(d.chars), 0) AS chars
+            FROM namespaces n LEFT JOIN namespace_docs d ON d.namespace = n.name
+            {where}
+            GROUP BY n.name ORDER BY n.last_used_at"""
+        with self._lock:
+            if tenant is None:
+                rows = self._db.execute(sql.format(where="")).fetchall()
+            else:
+                rows = self._db.execute(sql.format(where="WHERE n.tenant = ?"), (tenant,)).fetchall()
+        return [dict(r) for r in rows]
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return [r[0] for r in self._db.execute("SELECT name FROM namespaces")]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+# ── Eviction & compaction ────────────────────────────
+
+def select_evictions(usage: List[Dict[str, Any]], now: float, ttl_s: float = NAMESPACE_TTL_S,
+                     max_vectors: int = NAMESPACE_MAX_VECTORS) -> List[str]:
+    """
+    Managed namespaces to drop: every one idle for longer than `ttl_s`, then
+    the least recently used until the total vector count fits `max_vectors`.
+    `usage` must be ordered least recently used first.
+    """
+    usage = [u for u in usage if u["name"].startswith(NAMESPACE_PREFIX)]
+    evict = [u["name"] for u in usage if now - u["last_used_at"] > ttl_s]
+    total = sum(u["vectors"] for u in usage if u["name"] not in evict)
+    for u in usage:
+        if total <= max_vectors:
+            break
+        if u["name"] not in evict:
+            evict.append(u["name"])
+            total -= u["vectors"]
+    return evict
+
+def evict_namespaces(registry: NamespaceRegistry, delete: Callable[[str], None],
+                     ttl_s: float = NAMESPACE_TTL_S, max_vectors: int = NAMESPACE_MAX_VECTORS,
+                     now: Optional[float] = None) -> List[str]:
+    """Delete cold namespaces' data via `delete(namespace)`, then forget them."""
+    now = time.time() if now is None else now
+    evicted = []
+    for name in select_evictions(registry.usage(), now, ttl_s, max_vectors):
+        try:
+            delete(name)
+        except Exception:
+            logger.exception("Failed to evict namespace %s", name)
+            continue
+        registry.remove(name)
+        evicted.append(name)
+    if evicted:
+        logger.info("Evicted %d namespace(s): %s", len(evicted), evicted)
+    return evicted
+
+def find_orphans(live: Iterable[str], registry: NamespaceRegistry) -> List[str]:
+    """
+    Managed namespaces that still hold data although this registry removed
+    them (e.g. an eviction whose delete didn't fully land). Namespaces the
+    registry has simply never seen are NOT orphans: the registry is local to
+    one machine and may be new, so absence proves nothing.
+    """
+    removed = set(registry.removed())
+    return sorted(ns for ns in live if ns.startswith(NAMESPACE_PREFIX) and ns in removed)
+
+# ── Shared instance ──────────────────────────────────
+
+_registry: Optional[NamespaceRegistry] = None
+_registry_lock = threading.Lock()
+
+def get_namespace_registry() -> NamespaceRegistry:
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = NamespaceRegistry()
+        return _registry
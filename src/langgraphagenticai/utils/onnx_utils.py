@@ -0,0 +1,295 @@
+import os
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from langgraphagenticai.utils.context_utils import cosine
+
+logger = logging.getLogger(__name__)
+
+# ── Configuration ────────────────────────────────────
+
+# "torch" (sentence-transformers, fp32) or "onnx-int8" (ONNX Runtime, dynamic int8)
+EMBEDDING_BACKEND     = os.getenv("EMBEDDING_BACKEND", "torch").lower()
+ONNX_MODEL_DIR        = os.getenv("ONNX_MODEL_DIR", "/tmp/onnx_models")
+ONNX_THREADS          = int(os.getenv("ONNX_THREADS", "0"))             # 0 = ORT default
+ONNX_RECALL_TOLERANCE = float(os.getenv("ONNX_RECALL_TOLERANCE", "0.02"))
+ONNX_OPSET            = 14
+CLIP_HF_MODEL         = "openai/clip-vit-base-patch32"  # weights behind clip-ViT-B-32
+
+def use_onnx() -> bool:
+    return EMBEDDING_BACKEND == "onnx-int8"
+
+# ── Recall check ─────────────────────────────────────
+
+# (query, passage) pairs on unrelated topics; passage i answers query i
+TEXT_PROBES = [
+    ("How do I reset my account password?", "To change a forgotten password, open the login page and follow the reset link sent by email."),
+    ("What causes a paper jam in the printer?", "Misaligned sheets in the tray and worn feed rollers are the usual reasons paper gets stuck."),
+    ("When was the Eiffel Tower built?", "The iron lattice tower in Paris was completed in 1889 for the World's Fair."),
+    ("How much water should adults drink daily?", "Health guidelines suggest roughly two to three litres of fluid per day for grown-ups."),
+    ("Which planet is known as the red planet?", "Mars appears reddish because iron oxide dust covers much of its surface."),
+    ("How do transformers use attention?", "Self-attention lets each token weigh every other token when building its representation."),
+    ("What is the refund policy for subscriptions?", "Annual plans can be cancelled within 30 days for a full reimbursement of the fee."),
+    ("How do I bake sourdough bread?", "Mix starter, flour, water and salt, let the dough ferment overnight, then bake in a hot oven."),
+    ("Why is the sky blue?", "Air molecules scatter short blue wavelengths of sunlight more strongly than red ones."),
+    ("How can I speed up a slow database query?", "Adding an index on the filtered columns avoids full table scans and cuts response time."),
+    ("What are symptoms of dehydration?", "Thirst, dark urine, dizziness and fatigue indicate the body is short of fluids."),
+    ("Who painted the Mona Lisa?", "Leonardo da Vinci painted the famous portrait in the early sixteenth century."),
+]
+
+# solid-colour swatches and their captions for the CLIP image/text check
+COLOUR_PROBES = {
+    "red": (220, 30, 30), "green": (30, 170, 60), "blue": (30, 60, 220), "yellow": (240, 220, 40),
+    "black": (10, 10, 10), "white": (250, 250, 250), "orange": (250, 140, 20), "purple": (130, 40, 170),
+}
+
+Vectors = Sequence[Sequence[float]]
+
+def recall_at_k(query_vecs: Vectors, doc_vecs: Vectors, relevant: Sequence[int], k: int = 1) -> float:
+    """Share of queries whose relevant document is among the k most similar."""
+    hits = 0
+    for q, rel in zip(query_vecs, relevant):
+        ranked = sorted(range(len(doc_vecs)), key=lambda i: cosine(q, doc_vecs[i]), reverse=True)
+        hits += rel in ranked[:k]
+    return hits / len(relevant) if relevant else 0.0
+
+def compare_recall(reference: Tuple[Vectors, Vectors], candidate: Tuple[Vectors, Vectors],
+                   relevant: Sequence[int], k: int = 1,
+                   tolerance: float = ONNX_RECALL_TOLERANCE) -> Dict[str, Any]:
+    """
+    Recall@k of the candidate (int8) embeddings against the reference (fp32)
+    ones on the same probes, plus how closely the document vectors agree.
+    `ok` is False when the candidate loses more than `tolerance` recall.
+    """
+    ref = recall_at_k(reference[0], reference[1], relevant, k)
+    cand = recall_at_k(candidate[0], candidate[1], relevant, k)
+    agreement = [cosine(a, b) for a, b in zip(reference[1], candidate[1])]
+    return {
+        "k": k,
+        "reference_recall": ref,
+        "candidate_recall": cand,
+        "min_cosine_to_reference": min(agreement) if agreement else 0.0,
+        "ok": cand >= ref - tolerance,
+    }
+
+def _verified(model_dir: str, verify: Callable[[], Dict[str, Any]]) -> bool:
+    """Run the recall check once per exported model and remember the verdict."""
+    path = os.path.join(model_dir, "recall.json")
+    if os.path.exists(path):
+        with open(path) as f:
+            result = json.load(f)
+    else:
+        result = verify()
+        with open(path, "w") as f:
+            json.dump(result, f, indent=2)
+    logger.info("int8 recall check for %s: %s", model_dir, result)
+    return bool(result.get("ok"))
+
+# ── ONNX Runtime plumbing ────────────────────────────
+
+def _model_dir(model_id: str) -> str:
+    return os.path.join(ONNX_MODEL_DIR, model_id.replace("/", "__"))
+
+def _quantize(src: str, dst: str) -> None:
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    quantize_dynamic(src, dst, weight_type=QuantType.QInt8)
+    os.remove(src)  # only the int8 graph is served
+
+def _session(path: str):
+    import onnxruntime as ort
+    opts = ort.SessionOptions()
+    if ONNX_THREADS:
+        opts.intra_op_num_threads = ONNX_THREADS
+    return ort.InferenceSession(path, opts, providers=["CPUExecutionProvider"])
+
+def _load(model_id: str, export: Callable[[str], None], build: Callable[[str], Any],
+          verify: Callable[[Any], Dict[str, Any]]) -> Optional[Any]:
+    """Export + quantize on first use, check recall, or return None to fall back to fp32."""
+    model_dir = _model_dir(model_id)
+    try:
+        if not os.path.exists(os.path.join(model_dir, "done")):
+            os.makedirs(model_dir, exist_ok=True)
+            logger.info("Exporting %s to int8 ONNX in %s", model_id, model_dir)
+            export(model_dir)
+            open(os.path.join(model_dir, "done"), "w").close()
+        model = build(model_dir)
+        if not _verified(model_dir, lambda: verify(model)):
+            logger.warning("int8 %s lost too much recall; using fp32", model_id)
+            return None
+        return model
+    except Exception:
+        logger.exception("ONNX int8 backend for %s unavailable; using fp32", model_id)
+        return None
+
+# ── MiniLM text embeddings ───────────────────────────
+
+def export_text_model(model_id: str, out_dir: str) -> None:
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(model_id)
+    model = AutoModel.from_pretrained(model_id).eval()
+    tokenizer.save_pretrained(out_dir)
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    fp32 = os.path.join(out_dir, "model.onnx")
+    axes = {0: "batch", 1: "seq"}
+    with torch.no_grad():
+        torch.onnx.export(
+            model, (sample["input_ids"], sample["attention_mask"]), fp32,
+            input_names=["input_ids", "attention_mask"], output_names=["last_hidden_state"],
+            dynamic_axes={"input_ids": axes, "attention_mask": axes, "last_hidden_state": axes},
+            opset_version=ONNX_OPSET,
+        )
+    _quantize(fp32, os.path.join(out_dir, "model.int8.onnx"))
+
+class OnnxTextEmbeddings:
+    """
+    Drop-in for HuggingFaceEmbeddings (embed_documents / embed_query) running
+    the int8 graph: mean pooling over the attention mask, then L2
+    normalisation, as the sentence-transformers pipeline does.
+    """
+
+    def __init__(self, model_dir: str, batch_size: int = 32, max_length: int = 256):
+        from transformers import AutoTokenizer
+        self.model_dir = model_dir
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.session = _session(os.path.join(model_dir, "model.int8.onnx"))
+        self.batch_size = batch_size
+        self.max_length = max_length
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        import numpy as np
+
+        out: List[List[float]] = []
+        for i in range(0, len(texts), self.batch_size):
+            enc = self.tokenizer(texts[i:i + self.batch_size], padding=True, truncation=True,
+                                 max_length=self.max_length, return_tensors="np")
+            mask = enc["attention_mask"].astype("int64")
+            hidden = self.session.run(None, {"input_ids": enc["input_ids"].astype("int64"),
+                                             "attention_mask": mask})[0]
+            weights = mask[..., None].astype("float32")
+            pooled = (hidden * weights).sum(axis=1) / np.clip(weights.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            out.extend(pooled.tolist())
+        return out
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._encode(list(texts))
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._encode([text])[0]
+
+def _verify_text(model_id: str, model: OnnxTextEmbeddings) -> Dict[str, Any]:
+    from sentence_transformers import SentenceTransformer
+
+    queries = [q for q, _ in TEXT_PROBES]
+    docs = [d for _, d in TEXT_PROBES]
+    ref = SentenceTransformer(model_id)
+    reference = (ref.encode(queries, normalize_embeddings=True).tolist(),
+                 ref.encode(docs, normalize_embeddings=True).tolist())
+    candidate = (model.embed_documents(queries), model.embed_documents(docs))
+    return compare_recall(reference, candidate, list(range(len(docs))))
+
+def load_quantized_text_model(model_id: str) -> Optional[OnnxTextEmbeddings]:
+    return _load(model_id,
+                 export=lambda d: export_text_model(model_id, d),
+                 build=OnnxTextEmbeddings,
+                 verify=lambda m: _verify_text(model_id, m))
+
+# ── CLIP image / text features ───────────────────────
+
+def export_clip_model(out_dir: str, hf_model: str = CLIP_HF_MODEL) -> None:
+    import torch
+    from transformers import CLIPModel, CLIPProcessor
+
+    model = CLIPModel.from_pretrained(hf_model).eval()
+    processor = CLIPProcessor.from_pretrained(hf_model)
+    processor.save_pretrained(out_dir)
+
+    class Tower(torch.nn.Module):
+        def __init__(self, clip):
+            super().__init__()
+            self.clip = clip
+
+    class ImageTower(Tower):
+        def forward(self, pixel_values):
+            return self.clip.get_image_features(pixel_values=pixel_values)
+
+    class TextTower(Tower):
+        def forward(self, input_ids, attention_mask):
+            return self.clip.get_text_features(input_ids=input_ids, attention_mask=attention_mask)
+
+    text = processor.tokenizer(["export sample"], return_tensors="pt")
+    with torch.no_grad():
+        torch.onnx.export(
+            ImageTower(model), (torch.zeros(1, 3, 224, 224),), os.path.join(out_dir, "image.onnx"),
+            input_names=["pixel_values"], output_names=["image_embeds"],
+            dynamic_axes={"pixel_values": {0: "batch"}, "image_embeds": {0: "batch"}},
+            opset_version=ONNX_OPSET,
+        )
+        torch.onnx.export(
+            TextTower(model), (text["input_ids"], text["attention_mask"]), os.path.join(out_dir, "text.onnx"),
+            input_names=["input_ids", "attention_mask"], output_names=["text_embeds"],
+            dynamic_axes={"input_ids": {0: "batch", 1: "seq"}, "attention_mask": {0: "batch", 1: "seq"},
+                          "text_embeds": {0: "batch"}},
+            opset_version=ONNX_OPSET,
+        )
+    _quantize(os.path.join(out_dir, "image.onnx"), os.path.join(out_dir, "image.int8.onnx"))
+    _quantize(os.path.join(out_dir, "text.onnx"), os.path.join(out_dir, "text.int8.onnx"))
+
+class OnnxClip:
+    """
+    The slice of SentenceTransformer("clip-ViT-B-32").encode() we use: PIL
+    images and/or strings in, unnormalised projected features out (a 1-D
+    array for a single input, 2-D for a list).
+    """
+
+    def __init__(self, model_dir: str):
+        from transformers import CLIPProcessor
+        self.model_dir = model_dir
+        self.processor = CLIPProcessor.from_pretrained(model_dir)
+        self.image_session = _session(os.path.join(model_dir, "image.int8.onnx"))
+        self.text_session = _session(os.path.join(model_dir, "text.int8.onnx"))
+
+    def encode(self, items, normalize_embeddings: bool = False, **_):
+        import numpy as np
+
+        single = not isinstance(items, (list, tuple))
+        items = [items] if single else list(items)
+        texts = [i for i, x in enumerate(items) if isinstance(x, str)]
+        images = [i for i, x in enumerate(items) if not isinstance(x, str)]
+        out: List[Any] = [None] * len(items)
+        if images:
+            pixels = self.processor(images=[items[i] for i in images], return_tensors="np")["pixel_values"]
+            feats = self.image_session.run(None, {"pixel_values": pixels.astype("float32")})[0]
+            for i, f in zip(images, feats):
+                out[i] = f
+        if texts:
+            enc = self.processor.tokenizer([items[i] for i in texts], padding=True, truncation=True,
+                                           max_length=77, return_tensors="np")
+            feats = self.text_session.run(None, {"input_ids": enc["input_ids"].astype("int64"),
+                                                 "attention_mask": enc["attention_mask"].astype("int64")})[0]
+            for i, f in zip(texts, feats):
+                out[i] = f
+        arr = np.stack(out).astype("float32")
+        if normalize_embeddings:
+            arr /= np.clip(np.linalg.norm(arr, axis=1, keepdims=True), 1e-12, None)
+        return arr[0] if single else arr
+
+def _verify_clip(model_id: str, model: OnnxClip) -> Dict[str, Any]:
+    from PIL import Image
+    from sentence_transformers import SentenceTransformer
+
+    captions = [f"a plain {name} square" for name in COLOUR_PROBES]
+    swatches = [Image.new("RGB", (224, 224), rgb) for rgb in COLOUR_PROBES.values()]
+    ref = SentenceTransformer(model_id)
+    reference = (ref.encode(captions).tolist(), ref.encode(swatches).tolist())
+    candidate = (model.encode(captions).tolist(), model.encode(swatches).tolist())
+    return compare_recall(reference, candidate, list(range(len(captions))))
+
+def load_quantized_clip(model_id: str) -> Optional[OnnxClip]:
+    return _load(model_id,
+                 export=export_clip_model,
+                 build=OnnxClip,
+                 verify=lambda m: _verify_clip(model_id, m))
@@ -1,23 +1,172 @@
+import os
+import logging
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
 import fitz  # PyMuPDF
-from typing import List
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema import Document
 
-def load_and_split_pdf(
-    pdf_path: str,
-    chunk_size: int = 1000,
-    chunk_overlap: int = 150
-) -> List[Document]:
+from langgraphagenticai.utils.diagnostics import executor_depth
+
+logger = logging.getLogger(__name__)
+
+# ── Configuration ────────────────────────────────────
+
+PDF_EXTRACT_WORKERS    = int(os.getenv("PDF_EXTRACT_WORKERS", str(os.cpu_count() or 1)))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "64"))
+PDF_PROGRESS_EVERY     = 16   # pages between progress reports on the serial path
+
+PdfSource = Union[str, bytes]
+PageProgress = Callable[[int, int], None]  # (pages parsed so far, page count)
+
+def open_pdf(pdf: PdfSource) -> fitz.Document:
+    """Open a PDF from a path, or straight from in-memory bytes."""
+    if isinstance(pdf, (bytes, bytearray)):
+        return fitz.open(stream=pdf, filetype="pdf")
+    return fitz.open(pdf)
+
+# ── Process pool ─────────────────────────────────────
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+def get_extraction_pool(workers: int = PDF_EXTRACT_WORKERS) -> ProcessPoolExecutor:
     """
-    Read a PDF from disk, extract all text, split into overlapping chunks,
-    and wrap each chunk in a LangChain Document.
+    Shared process pool for text extraction. "spawn" keeps MuPDF state out
+    of forked children; workers stay alive across documents.
     """
-    doc = fitz.open(pdf_path)
-    full_text = "\n".join(page.get_text() for page in doc)
-    
+    global _pool, _pool_workers
+    with _pool_lock:
+        # a worker killed mid-task (e.g. OOM on a huge PDF) leaves the pool broken for good
+        if _pool is None or _pool_workers != workers or getattr(_pool, "_broken", False):
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=workers,
+                                        mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = workers
+        return _pool
+
+def shutdown_extraction_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+def extraction_pool_stats() -> Dict[str, Any]:
+    with _pool_lock:
+        return executor_depth(_pool)
+
+def _extract_range(pdf: PdfSource, start: int, stop: int) -> List[str]:
+    # runs in a worker process: each worker opens the document itself
+    with open_pdf(pdf) as doc:
+        return [doc[i].get_text() for i in range(start, stop)]
+
+def _page_ranges(page_count: int, parts: int) -> List[Tuple[int, int]]:
+    step = -(-page_count // parts)  # ceil
+    return [(s, min(s + step, page_count)) for s in range(0, page_count, step)]
+
+def _submit(pool: ProcessPoolExecutor, pdf: PdfSource, page_count: int, workers: int) -> List[Future]:
+    if page_count < PDF_PARALLEL_MIN_PAGES:
+        return [pool.submit(_extract_range, pdf, 0, page_count)]
+    # bytes are pickled per task, so keep one range per worker for them
+    parts = workers if isinstance(pdf, (bytes, bytearray)) else workers * 2
+    return [pool.submit(_extract_range, pdf, s, e) for s, e in _page_ranges(page_count, parts)]
+
+# ── Extraction ───────────────────────────────────────
+
+def extract_pages(pdf: PdfSource, workers: Optional[int] = None,
+                  on_progress: Optional[PageProgress] = None) -> List[str]:
+    """
+    Text of every page, in order. Documents with at least
+    PDF_PARALLEL_MIN_PAGES pages (and more than one worker) are split into
+    page ranges extracted across the process pool; smaller ones stay serial
+    in this process, where pool overhead would outweigh the gain.
+    `on_progress(parsed, page_count)` is called as pages (or, in parallel,
+    whole ranges, in completion order) are done.
+    """
+    workers = workers or PDF_EXTRACT_WORKERS
+    with open_pdf(pdf) as doc:
+        page_count = doc.page_count
+        if on_progress:
+            on_progress(0, page_count)
+        if workers <= 1 or page_count < PDF_PARALLEL_MIN_PAGES:
+            pages = []
+            for page in doc:
+                pages.append(page.get_text())
+                if on_progress and (len(pages) % PDF_PROGRESS_EVERY == 0 or len(pages) == page_count):
+                    on_progress(len(pages), page_count)
+            return pages
+
+    logger.info("Extracting %d pages with %d workers", page_count, workers)
+    futures = _submit(get_extraction_pool(workers), pdf, page_count, workers)
+    if on_progress:
+        parsed = 0
+        for future in as_completed(futures):
+            parsed += len(future.result())
+            on_progress(parsed, page_count)
+    return [text for f in futures for text in f.result()]
+
+Extracted = Tuple[str, Optional[List[str]], Optional[Exception]]
+
+def _collect(path: str, futures: List[Future], error: Optional[Exception]) -> Extracted:
+    if error is None:
+        try:
+            return path, [text for f in futures for text in f.result()], None
+        except Exception as e:
+            error = e
+    logger.warning("Could not extract %s: %s", path, error)
+    return path, None, error
+
+def extract_many(paths: Sequence[str], workers: Optional[int] = None,
+                 window: Optional[int] = None) -> Iterator[Extracted]:
+    """
+    Extract several PDFs through the shared pool: small files are one task
+    each, large ones are split by page range. At most `window` documents
+    are in flight so memory stays bounded. Yields (path, pages, None) in
+    input order, or (path, None, error) for a file that could not be read,
+    so one corrupt PDF doesn't end the run.
+    """
+    workers = workers or PDF_EXTRACT_WORKERS
+    window = window or workers * 2
+    pending: Deque[Tuple[str, List[Future], Optional[Exception]]] = deque()
+    for path in paths:
+        try:
+            with open_pdf(path) as doc:
+                page_count = doc.page_count
+            pending.append((path, _submit(get_extraction_pool(workers), path, page_count, workers), None))
+        except Exception as e:
+            pending.append((path, [], e))
+        if len(pending) >= window:
+            yield _collect(*pending.popleft())
+    while pending:
+        yield _collect(*pending.popleft())
+
+# ── Chunking ─────────────────────────────────────────
+
+def split_text(full_text: str, chunk_size: int = 1000, chunk_overlap: int = 150) -> List[Document]:
     splitter = RecursiveCharacterTextSplitter(
         chunk_size=chunk_size,
         chunk_overlap=chunk_overlap
     )
     chunks = splitter.split_text(full_text)
     return [Document(page_content=chunk) for chunk in chunks]
+
+def load_and_split_pdf(
+    pdf_path: PdfSource,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 150,
+    workers: Optional[int] = None,
+) -> List[Document]:
+    """
+    Read a PDF (from disk, or from bytes already in memory), extract all
+    text, split into overlapping chunks, and wrap each chunk in a
+    LangChain Document.
+    """
+    full_text = "\n".join(extract_pages(pdf_path, workers))
+    return split_text(full_text, chunk_size, chunk_overlap)
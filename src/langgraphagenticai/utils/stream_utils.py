@@ -0,0 +1,97 @@
+import json
+import queue
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+TokenSink = Callable[[str], None]
+
+_DONE = object()
+
+logger = logging.getLogger(__name__)
+
+class StreamInterrupted(RuntimeError):
+    """A stream failed after some of its tokens already reached the client."""
+
+# ── Graph config plumbing ────────────────────────────
+
+def get_token_sink(config: Optional[Dict[str, Any]]) -> Optional[TokenSink]:
+    """
+    Pull the `on_token` callback out of a LangGraph/Runnable config, if the
+    caller asked for streaming. Nodes fall back to blocking calls otherwise.
+    """
+    if not config:
+        return None
+    return (config.get("configurable") or {}).get("on_token")
+
+def emit_all(tokens: Iterable[str], on_token: Optional[TokenSink]) -> str:
+    """
+    Forward each token to `on_token` (if any) and return the joined text.
+    A failure after tokens went out is raised as StreamInterrupted: the
+    partial answer can't be taken back, so nodes must not fall back to
+    another answer on top of it.
+    """
+    parts = []
+    try:
+        for tok in tokens:
+            if not tok:
+                continue
+            parts.append(tok)
+            if on_token:
+                on_token(tok)
+    except Exception as e:
+        if on_token and parts:
+            raise StreamInterrupted(f"stream failed after {len(parts)} tokens") from e
+        raise
+    return "".join(parts)
+
+# ── Callback → iterator bridge ───────────────────────
+
+def iter_tokens(run: Callable[[TokenSink], Any], timeout: Optional[float] = None) -> Iterator[str]:
+    """
+    Run `run(on_token)` in a worker thread and yield tokens as it emits them.
+    Exceptions raised by `run` are re-raised in the consuming thread once
+    the tokens produced before the failure have been yielded.
+    """
+    q: "queue.Queue[Any]" = queue.Queue()
+    error: Dict[str, BaseException] = {}
+
+    def worker():
+        try:
+            run(q.put)
+        except BaseException as e:  # surfaced to the consumer below
+            error["exc"] = e
+        finally:
+            q.put(_DONE)
+
+    threading.Thread(target=worker, name="token-stream", daemon=True).start()
+    while True:
+        item = q.get(timeout=timeout)
+        if item is _DONE:
+            break
+        yield item
+    if "exc" in error:
+        raise error["exc"]
+
+# ── Server-Sent Events ───────────────────────────────
+
+def sse_event(data: Any, event: Optional[str] = None) -> str:
+    """Format one SSE frame; `data` is JSON-encoded so newlines are safe."""
+    frame = f"event: {event}\n" if event else ""
+    return frame + f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def to_sse(tokens: Iterable[str], error_message: str = "Streaming failed") -> Iterator[str]:
+    """
+    Wrap a token iterator as SSE frames: one `token` frame per chunk, then a
+    `done` frame carrying the full text, or an `error` frame on failure.
+    """
+    parts = []
+    try:
+        for tok in tokens:
+            parts.append(tok)
+            yield sse_event({"token": tok})
+    except Exception:
+        logger.exception("Token stream failed")
+        yield sse_event({"detail": error_message}, event="error")
+        return
+    yield sse_event({"output": "".join(parts)}, event="done")
@@ -0,0 +1,149 @@
+import os
+import json
+import hashlib
+import logging
+import tempfile
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# ── Configuration ────────────────────────────────────
+
+UPLOAD_CHUNK_BYTES = 1024 * 1024                                   # read 1 MiB at a time
+UPLOAD_SPOOL_BYTES = int(os.getenv("UPLOAD_SPOOL_MB", "8")) * 1024 * 1024  # then roll to disk
+MAX_PDF_BYTES      = int(os.getenv("MAX_PDF_UPLOAD_MB", "50")) * 1024 * 1024
+MULTIPART_SLACK    = 64 * 1024                                     # form fields + boundaries
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds its size limit while being streamed."""
+
+    def __init__(self, limit: int):
+        super().__init__(f"Upload exceeds {limit // (1024 * 1024)} MB limit")
+        self.limit = limit
+
+# ── Spooled uploads ──────────────────────────────────
+
+class SpooledUpload:
+    """
+    An upload copied into an anonymous SpooledTemporaryFile: kept in memory
+    up to UPLOAD_SPOOL_BYTES, then rolled to an unnamed temp file that the
+    OS removes on close. Also records size and SHA-256 of the content.
+    """
+
+    def __init__(self, filename: str, spool_bytes: int = UPLOAD_SPOOL_BYTES):
+        self.filename = filename or "upload"
+        self.file = tempfile.SpooledTemporaryFile(max_size=spool_bytes)
+        self.size = 0
+        self._hash = hashlib.sha256()
+
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+
+    def write(self, chunk: bytes) -> None:
+        self.file.write(chunk)
+        self._hash.update(chunk)
+        self.size += len(chunk)
+
+    def getvalue(self) -> bytes:
+        """Whole content as bytes (for parsers that take an in-memory stream)."""
+        self.file.seek(0)
+        return self.file.read()
+
+    def rewind(self):
+        self.file.seek(0)
+        return self.file
+
+    def close(self) -> None:
+        self.file.close()
+
+    def __enter__(self) -> "SpooledUpload":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+async def spool_upload(upload: Any, max_bytes: int,
+                       chunk_size: int = UPLOAD_CHUNK_BYTES) -> SpooledUpload:
+    """
+    Stream an UploadFile-like object (`await upload.read(n)`) into a
+    SpooledUpload, raising UploadTooLarge as soon as `max_bytes` is passed.
+    """
+    spooled = SpooledUpload(getattr(upload, "filename", None))
+    try:
+        while True:
+            chunk = await upload.read(chunk_size)
+            if not chunk:
+                break
+            if spooled.size + len(chunk) > max_bytes:
+                raise UploadTooLarge(max_bytes)
+            spooled.write(chunk)
+    except BaseException:
+        spooled.close()
+        raise
+    spooled.rewind()
+    return spooled
+
+# ── ASGI request-size guard ──────────────────────────
+
+class MaxBodySizeMiddleware:
+    """
+    Reject request bodies larger than `max_bytes` with 413 before they are
+    read in full: immediately when Content-Length says so, otherwise as soon
+    as the streamed body crosses the limit.
+    """
+
+    def __init__(self, app, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def _reject(self, send) -> None:
+        body = json.dumps({"detail": f"Request body exceeds {self.max_bytes} bytes"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        declared: Optional[int] = None
+        for name, value in scope.get("headers", []):
+            if name == b"content-length" and value.isdigit():
+                declared = int(value)
+        if declared is not None and declared > self.max_bytes:
+            return await self._reject(send)
+
+        received = 0
+        exceeded = False
+        rejected = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    exceeded = True
+                    raise UploadTooLarge(self.max_bytes)
+            return message
+
+        async def guarded_send(message):
+            nonlocal rejected
+            # the app may turn our exception into a 400/500; answer 413 instead
+            if exceeded and message["type"] == "http.response.start" and not rejected:
+                rejected = True
+                return await self._reject(send)
+            if rejected:
+                return
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except UploadTooLarge:
+            if not rejected:
+                await self._reject(send)